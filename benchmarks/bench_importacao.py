@@ -0,0 +1,99 @@
+# 📄 benchmarks/bench_importacao.py
+"""
+BENCHMARK - TEMPO DE IMPORTAÇÃO NA INICIALIZAÇÃO
+Roda `python -X importtime -c "import main"` em um processo novo e resume
+a saída: tempo total, módulos mais caros e módulos pesados que não deveriam
+ser carregados na inicialização (ex.: reportlab, só usado ao gerar PDF).
+
+Uso: python -m benchmarks.bench_importacao [--modulo main] [--top 15] [--limite-ms 0]
+Sai com código 1 se algum módulo proibido for importado ou se o total
+passar de --limite-ms (quando informado).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Módulos que devem ser importados apenas no primeiro uso
+MODULOS_PROIBIDOS = ('reportlab', 'utils.pdf_generator', 'services.relatorio_service')
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir_importacao(modulo):
+    """
+    Executa a importação em um interpretador novo (sem cache de módulos)
+    Retorna [(modulo, proprio_us, acumulado_us, nivel), ...] na ordem do -X importtime
+    """
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=RAIZ_PROJETO, capture_output=True, text=True
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}:\n{processo.stderr[-2000:]}")
+
+    registros = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|', 2)
+        nivel = (len(nome) - len(nome.lstrip())) // 2
+        registros.append((nome.strip(), int(proprio), int(acumulado), nivel))
+    return registros
+
+
+def resumir(registros, top):
+    """Tempo total (módulos de primeiro nível) e os `top` mais caros"""
+    nivel_raiz = min((nivel for *_, nivel in registros), default=0)
+    total_us = sum(acumulado for _, _, acumulado, nivel in registros if nivel == nivel_raiz)
+    por_proprio = sorted(registros, key=lambda r: r[1], reverse=True)[:top]
+    por_acumulado = sorted(registros, key=lambda r: r[2], reverse=True)[:top]
+    return total_us, por_proprio, por_acumulado
+
+
+def modulos_proibidos(registros):
+    return sorted({
+        nome for nome, *_ in registros
+        if any(nome == proibido or nome.startswith(proibido + '.') for proibido in MODULOS_PROIBIDOS)
+    })
+
+
+def executar(modulo, top, limite_ms):
+    registros = medir_importacao(modulo)
+    total_us, por_proprio, por_acumulado = resumir(registros, top)
+
+    print(f"📦 import {modulo}: {len(registros)} módulos em {total_us / 1000:.1f} ms")
+
+    print(f"\n{'acumulado (ms)':>14} | {'próprio (ms)':>12} | módulo")
+    print("-" * 60)
+    for nome, proprio, acumulado, _ in por_acumulado:
+        print(f"{acumulado / 1000:>14.1f} | {proprio / 1000:>12.1f} | {nome}")
+
+    print(f"\n{'próprio (ms)':>14} | módulo")
+    print("-" * 60)
+    for nome, proprio, _, _ in por_proprio:
+        print(f"{proprio / 1000:>14.1f} | {nome}")
+
+    falhou = False
+    proibidos = modulos_proibidos(registros)
+    if proibidos:
+        falhou = True
+        print(f"\n❌ Módulos pesados importados na inicialização: {', '.join(proibidos)}")
+    else:
+        print(f"\n✅ Nenhum módulo proibido importado ({', '.join(MODULOS_PROIBIDOS)})")
+
+    if limite_ms and total_us / 1000 > limite_ms:
+        falhou = True
+        print(f"❌ Importação levou {total_us / 1000:.1f} ms (limite: {limite_ms:.1f} ms)")
+
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resumo de python -X importtime")
+    parser.add_argument('--modulo', default='main')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--limite-ms', type=float, default=0)
+    args = parser.parse_args()
+    sys.exit(executar(args.modulo, args.top, args.limite_ms))
@@ -0,0 +1,57 @@
+# 📄 benchmarks/bench_listagem.py
+"""
+BENCHMARK - LISTAGEM DE SOLICITAÇÕES
+Compara a listagem atual (LEFT JOIN, 1 round trip) com a versão antiga
+(1 SELECT extra por linha para buscar o nome da filial).
+
+Uso: python -m benchmarks.bench_listagem [quantidade ...]
+"""
+
+import sys
+
+from benchmarks.comum import transacao_descartavel, popular_solicitacoes, cronometrar
+from services.solicitacao_service import SolicitacaoService
+
+TAMANHOS_PADRAO = [1_000, 10_000, 50_000]
+
+
+def listar_n_mais_1(cur):
+    """Reprodução da listagem antiga: uma consulta por linha com filial"""
+    cur.execute("""
+        SELECT N_SOLICITACAO, DT_ABERTURA, AREA, STATUS,
+               RESPONSAVEL, DESCRICAO, DT_CONCLUSAO, FILIAL
+        FROM SOLICITACAO
+        ORDER BY DT_ABERTURA DESC
+    """)
+    linhas = cur.fetchall()
+    consultas = 1
+    for linha in linhas:
+        if linha[7]:
+            cur.execute("SELECT NOME FROM FILIAIS WHERE CNPJ_IND_ = %s", (linha[7],))
+            cur.fetchone()
+            consultas += 1
+    return len(linhas), consultas
+
+
+def executar(tamanhos):
+    print(f"{'linhas':>10} | {'atual (s)':>10} | {'µs/linha':>9} | {'N+1 (s)':>10} | {'consultas N+1':>13}")
+    print("-" * 64)
+
+    for quantidade in tamanhos:
+        with transacao_descartavel() as cur:
+            popular_solicitacoes(cur, quantidade)
+
+            total = len(SolicitacaoService.listar_solicitacoes())
+            tempo_atual = cronometrar(SolicitacaoService.listar_solicitacoes)
+
+            resultado = {}
+            tempo_antigo = cronometrar(lambda: resultado.update(r=listar_n_mais_1(cur)), repeticoes=1)
+            _, consultas = resultado['r']
+
+            print(f"{total:>10} | {tempo_atual:>10.3f} | {tempo_atual / total * 1e6:>9.1f} | "
+                  f"{tempo_antigo:>10.3f} | {consultas:>13}")
+
+
+if __name__ == "__main__":
+    tamanhos = [int(arg) for arg in sys.argv[1:]] or TAMANHOS_PADRAO
+    executar(tamanhos)
@@ -0,0 +1,90 @@
+# 📄 benchmarks/bench_relatorios.py
+"""
+BENCHMARK - RELATÓRIO DE ESTATÍSTICAS GERAIS
+Compara RelatorioService.relatorio_estatisticas_gerais com a versão antiga
+(oito consultas sequenciais) e confere se os dois resultados coincidem.
+
+Uso: python -m benchmarks.bench_relatorios [quantidade ...]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.comum import transacao_descartavel, popular_solicitacoes, cronometrar
+from services.relatorio_service import RelatorioService
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+
+
+def estatisticas_sequenciais(cur):
+    """Reprodução da versão antiga: oito consultas, uma após a outra"""
+    cur.execute("SELECT COUNT(*) FROM EMPRESA")
+    total_empresas = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*) FROM FILIAIS")
+    total_filiais = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*) FROM COLABORADORES")
+    total_colaboradores = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*) FROM SOLICITACAO")
+    total_solicitacoes = cur.fetchone()[0]
+
+    cur.execute("SELECT STATUS, COUNT(*) FROM SOLICITACAO GROUP BY STATUS")
+    por_status = {row[0]: row[1] for row in cur.fetchall()}
+
+    cur.execute("SELECT AREA, COUNT(*) AS quantidade FROM SOLICITACAO GROUP BY AREA ORDER BY quantidade DESC")
+    por_area = {row[0]: row[1] for row in cur.fetchall()}
+
+    data_30_dias_atras = (datetime.now() - timedelta(days=30)).date()
+    cur.execute("SELECT COUNT(*) FROM SOLICITACAO WHERE DT_ABERTURA >= %s", (data_30_dias_atras,))
+    ultimos_30_dias = cur.fetchone()[0]
+
+    cur.execute("""
+        SELECT AVG(DT_CONCLUSAO - DT_ABERTURA) FROM SOLICITACAO
+        WHERE STATUS = 'Concluída' AND DT_CONCLUSAO IS NOT NULL
+    """)
+    tempo_medio = cur.fetchone()[0]
+
+    return {
+        'total_empresas': total_empresas,
+        'total_filiais': total_filiais,
+        'total_colaboradores': total_colaboradores,
+        'total_solicitacoes': total_solicitacoes,
+        'solicitacoes_por_status': por_status,
+        'solicitacoes_por_area': por_area,
+        'solicitacoes_30_dias': ultimos_30_dias,
+        'tempo_medio_conclusao': tempo_medio,
+    }
+
+
+def resultados_coincidem(antigo, atual):
+    for chave, valor in antigo.items():
+        valor_atual = atual.get(chave)
+        if chave == 'tempo_medio_conclusao' and valor is not None and valor_atual is not None:
+            if abs(float(valor) - float(valor_atual)) > 1e-6:
+                return False
+        elif valor != valor_atual:
+            return False
+    return True
+
+
+def executar(tamanhos):
+    print(f"{'linhas':>10} | {'atual (s)':>10} | {'sequencial (s)':>14} | {'ganho':>6} | confere")
+    print("-" * 62)
+
+    for quantidade in tamanhos:
+        with transacao_descartavel() as cur:
+            popular_solicitacoes(cur, quantidade)
+
+            tempo_atual = cronometrar(RelatorioService.relatorio_estatisticas_gerais)
+            tempo_antigo = cronometrar(lambda: estatisticas_sequenciais(cur))
+
+            confere = resultados_coincidem(
+                estatisticas_sequenciais(cur), RelatorioService.relatorio_estatisticas_gerais()
+            )
+
+            print(f"{quantidade:>10} | {tempo_atual:>10.3f} | {tempo_antigo:>14.3f} | "
+                  f"{tempo_antigo / tempo_atual:>5.1f}x | {'sim' if confere else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    tamanhos = [int(arg) for arg in sys.argv[1:]] or TAMANHOS_PADRAO
+    executar(tamanhos)
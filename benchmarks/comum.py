@@ -0,0 +1,74 @@
+# 📄 benchmarks/comum.py
+"""
+FUNÇÕES COMUNS DOS BENCHMARKS
+Massa de dados sintética dentro de uma transação que é sempre desfeita no final
+"""
+
+import time
+from contextlib import contextmanager
+
+from database.database import get_connection
+
+# Faixa de números de OS reservada para dados sintéticos
+N_SOLICITACAO_INICIAL = 1_000_000_000
+PREFIXO_FILIAL = 'BENCH'
+
+
+@contextmanager
+def transacao_descartavel():
+    """
+    Abre uma transação que sempre sofre rollback.
+    Como o pool reutiliza a conexão na mesma thread, os serviços chamados
+    dentro do bloco enxergam os dados sintéticos sem que nada seja gravado.
+    """
+    conn = get_connection()
+    if conn is None:
+        raise RuntimeError("Não foi possível conectar ao banco para o benchmark")
+
+    try:
+        yield conn.cursor()
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def popular_solicitacoes(cur, quantidade, qtd_filiais=50):
+    """
+    Insere filiais e solicitações sintéticas (com filial preenchida)
+    """
+    cur.execute("""
+        INSERT INTO FILIAIS (CNPJ_IND_, NOME)
+        SELECT %s || g, 'Filial Benchmark ' || g
+        FROM generate_series(1, %s) AS g
+        ON CONFLICT (CNPJ_IND_) DO NOTHING
+    """, (PREFIXO_FILIAL, qtd_filiais))
+
+    cur.execute("""
+        INSERT INTO SOLICITACAO
+            (N_SOLICITACAO, DT_ABERTURA, AREA, STATUS, RESPONSAVEL, DESCRICAO, DT_CONCLUSAO, FILIAL)
+        SELECT %s + g,
+               CURRENT_DATE - (g %% 1500),
+               (ARRAY['Elétrica', 'Hidráulica', 'Civil', 'Serviços Gerais'])[1 + g %% 4],
+               (ARRAY['Aberta', 'Em Andamento', 'Concluída', 'Cancelada'])[1 + g %% 4],
+               'Colaborador ' || (g %% 200),
+               'Solicitação sintética número ' || g || ' para benchmark',
+               CASE WHEN g %% 4 = 2 THEN CURRENT_DATE - (g %% 1500) + (g %% 30) END,
+               %s || (1 + g %% %s)
+        FROM generate_series(1, %s) AS g
+    """, (N_SOLICITACAO_INICIAL, PREFIXO_FILIAL, qtd_filiais, quantidade))
+
+    cur.execute("ANALYZE SOLICITACAO")
+
+
+def cronometrar(funcao, repeticoes=3):
+    """
+    Executa a função algumas vezes e retorna o melhor tempo (segundos)
+    """
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        decorrido = time.perf_counter() - inicio
+        if melhor is None or decorrido < melhor:
+            melhor = decorrido
+    return melhor
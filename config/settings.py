@@ -19,6 +19,14 @@ DB_CONFIG = {
     'port': os.getenv("DB_PORT", "5432")
 }
 
+# Cache em disco (listas de referência reaproveitadas ao reabrir o sistema)
+CACHE_CONFIG = {
+    'disco': os.getenv("CACHE_DISCO", "1") == "1",
+    'diretorio': os.getenv(
+        "CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "gestao_manutencao")
+    )
+}
+
 # Configurações da Aplicação
 APP_CONFIG = {
     'name': 'Sistema de Gestão de Manutenção',
@@ -5,29 +5,43 @@ Sistema de Gestão de Manutenção
 """
 
 import psycopg2
+from psycopg2 import errors as pg_errors, extensions
 import os
-from dotenv import load_dotenv
-
-# Carregar variáveis de ambiente
-load_dotenv()
-
-# Configurações do Banco de Dados
-DB_CONFIG = {
-    'dbname': os.getenv("DB_NAME", "gestao_manutencao"),
-    'user': os.getenv("DB_USER", "postgres"),
-    'password': os.getenv("DB_PASSWORD", "password"),
-    'host': os.getenv("DB_HOST", "localhost"),
-    'port': os.getenv("DB_PORT", "5432")
+import threading
+from collections import namedtuple
+from config.settings import DB_CONFIG  # .env é carregado uma única vez, em config.settings
+from database.pool import ConnectionPool, PoolEsgotadoError
+
+# Configurações do Pool de Conexões
+POOL_CONFIG = {
+    'min_size': int(os.getenv("DB_POOL_MIN", "1")),
+    'max_size': int(os.getenv("DB_POOL_MAX", "10")),
+    'timeout': float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    'max_idle': float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+    'health_check_interval': float(os.getenv("DB_POOL_HEALTH_CHECK", "30"))
 }
 
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    '''
+    Retorna o pool de conexões global (criado no primeiro uso).
+    '''
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+    return _pool
+
 def get_connection():
     '''
-    Cria e retorna uma conexão com o PostgreSQL.
+    Empresta uma conexão do pool com o PostgreSQL.
+    conn.close() devolve a conexão ao pool em vez de encerrá-la.
     '''
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ Conexão com PostgreSQL estabelecida com sucesso!")
-        return conn
+        return get_pool().obter_conexao()
     
     except psycopg2.OperationalError as e:
         print(f"❌ Erro de conexão com o banco: {e}")
@@ -37,10 +51,30 @@ def get_connection():
         print("   - Banco de dados existe")
         return None
     
+    except PoolEsgotadoError as e:
+        print(f"❌ Pool de conexões esgotado: {e}")
+        return None
+    
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
         return None
 
+def obter_estatisticas_pool():
+    '''
+    Retorna as estatísticas do pool de conexões
+    '''
+    return get_pool().get_stats()
+
+def fechar_pool():
+    '''
+    Fecha todas as conexões do pool (usar no encerramento do sistema)
+    '''
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.fechar_todas()
+            _pool = None
+
 #---------------------------------------------------------
 # Função para criar todas as tabelas (VERSÃO CORRIGIDA)
 #---------------------------------------------------------
@@ -359,7 +393,7 @@ def popular_dados_iniciais():
 class DatabaseConnection:
     """
     Context manager para gerenciar conexões com o banco de dados
-    VERSÃO CORRIGIDA: Melhor tratamento de exceções
+    VERSÃO COM POOL: a conexão é emprestada do pool e devolvida na saída
     """
     
     def __enter__(self):
@@ -369,7 +403,7 @@ class DatabaseConnection:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Fecha a conexão quando sai do contexto
+        Devolve a conexão ao pool quando sai do contexto
         CORREÇÃO: Não tenta fazer rollback se conexão já fechada
         """
         if self.conn:
@@ -381,9 +415,8 @@ class DatabaseConnection:
             except Exception as rollback_error:
                 print(f"⚠️ Erro no rollback (pode ser normal): {rollback_error}")
             finally:
-                # Sempre fecha a conexão
+                # Sempre devolve a conexão ao pool
                 self.conn.close()
-                print("✅ Conexão fechada automaticamente")
 
 def executar_query(query, params=None):
     """
@@ -421,6 +454,7 @@ def criar_indices():
         "CREATE INDEX IF NOT EXISTS idx_solicitacao_data_abertura ON SOLICITACAO(DT_ABERTURA)",
         "CREATE INDEX IF NOT EXISTS idx_solicitacao_area ON SOLICITACAO(AREA)",
         "CREATE INDEX IF NOT EXISTS idx_solicitacao_responsavel ON SOLICITACAO(RESPONSAVEL)",
+        "CREATE INDEX IF NOT EXISTS idx_solicitacao_abertura_numero ON SOLICITACAO(DT_ABERTURA DESC, N_SOLICITACAO DESC)",
         
         # Índices para tabela COLABORADORES
         "CREATE INDEX IF NOT EXISTS idx_colaboradores_nome ON COLABORADORES(NOME)",
@@ -456,16 +490,939 @@ def criar_indices():
             conn.rollback()
             return False
 
+#-------------------------------------------------------
+# Numeração automática das OS via SEQUENCE
+#-------------------------------------------------------
+
+SEQUENCIA_SOLICITACAO = 'solicitacao_n_solicitacao_seq'
+
+def migrar_sequencia_solicitacao():
+    """
+    Associa N_SOLICITACAO a uma SEQUENCE (DEFAULT nextval) e posiciona
+    a sequência após o maior número já existente.
+    Pode ser executada várias vezes sem efeito colateral.
+    """
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            # Impede inserções concorrentes enquanto a sequência é posicionada
+            cur.execute("LOCK TABLE SOLICITACAO IN EXCLUSIVE MODE")
+            cur.execute(f"CREATE SEQUENCE IF NOT EXISTS {SEQUENCIA_SOLICITACAO} OWNED BY SOLICITACAO.N_SOLICITACAO")
+            cur.execute(f"""
+                SELECT setval('{SEQUENCIA_SOLICITACAO}',
+                              GREATEST(
+                                  (SELECT COALESCE(MAX(N_SOLICITACAO), 0) FROM SOLICITACAO),
+                                  (SELECT last_value FROM {SEQUENCIA_SOLICITACAO} WHERE is_called),
+                                  0
+                              ) + 1,
+                              false)
+            """)
+            cur.execute(f"""
+                ALTER TABLE SOLICITACAO
+                ALTER COLUMN N_SOLICITACAO SET DEFAULT nextval('{SEQUENCIA_SOLICITACAO}')
+            """)
+            
+            conn.commit()
+            print("✅ Sequência de numeração das OS configurada!")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Erro ao configurar sequência das OS: {e}")
+            conn.rollback()
+            return False
+
+#-------------------------------------------------------
+# Contadores de solicitações por status (mantidos por trigger)
+#-------------------------------------------------------
+
+def criar_contadores_status():
+    """
+    Cria a tabela SOLICITACAO_CONTADORES e os triggers que a mantêm em
+    sincronia a cada INSERT, UPDATE ou DELETE em SOLICITACAO.
+    Ao final reconstrói os contadores a partir dos dados existentes.
+    """
+    commands = [
+        """
+        CREATE TABLE IF NOT EXISTS SOLICITACAO_CONTADORES (
+            STATUS VARCHAR(50) PRIMARY KEY,  -- '' representa STATUS nulo
+            QUANTIDADE BIGINT NOT NULL DEFAULT 0
+        );
+        """,
+
+        # Trigger por comando (com tabelas de transição): agrega as linhas
+        # afetadas antes de tocar nos contadores, o que mantém cargas em lote
+        # baratas (um trigger por linha atualizaria o mesmo contador N vezes)
+        """
+        CREATE OR REPLACE FUNCTION FN_SOLICITACAO_CONTADORES() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO SOLICITACAO_CONTADORES (STATUS, QUANTIDADE)
+                SELECT COALESCE(STATUS, ''), COUNT(*) FROM NOVAS GROUP BY 1
+                ON CONFLICT (STATUS)
+                DO UPDATE SET QUANTIDADE = SOLICITACAO_CONTADORES.QUANTIDADE + EXCLUDED.QUANTIDADE;
+
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE SOLICITACAO_CONTADORES C
+                SET QUANTIDADE = C.QUANTIDADE - A.QUANTIDADE
+                FROM (SELECT COALESCE(STATUS, '') AS STATUS, COUNT(*) AS QUANTIDADE
+                      FROM ANTIGAS GROUP BY 1) A
+                WHERE C.STATUS = A.STATUS;
+
+            ELSE
+                INSERT INTO SOLICITACAO_CONTADORES (STATUS, QUANTIDADE)
+                SELECT STATUS, SUM(DELTA)
+                FROM (SELECT COALESCE(STATUS, '') AS STATUS, 1 AS DELTA FROM NOVAS
+                      UNION ALL
+                      SELECT COALESCE(STATUS, ''), -1 FROM ANTIGAS) D
+                GROUP BY STATUS
+                HAVING SUM(DELTA) <> 0
+                ON CONFLICT (STATUS)
+                DO UPDATE SET QUANTIDADE = SOLICITACAO_CONTADORES.QUANTIDADE + EXCLUDED.QUANTIDADE;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_CONTADORES ON SOLICITACAO",
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_CONTADORES_INS ON SOLICITACAO",
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_CONTADORES_UPD ON SOLICITACAO",
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_CONTADORES_DEL ON SOLICITACAO",
+
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_CONTADORES_INS
+        AFTER INSERT ON SOLICITACAO
+        REFERENCING NEW TABLE AS NOVAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_CONTADORES();
+        """,
+
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_CONTADORES_UPD
+        AFTER UPDATE ON SOLICITACAO
+        REFERENCING OLD TABLE AS ANTIGAS NEW TABLE AS NOVAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_CONTADORES();
+        """,
+
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_CONTADORES_DEL
+        AFTER DELETE ON SOLICITACAO
+        REFERENCING OLD TABLE AS ANTIGAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_CONTADORES();
+        """
+    ]
+    
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            for command in commands:
+                cur.execute(command)
+            
+            conn.commit()
+            print("✅ Contadores de status criados/atualizados com sucesso!")
+            
+        except Exception as e:
+            print(f"❌ Erro ao criar contadores de status: {e}")
+            conn.rollback()
+            return False
+    
+    return reconciliar_contadores_status() is not None
+
+def reconciliar_contadores_status():
+    """
+    Recalcula os contadores do zero (GROUP BY em SOLICITACAO), compara com
+    os valores mantidos pelo trigger e regrava a tabela.
+    Retorna dict {status: (contador_anterior, valor_real)} com as divergências
+    encontradas (vazio = contadores corretos) ou None em caso de erro.
+    """
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return None
+        
+        cur = conn.cursor()
+        
+        try:
+            # Bloqueia escritas em SOLICITACAO durante a contagem
+            cur.execute("LOCK TABLE SOLICITACAO IN SHARE MODE")
+            
+            cur.execute("""
+                SELECT COALESCE(STATUS, ''), COUNT(*)
+                FROM SOLICITACAO
+                GROUP BY COALESCE(STATUS, '')
+            """)
+            reais = dict(cur.fetchall())
+            
+            cur.execute("SELECT STATUS, QUANTIDADE FROM SOLICITACAO_CONTADORES")
+            atuais = dict(cur.fetchall())
+            
+            divergencias = {}
+            for status in set(reais) | set(atuais):
+                real = reais.get(status, 0)
+                atual = atuais.get(status, 0)
+                if real != atual:
+                    divergencias[status] = (atual, real)
+            
+            cur.execute("DELETE FROM SOLICITACAO_CONTADORES")
+            for status, quantidade in reais.items():
+                cur.execute(
+                    "INSERT INTO SOLICITACAO_CONTADORES (STATUS, QUANTIDADE) VALUES (%s, %s)",
+                    (status, quantidade)
+                )
+            
+            conn.commit()
+            
+            if divergencias:
+                print(f"⚠️ Contadores corrigidos: {divergencias}")
+            else:
+                print("✅ Contadores de status conferidos: nenhuma divergência")
+            return divergencias
+            
+        except Exception as e:
+            print(f"❌ Erro ao reconciliar contadores: {e}")
+            conn.rollback()
+            return None
+
+#-------------------------------------------------------
+# Resumo diário de solicitações (base dos relatórios)
+#-------------------------------------------------------
+
+# Contribuição de cada linha de SOLICITACAO para o resumo diário
+# (nulos viram '' / '-infinity' porque fazem parte da chave primária)
+_LINHAS_RESUMO = """
+    SELECT COALESCE(DT_ABERTURA, '-infinity'::date) AS DIA,
+           COALESCE(AREA, '') AS AREA,
+           COALESCE(STATUS, '') AS STATUS,
+           COALESCE(RESPONSAVEL, '') AS RESPONSAVEL,
+           COALESCE(FILIAL, '') AS FILIAL,
+           {sinal} AS QUANTIDADE,
+           CASE WHEN DT_CONCLUSAO IS NOT NULL AND DT_ABERTURA IS NOT NULL
+                THEN {sinal} ELSE 0 END AS QTD_COM_CONCLUSAO,
+           COALESCE(DT_CONCLUSAO - DT_ABERTURA, 0) * {sinal} AS SOMA_DIAS_CONCLUSAO
+    FROM {origem}
+"""
+
+def _aplicar_resumo(origem):
+    """SQL que soma (ou subtrai) as linhas de origem no resumo diário"""
+    return f"""
+        INSERT INTO SOLICITACAO_RESUMO_DIARIO
+            (DIA, AREA, STATUS, RESPONSAVEL, FILIAL,
+             QUANTIDADE, QTD_COM_CONCLUSAO, SOMA_DIAS_CONCLUSAO)
+        SELECT DIA, AREA, STATUS, RESPONSAVEL, FILIAL,
+               SUM(QUANTIDADE), SUM(QTD_COM_CONCLUSAO), SUM(SOMA_DIAS_CONCLUSAO)
+        FROM ({origem}) AS DELTA
+        GROUP BY DIA, AREA, STATUS, RESPONSAVEL, FILIAL
+        HAVING SUM(QUANTIDADE) <> 0 OR SUM(QTD_COM_CONCLUSAO) <> 0 OR SUM(SOMA_DIAS_CONCLUSAO) <> 0
+        ON CONFLICT (DIA, AREA, STATUS, RESPONSAVEL, FILIAL) DO UPDATE SET
+            QUANTIDADE = SOLICITACAO_RESUMO_DIARIO.QUANTIDADE + EXCLUDED.QUANTIDADE,
+            QTD_COM_CONCLUSAO = SOLICITACAO_RESUMO_DIARIO.QTD_COM_CONCLUSAO + EXCLUDED.QTD_COM_CONCLUSAO,
+            SOMA_DIAS_CONCLUSAO = SOLICITACAO_RESUMO_DIARIO.SOMA_DIAS_CONCLUSAO + EXCLUDED.SOMA_DIAS_CONCLUSAO;
+    """
+
+def criar_resumo_diario():
+    """
+    Cria a tabela SOLICITACAO_RESUMO_DIARIO, agregada por
+    (dia de abertura, área, status, responsável, filial), e os triggers que a
+    atualizam incrementalmente a cada INSERT, UPDATE ou DELETE em SOLICITACAO.
+    Ao final reconstrói o resumo a partir dos dados existentes.
+    """
+    novas = _LINHAS_RESUMO.format(sinal=1, origem='NOVAS')
+    antigas = _LINHAS_RESUMO.format(sinal=-1, origem='ANTIGAS')
+    
+    commands = [
+        """
+        CREATE TABLE IF NOT EXISTS SOLICITACAO_RESUMO_DIARIO (
+            DIA DATE NOT NULL,
+            AREA VARCHAR(100) NOT NULL,
+            STATUS VARCHAR(50) NOT NULL,
+            RESPONSAVEL VARCHAR(100) NOT NULL,
+            FILIAL VARCHAR(100) NOT NULL,
+            QUANTIDADE BIGINT NOT NULL DEFAULT 0,
+            QTD_COM_CONCLUSAO BIGINT NOT NULL DEFAULT 0,
+            SOMA_DIAS_CONCLUSAO BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (DIA, AREA, STATUS, RESPONSAVEL, FILIAL)
+        );
+        """,
+
+        f"""
+        CREATE OR REPLACE FUNCTION FN_SOLICITACAO_RESUMO_DIARIO() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_aplicar_resumo(novas)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {_aplicar_resumo(antigas)}
+            ELSE
+                {_aplicar_resumo(novas + ' UNION ALL ' + antigas)}
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_RESUMO_INS ON SOLICITACAO",
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_RESUMO_UPD ON SOLICITACAO",
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_RESUMO_DEL ON SOLICITACAO",
+
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_RESUMO_INS
+        AFTER INSERT ON SOLICITACAO
+        REFERENCING NEW TABLE AS NOVAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_RESUMO_DIARIO();
+        """,
+
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_RESUMO_UPD
+        AFTER UPDATE ON SOLICITACAO
+        REFERENCING OLD TABLE AS ANTIGAS NEW TABLE AS NOVAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_RESUMO_DIARIO();
+        """,
+
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_RESUMO_DEL
+        AFTER DELETE ON SOLICITACAO
+        REFERENCING OLD TABLE AS ANTIGAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_RESUMO_DIARIO();
+        """
+    ]
+    
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            for command in commands:
+                cur.execute(command)
+            
+            conn.commit()
+            print("✅ Resumo diário de solicitações criado/atualizado com sucesso!")
+            
+        except Exception as e:
+            print(f"❌ Erro ao criar resumo diário: {e}")
+            conn.rollback()
+            return False
+    
+    return reconstruir_resumo_diario()
+
+def reconstruir_resumo_diario():
+    """
+    Reconstrói SOLICITACAO_RESUMO_DIARIO do zero a partir de SOLICITACAO
+    """
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            # Bloqueia escritas em SOLICITACAO durante a reconstrução
+            cur.execute("LOCK TABLE SOLICITACAO IN SHARE MODE")
+            cur.execute("DELETE FROM SOLICITACAO_RESUMO_DIARIO")
+            cur.execute(_aplicar_resumo(_LINHAS_RESUMO.format(sinal=1, origem='SOLICITACAO')))
+            
+            conn.commit()
+            print("✅ Resumo diário reconstruído com sucesso!")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Erro ao reconstruir resumo diário: {e}")
+            conn.rollback()
+            return False
+
+def criar_busca_textual():
+    """
+    Prepara a busca textual em SOLICITACAO.DESCRICAO:
+    coluna DESCRICAO_TSV (tsvector em português, gerada pelo próprio banco a
+    cada INSERT/UPDATE) + índice GIN.
+    A primeira execução reescreve a tabela para calcular a coluna.
+    """
+    commands = [
+        """
+        ALTER TABLE SOLICITACAO ADD COLUMN IF NOT EXISTS DESCRICAO_TSV tsvector
+        GENERATED ALWAYS AS (to_tsvector('portuguese', COALESCE(DESCRICAO, ''))) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_solicitacao_descricao_tsv ON SOLICITACAO USING GIN (DESCRICAO_TSV)"
+    ]
+    
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            for command in commands:
+                cur.execute(command)
+            
+            conn.commit()
+            print("✅ Busca textual de solicitações criada/atualizada com sucesso!")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Erro ao criar busca textual: {e}")
+            conn.rollback()
+            return False
+
+def criar_busca_aproximada():
+    """
+    Habilita a extensão pg_trgm e cria índices de trigramas em
+    COLABORADORES.NOME e FILIAIS.NOME (busca por trecho e por semelhança).
+    Sem permissão para criar a extensão, os serviços usam um índice em memória.
+    """
+    commands = [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS idx_colaboradores_nome_trgm ON COLABORADORES USING GIN (NOME gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_filiais_nome_trgm ON FILIAIS USING GIN (NOME gin_trgm_ops)"
+    ]
+    
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            for command in commands:
+                cur.execute(command)
+            
+            conn.commit()
+            print("✅ Busca aproximada (pg_trgm) criada/atualizada com sucesso!")
+            return True
+            
+        except Exception as e:
+            print(f"⚠️ Não foi possível habilitar pg_trgm ({e}); usando índice em memória")
+            conn.rollback()
+            return False
+
+# Entidades com versão em ENTIDADE_VERSAO (tag do cache -> tabela)
+ENTIDADES_VERSIONADAS = {
+    'empresa': 'EMPRESA',
+    'filial': 'FILIAIS',
+    'colaborador': 'COLABORADORES',
+    'solicitacao': 'SOLICITACAO'
+}
+
+# Canal do NOTIFY emitido a cada alteração (payload = entidade alterada)
+CANAL_INVALIDACAO = 'cache_invalidacao'
+
+# Canal das alterações linha a linha de SOLICITACAO
+# payload = {"op": "INSERT"|"UPDATE"|"DELETE"|"TRUNCATE", "ids": [N_SOLICITACAO, ...]}
+# ("ids": null no TRUNCATE e quando o comando alterou mais de LIMITE_IDS_NOTIFICACAO linhas)
+# É por este canal (e não por CANAL_INVALIDACAO) que os clientes invalidam 'solicitacao'
+CANAL_SOLICITACOES = 'solicitacao_alterada'
+LIMITE_IDS_NOTIFICACAO = 200
+
+def criar_versoes_entidades():
+    """
+    Cria a tabela ENTIDADE_VERSAO (um contador por entidade) e os triggers
+    por comando que o incrementam a cada INSERT, UPDATE, DELETE ou TRUNCATE
+    (comandos que não afetaram nenhuma linha não contam).
+    É o marcador barato que o cache em disco usa para saber se os dados mudaram.
+    O mesmo trigger avisa os outros clientes (NOTIFY em CANAL_INVALIDACAO,
+    entregue só após o COMMIT e uma vez por entidade em cada transação).
+    """
+    commands = [
+        """
+        CREATE TABLE IF NOT EXISTS ENTIDADE_VERSAO (
+            ENTIDADE VARCHAR(30) PRIMARY KEY,
+            VERSAO BIGINT NOT NULL DEFAULT 0
+        );
+        """,
+
+        f"""
+        CREATE OR REPLACE FUNCTION FN_ENTIDADE_VERSAO() RETURNS TRIGGER AS $$
+        BEGIN
+            -- UPDATE/DELETE sem nenhuma linha: nada mudou, os caches continuam válidos
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NOT EXISTS (SELECT 1 FROM NOVAS) THEN
+                    RETURN NULL;
+                END IF;
+            ELSIF TG_OP = 'DELETE' THEN
+                IF NOT EXISTS (SELECT 1 FROM ANTIGAS) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            
+            UPDATE ENTIDADE_VERSAO SET VERSAO = VERSAO + 1 WHERE ENTIDADE = TG_ARGV[0];
+            PERFORM pg_notify('{CANAL_INVALIDACAO}', TG_ARGV[0]);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    ]
+    
+    for entidade, tabela in ENTIDADES_VERSIONADAS.items():
+        commands += [
+            f"INSERT INTO ENTIDADE_VERSAO (ENTIDADE) VALUES ('{entidade}') ON CONFLICT DO NOTHING",
+            f"DROP TRIGGER IF EXISTS TRG_{tabela}_VERSAO ON {tabela}",
+            f"DROP TRIGGER IF EXISTS TRG_{tabela}_VERSAO_INS ON {tabela}",
+            f"DROP TRIGGER IF EXISTS TRG_{tabela}_VERSAO_UPD ON {tabela}",
+            f"DROP TRIGGER IF EXISTS TRG_{tabela}_VERSAO_DEL ON {tabela}",
+            f"DROP TRIGGER IF EXISTS TRG_{tabela}_VERSAO_TRUNCATE ON {tabela}",
+            
+            # Um trigger por operação: REFERENCING só aceita um evento por trigger
+            f"""
+            CREATE TRIGGER TRG_{tabela}_VERSAO_INS
+            AFTER INSERT ON {tabela}
+            REFERENCING NEW TABLE AS NOVAS
+            FOR EACH STATEMENT EXECUTE PROCEDURE FN_ENTIDADE_VERSAO('{entidade}');
+            """,
+            f"""
+            CREATE TRIGGER TRG_{tabela}_VERSAO_UPD
+            AFTER UPDATE ON {tabela}
+            REFERENCING NEW TABLE AS NOVAS
+            FOR EACH STATEMENT EXECUTE PROCEDURE FN_ENTIDADE_VERSAO('{entidade}');
+            """,
+            f"""
+            CREATE TRIGGER TRG_{tabela}_VERSAO_DEL
+            AFTER DELETE ON {tabela}
+            REFERENCING OLD TABLE AS ANTIGAS
+            FOR EACH STATEMENT EXECUTE PROCEDURE FN_ENTIDADE_VERSAO('{entidade}');
+            """,
+            f"""
+            CREATE TRIGGER TRG_{tabela}_VERSAO_TRUNCATE
+            AFTER TRUNCATE ON {tabela}
+            FOR EACH STATEMENT EXECUTE PROCEDURE FN_ENTIDADE_VERSAO('{entidade}');
+            """
+        ]
+    
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            for command in commands:
+                cur.execute(command)
+            
+            conn.commit()
+            print("✅ Versões de entidades criadas/atualizadas com sucesso!")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Erro ao criar versões de entidades: {e}")
+            conn.rollback()
+            return False
+
+def criar_notificacao_solicitacoes():
+    """
+    Cria os triggers por comando que avisam os clientes (NOTIFY em
+    CANAL_SOLICITACOES) quais solicitações foram inseridas, alteradas ou
+    removidas, para que as telas abertas atualizem só essas linhas
+    """
+    commands = [
+        f"""
+        CREATE OR REPLACE FUNCTION FN_SOLICITACAO_NOTIFICAR() RETURNS TRIGGER AS $$
+        DECLARE
+            numeros BIGINT[];
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                PERFORM pg_notify('{CANAL_SOLICITACOES}', json_build_object('op', TG_OP, 'ids', NULL)::text);
+                RETURN NULL;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT array_agg(N_SOLICITACAO::BIGINT) INTO numeros
+                FROM (SELECT N_SOLICITACAO FROM ANTIGAS LIMIT {LIMITE_IDS_NOTIFICACAO + 1}) A;
+            ELSE
+                SELECT array_agg(N_SOLICITACAO::BIGINT) INTO numeros
+                FROM (SELECT N_SOLICITACAO FROM NOVAS LIMIT {LIMITE_IDS_NOTIFICACAO + 1}) N;
+            END IF;
+            
+            IF numeros IS NULL THEN
+                RETURN NULL;  -- comando não afetou nenhuma linha
+            END IF;
+            
+            PERFORM pg_notify('{CANAL_SOLICITACOES}', json_build_object(
+                'op', TG_OP,
+                'ids', CASE WHEN cardinality(numeros) > {LIMITE_IDS_NOTIFICACAO} THEN NULL ELSE numeros END
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_NOTIFICAR_INS ON SOLICITACAO",
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_NOTIFICAR_UPD ON SOLICITACAO",
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_NOTIFICAR_DEL ON SOLICITACAO",
+        "DROP TRIGGER IF EXISTS TRG_SOLICITACAO_NOTIFICAR_TRUNCATE ON SOLICITACAO",
+
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_NOTIFICAR_INS
+        AFTER INSERT ON SOLICITACAO
+        REFERENCING NEW TABLE AS NOVAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_NOTIFICAR();
+        """,
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_NOTIFICAR_UPD
+        AFTER UPDATE ON SOLICITACAO
+        REFERENCING NEW TABLE AS NOVAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_NOTIFICAR();
+        """,
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_NOTIFICAR_DEL
+        AFTER DELETE ON SOLICITACAO
+        REFERENCING OLD TABLE AS ANTIGAS
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_NOTIFICAR();
+        """,
+        """
+        CREATE TRIGGER TRG_SOLICITACAO_NOTIFICAR_TRUNCATE
+        AFTER TRUNCATE ON SOLICITACAO
+        FOR EACH STATEMENT EXECUTE PROCEDURE FN_SOLICITACAO_NOTIFICAR();
+        """
+    ]
+    
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            for command in commands:
+                cur.execute(command)
+            
+            conn.commit()
+            print("✅ Notificação de alterações de solicitações criada/atualizada com sucesso!")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Erro ao criar notificação de solicitações: {e}")
+            conn.rollback()
+            return False
+
+def ler_versoes_entidades(entidades):
+    """
+    {entidade: versão} das entidades pedidas (uma consulta de poucas linhas)
+    Retorna None se o banco não tiver ENTIDADE_VERSAO ou estiver inacessível
+    """
+    try:
+        with DatabaseConnection() as conn:
+            if conn is None:
+                return None
+            
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT ENTIDADE, VERSAO FROM ENTIDADE_VERSAO WHERE ENTIDADE = ANY(%s)",
+                (list(entidades),)
+            )
+            return dict(cur.fetchall())
+            
+    except pg_errors.UndefinedTable:
+        return None
+    except Exception as e:
+        print(f"❌ Erro ao ler versões de entidades: {e}")
+        return None
+
+#-------------------------------------------------------
+# Sincronização incremental (versão de alteração por linha)
+#-------------------------------------------------------
+
+SEQUENCIA_VERSAO_ALTERACAO = 'seq_versao_alteracao'
+
+# Coluna da chave primária de cada entidade (gravada nos registros de exclusão)
+CHAVES_ENTIDADES = {
+    'empresa': 'CNPJ',
+    'filial': 'CNPJ_IND_',
+    'colaborador': 'MATRICULA',
+    'solicitacao': 'N_SOLICITACAO'
+}
+
+# Resultado de ler_alteracoes: aplicar primeiro `excluidos`, depois `alterados`
+# completo=True: `alterados` traz todas as linhas e o cliente deve descartar
+# o que tinha (versão anterior ao piso de sincronização)
+Alteracoes = namedtuple('Alteracoes', ['versao', 'completo', 'alterados', 'excluidos'])
+
+def criar_versao_alteracao():
+    """
+    Cria a coluna VERSAO_ALTERACAO (valor de uma SEQUENCE global, renovado a
+    cada INSERT/UPDATE da linha) em EMPRESA, FILIAIS, COLABORADORES e
+    SOLICITACAO, e a tabela REGISTRO_EXCLUSAO com as chaves removidas.
+    Com elas um cliente pede só o que mudou depois da última versão que viu.
+    
+    Antes de gravar, cada comando trava as linhas de ENTIDADE_VERSAO até o
+    COMMIT: as versões ficam na ordem dos COMMITs, e uma transação lenta
+    nunca publica uma versão menor do que a já lida por alguém.
+    
+    Ordem das travas: todas as linhas de ENTIDADE_VERSAO de uma vez, por
+    ENTIDADE, já no primeiro comando da transação em qualquer das tabelas.
+    Travar só a entidade gravada causaria deadlock entre transações que
+    gravam duas entidades em ordens diferentes; o custo é que os gravadores
+    dessas quatro tabelas (operações manuais, curtas) esperam uns pelos outros.
+    Quem mais atualizar ENTIDADE_VERSAO deve travar na mesma ordem.
+    Depende de criar_versoes_entidades().
+    """
+    commands = [
+        f"CREATE SEQUENCE IF NOT EXISTS {SEQUENCIA_VERSAO_ALTERACAO}",
+        "ALTER TABLE ENTIDADE_VERSAO ADD COLUMN IF NOT EXISTS PISO_SINCRONIA BIGINT NOT NULL DEFAULT 0",
+        f"""
+        CREATE TABLE IF NOT EXISTS REGISTRO_EXCLUSAO (
+            ENTIDADE VARCHAR(30) NOT NULL,
+            CHAVE VARCHAR(100) NOT NULL,
+            VERSAO_ALTERACAO BIGINT NOT NULL DEFAULT nextval('{SEQUENCIA_VERSAO_ALTERACAO}'),
+            EXCLUIDO_EM TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_registro_exclusao_versao ON REGISTRO_EXCLUSAO(ENTIDADE, VERSAO_ALTERACAO)",
+
+        f"""
+        CREATE OR REPLACE FUNCTION FN_VERSAO_ALTERACAO_LINHA() RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.VERSAO_ALTERACAO := nextval('{SEQUENCIA_VERSAO_ALTERACAO}');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION FN_VERSAO_ALTERACAO_ORDEM() RETURNS TRIGGER AS $$
+        BEGIN
+            -- Um gravador por vez até o COMMIT: versões em ordem de publicação
+            -- Todas as entidades, sempre na mesma ordem: sem deadlock entre entidades
+            PERFORM 1 FROM ENTIDADE_VERSAO ORDER BY ENTIDADE FOR UPDATE;
+            
+            IF TG_OP = 'TRUNCATE' THEN
+                -- Sem registros de exclusão: todo cliente precisa recarregar tudo
+                UPDATE ENTIDADE_VERSAO
+                SET PISO_SINCRONIA = nextval('{SEQUENCIA_VERSAO_ALTERACAO}')
+                WHERE ENTIDADE = TG_ARGV[0];
+                DELETE FROM REGISTRO_EXCLUSAO WHERE ENTIDADE = TG_ARGV[0];
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION FN_VERSAO_ALTERACAO_EXCLUSAO() RETURNS TRIGGER AS $$
+        BEGIN
+            EXECUTE format(
+                'INSERT INTO REGISTRO_EXCLUSAO (ENTIDADE, CHAVE) SELECT %L, %I::TEXT FROM ANTIGAS',
+                TG_ARGV[0], lower(TG_ARGV[1])  -- colunas sem aspas no CREATE TABLE
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    ]
+    
+    for entidade, tabela in ENTIDADES_VERSIONADAS.items():
+        chave = CHAVES_ENTIDADES[entidade]
+        commands += [
+            f"DROP TRIGGER IF EXISTS TRG_{tabela}_ALTERACAO_ORDEM ON {tabela}",
+            f"DROP TRIGGER IF EXISTS TRG_{tabela}_ALTERACAO_LINHA ON {tabela}",
+            f"DROP TRIGGER IF EXISTS TRG_{tabela}_ALTERACAO_EXCLUSAO ON {tabela}",
+            
+            # Linhas existentes recebem uma versão antes de a coluna virar NOT NULL
+            f"ALTER TABLE {tabela} ADD COLUMN IF NOT EXISTS VERSAO_ALTERACAO BIGINT",
+            f"""
+            UPDATE {tabela} SET VERSAO_ALTERACAO = nextval('{SEQUENCIA_VERSAO_ALTERACAO}')
+            WHERE VERSAO_ALTERACAO IS NULL
+            """,
+            f"""
+            ALTER TABLE {tabela}
+                ALTER COLUMN VERSAO_ALTERACAO SET DEFAULT nextval('{SEQUENCIA_VERSAO_ALTERACAO}'),
+                ALTER COLUMN VERSAO_ALTERACAO SET NOT NULL
+            """,
+            f"CREATE INDEX IF NOT EXISTS idx_{tabela.lower()}_versao_alteracao ON {tabela}(VERSAO_ALTERACAO)",
+            
+            f"""
+            CREATE TRIGGER TRG_{tabela}_ALTERACAO_ORDEM
+            BEFORE INSERT OR UPDATE OR DELETE OR TRUNCATE ON {tabela}
+            FOR EACH STATEMENT EXECUTE PROCEDURE FN_VERSAO_ALTERACAO_ORDEM('{entidade}');
+            """,
+            f"""
+            CREATE TRIGGER TRG_{tabela}_ALTERACAO_LINHA
+            BEFORE INSERT OR UPDATE ON {tabela}
+            FOR EACH ROW EXECUTE PROCEDURE FN_VERSAO_ALTERACAO_LINHA();
+            """,
+            f"""
+            CREATE TRIGGER TRG_{tabela}_ALTERACAO_EXCLUSAO
+            AFTER DELETE ON {tabela}
+            REFERENCING OLD TABLE AS ANTIGAS
+            FOR EACH STATEMENT EXECUTE PROCEDURE FN_VERSAO_ALTERACAO_EXCLUSAO('{entidade}', '{chave}');
+            """
+        ]
+    
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return False
+        
+        cur = conn.cursor()
+        
+        try:
+            for command in commands:
+                cur.execute(command)
+            
+            conn.commit()
+            print("✅ Versões de alteração por linha criadas/atualizadas com sucesso!")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Erro ao criar versões de alteração: {e}")
+            conn.rollback()
+            return False
+
+def ler_alteracoes(entidade, versao, consulta, montar, coluna_versao='VERSAO_ALTERACAO', tipo_chave=str):
+    """
+    Alteracoes da entidade depois de `versao` (0 = carga completa), lidas em
+    um único snapshot: custo proporcional ao que mudou, não ao tamanho da tabela.
+    
+    consulta: SELECT das linhas sem WHERE (o filtro por coluna_versao é acrescentado)
+    montar: converte cada linha da consulta no objeto devolvido em `alterados`
+    tipo_chave: converte as chaves de REGISTRO_EXCLUSAO (gravadas como texto)
+    
+    Retorna None se o banco estiver inacessível: o cliente mantém a versão
+    que tinha e tenta de novo depois.
+    """
+    try:
+        with DatabaseConnection() as conn:
+            if conn is None:
+                return None
+            if conn.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE:
+                return _ler_alteracoes_snapshot(conn, entidade, versao, consulta, montar,
+                                                coluna_versao, tipo_chave)
+        
+        # A thread já tem uma transação aberta (empréstimo aninhado do pool): o
+        # snapshot próprio exige uma conexão dedicada, que não toca na de fora
+        dedicada = psycopg2.connect(**DB_CONFIG)
+        try:
+            return _ler_alteracoes_snapshot(dedicada, entidade, versao, consulta, montar,
+                                            coluna_versao, tipo_chave)
+        finally:
+            dedicada.close()
+            
+    except Exception as e:
+        print(f"❌ Erro ao ler alterações de {entidade}: {e}")
+        return None
+
+def _ler_alteracoes_snapshot(conn, entidade, versao, consulta, montar, coluna_versao, tipo_chave):
+    """Leituras de ler_alteracoes em uma transação REPEATABLE READ (conn sem transação aberta)"""
+    tabela = ENTIDADES_VERSIONADAS[entidade]
+    versao = int(versao or 0)
+    
+    cur = conn.cursor()
+    try:
+        # As três leituras precisam enxergar os mesmos COMMITs
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        
+        cur.execute(
+            f"""
+            SELECT PISO_SINCRONIA,
+                   GREATEST(
+                       (SELECT MAX(VERSAO_ALTERACAO) FROM {tabela}),
+                       (SELECT MAX(VERSAO_ALTERACAO) FROM REGISTRO_EXCLUSAO WHERE ENTIDADE = %s)
+                   )
+            FROM ENTIDADE_VERSAO WHERE ENTIDADE = %s
+            """,
+            (entidade, entidade)
+        )
+        piso, ultima = cur.fetchone()
+        
+        # Registros de exclusão mais antigos que o piso já foram expurgados
+        completo = versao < piso or versao == 0
+        desde = 0 if completo else versao
+        
+        cur.execute(f"{consulta} WHERE {coluna_versao} > %s", (desde,))
+        alterados = [montar(row) for row in cur.fetchall()]
+        
+        excluidos = []
+        if not completo:
+            cur.execute(
+                "SELECT CHAVE FROM REGISTRO_EXCLUSAO "
+                "WHERE ENTIDADE = %s AND VERSAO_ALTERACAO > %s ORDER BY VERSAO_ALTERACAO",
+                (entidade, desde)
+            )
+            excluidos = [tipo_chave(chave) for (chave,) in cur.fetchall()]
+        
+        return Alteracoes(max(versao, ultima or 0, piso), completo, alterados, excluidos)
+    finally:
+        cur.close()
+        conn.rollback()  # só leitura: encerra o snapshot
+
+def expurgar_exclusoes(dias=30):
+    """
+    Remove registros de exclusão com mais de `dias` dias e sobe o piso de
+    sincronização: clientes com versão anterior recebem uma carga completa.
+    Retorna o número de registros removidos (None em caso de erro).
+    """
+    with DatabaseConnection() as conn:
+        if conn is None:
+            return None
+        
+        cur = conn.cursor()
+        
+        try:
+            # Mesma ordem de travas dos triggers de versão (ver criar_versao_alteracao)
+            cur.execute("SELECT 1 FROM ENTIDADE_VERSAO ORDER BY ENTIDADE FOR UPDATE")
+            cur.execute(
+                """
+                WITH REMOVIDOS AS (
+                    DELETE FROM REGISTRO_EXCLUSAO
+                    WHERE EXCLUIDO_EM < CURRENT_TIMESTAMP - make_interval(days => %s)
+                    RETURNING ENTIDADE, VERSAO_ALTERACAO
+                ), PISOS AS (
+                    UPDATE ENTIDADE_VERSAO E SET PISO_SINCRONIA = GREATEST(E.PISO_SINCRONIA, R.MAXIMA)
+                    FROM (SELECT ENTIDADE, MAX(VERSAO_ALTERACAO) AS MAXIMA FROM REMOVIDOS GROUP BY ENTIDADE) R
+                    WHERE E.ENTIDADE = R.ENTIDADE
+                )
+                SELECT COUNT(*) FROM REMOVIDOS
+                """,
+                (int(dias),)
+            )
+            removidos = cur.fetchone()[0]
+            conn.commit()
+            print(f"✅ {removidos} registros de exclusão expurgados")
+            return removidos
+            
+        except Exception as e:
+            print(f"❌ Erro ao expurgar registros de exclusão: {e}")
+            conn.rollback()
+            return None
+
 if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "reconciliar":
+        print("🔎 Reconciliando contadores de status...")
+        resultado = reconciliar_contadores_status()
+        print("🔎 Reconstruindo resumo diário...")
+        resumo_ok = reconstruir_resumo_diario()
+        print("🧹 Expurgando registros de exclusão antigos...")
+        expurgo = expurgar_exclusoes()
+        sys.exit(1 if resultado is None or not resumo_ok or expurgo is None else 0)
+    
     print("🏗️  Iniciando construção/atualização do banco de dados...")
     
     if create_tables():
         print("🔄 Atualizando estrutura da tabela SOLICITACAO...")
         atualizar_estrutura_solicitacao()
+        print("🔢 Configurando numeração automática das OS...")
+        migrar_sequencia_solicitacao()
         print("📊 Populando com dados iniciais...")
         popular_dados_iniciais()
         print("🚀 Criando índices para performance...")
         criar_indices()  # ← LINHA NOVA
+        print("🧮 Criando contadores de status...")
+        criar_contadores_status()
+        print("📅 Criando resumo diário para relatórios...")
+        criar_resumo_diario()
+        print("🔍 Criando busca textual nas descrições...")
+        criar_busca_textual()
+        print("🔤 Criando busca aproximada de nomes...")
+        criar_busca_aproximada()
+        print("🏷️  Criando versões de entidades para o cache...")
+        criar_versoes_entidades()
+        print("📡 Criando notificação de alterações de solicitações...")
+        criar_notificacao_solicitacoes()
+        print("🔁 Criando versões de alteração para sincronização incremental...")
+        criar_versao_alteracao()
         print("🎉 Sistema de banco de dados pronto para uso!")
     else:
-        print("❌ Falha na criação do banco de dados")
\ No newline at end of file
+        print("❌ Falha na criação do banco de dados")
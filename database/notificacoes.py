@@ -0,0 +1,159 @@
+# 📄 database/notificacoes.py
+"""
+OUVINTE DE NOTIFICAÇÕES DO POSTGRESQL (LISTEN/NOTIFY)
+Um thread por cliente, com uma conexão própria (fora do pool, em autocommit),
+recebe os avisos de alteração enviados pelos triggers e repassa cada um às
+funções assinantes do canal
+"""
+
+import select
+import threading
+
+import psycopg2
+from psycopg2 import sql
+
+from config.settings import DB_CONFIG
+
+
+class OuvinteNotificacoes:
+    """
+    assinar(canal, funcao): funcao(payload) roda no thread do ouvinte a cada NOTIFY
+    ao_conectar(funcao): chamada a cada LISTEN bem-sucedido, inclusive o
+    primeiro (o que mudou antes dele, ou durante uma queda, não foi avisado)
+    ao_desconectar(funcao): chamada quando a conexão cai (ou o ouvinte para)
+    """
+
+    def __init__(self, db_config, intervalo_reconexao=5.0, intervalo_espera=1.0):
+        self.db_config = dict(db_config)
+        self.intervalo_reconexao = intervalo_reconexao
+        self.intervalo_espera = intervalo_espera
+
+        self._lock = threading.Lock()
+        self._assinantes = {}  # canal -> [funções]
+        self._funcoes_conexao = []
+        self._funcoes_desconexao = []
+        self._parar = threading.Event()
+        self._thread = None
+        self._conectado = threading.Event()
+
+    def assinar(self, canal, funcao):
+        """Assina um canal (pode ser chamado com o ouvinte já rodando)"""
+        with self._lock:
+            self._assinantes.setdefault(canal, []).append(funcao)
+
+    def ao_conectar(self, funcao):
+        with self._lock:
+            self._funcoes_conexao.append(funcao)
+
+    def ao_desconectar(self, funcao):
+        with self._lock:
+            self._funcoes_desconexao.append(funcao)
+
+    @property
+    def conectado(self):
+        return self._conectado.is_set()
+
+    def iniciar(self):
+        if self._thread is not None:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name='ouvinte-notificacoes', daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout=2.0):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ---------- INTERNOS (thread do ouvinte) ----------
+
+    def _loop(self):
+        primeira_conexao = True
+        while not self._parar.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**self.db_config)
+                conn.autocommit = True  # LISTEN/NOTIFY fora de transação
+                escutados = set()
+                self._escutar_novos(conn, escutados)
+                self._conectado.set()
+
+                if not primeira_conexao:
+                    print("🔔 Ouvinte de notificações reconectado")
+                primeira_conexao = False
+                with self._lock:
+                    funcoes = list(self._funcoes_conexao)
+                self._chamar(funcoes)
+
+                while not self._parar.is_set():
+                    self._escutar_novos(conn, escutados)
+                    if select.select([conn], [], [], self.intervalo_espera) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        aviso = conn.notifies.pop(0)
+                        with self._lock:
+                            assinantes = list(self._assinantes.get(aviso.channel, ()))
+                        self._chamar(assinantes, aviso.payload)
+
+            except Exception as e:
+                if not self._parar.is_set():
+                    print(f"⚠️ Ouvinte de notificações desconectado: {e}")
+            finally:
+                if self._conectado.is_set():
+                    self._conectado.clear()
+                    with self._lock:
+                        funcoes = list(self._funcoes_desconexao)
+                    self._chamar(funcoes)
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+            self._parar.wait(self.intervalo_reconexao)
+
+    def _escutar_novos(self, conn, escutados):
+        with self._lock:
+            novos = [canal for canal in self._assinantes if canal not in escutados]
+        if not novos:
+            return
+        cur = conn.cursor()
+        for canal in novos:
+            cur.execute(sql.SQL("LISTEN {}").format(sql.Identifier(canal)))
+            escutados.add(canal)
+        cur.close()
+
+    @staticmethod
+    def _chamar(funcoes, *args):
+        for funcao in funcoes:
+            try:
+                funcao(*args)
+            except Exception as e:
+                print(f"⚠️ Erro ao tratar notificação: {e}")
+
+
+_ouvinte = None
+_ouvinte_lock = threading.Lock()
+
+def get_ouvinte():
+    '''
+    Retorna o ouvinte de notificações global (criado no primeiro uso, parado).
+    '''
+    global _ouvinte
+    if _ouvinte is None:
+        with _ouvinte_lock:
+            if _ouvinte is None:
+                _ouvinte = OuvinteNotificacoes(DB_CONFIG)
+    return _ouvinte
+
+def fechar_ouvinte():
+    '''
+    Para o thread do ouvinte e fecha sua conexão (usar no encerramento do sistema)
+    '''
+    global _ouvinte
+    with _ouvinte_lock:
+        if _ouvinte is not None:
+            _ouvinte.parar()
+            _ouvinte = None
@@ -0,0 +1,339 @@
+# 📄 database/pool.py
+"""
+POOL DE CONEXÕES COM O POSTGRESQL
+Reaproveita conexões abertas em vez de refazer o handshake TCP + autenticação a cada query
+"""
+
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolEsgotadoError(Exception):
+    """Nenhuma conexão ficou livre dentro do tempo de espera"""
+
+
+class ConexaoPool:
+    """
+    Proxy de uma conexão emprestada pelo pool.
+    Repassa tudo para a conexão real, mas close() devolve a conexão ao pool.
+
+    Empréstimo aninhado (mesma thread, com a transação de quem emprestou
+    antes já aberta): o proxy trabalha dentro de um SAVEPOINT. commit() só
+    o libera e rollback() só desfaz o que foi feito depois dele; quem
+    encerra a transação é sempre o primeiro a emprestar a conexão.
+    """
+
+    def __init__(self, pool, conexao, savepoint=None):
+        self._pool = pool
+        self._conexao = conexao
+        self._devolvida = False
+        self._savepoint = savepoint
+
+    def __getattr__(self, nome):
+        return getattr(self._conexao, nome)
+
+    # Métodos especiais não passam por __getattr__: `with conn:` precisa deles aqui
+    # (mesma semântica do psycopg2: COMMIT ou ROLLBACK na saída, sem fechar)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def commit(self):
+        if self._savepoint is None:
+            self._conexao.commit()
+            return
+        cur = self._conexao.cursor()
+        cur.execute(f"RELEASE SAVEPOINT {self._savepoint}")
+        cur.execute(f"SAVEPOINT {self._savepoint}")  # o proxy pode continuar em uso
+        cur.close()
+
+    def rollback(self):
+        if self._savepoint is None:
+            self._conexao.rollback()
+            return
+        cur = self._conexao.cursor()
+        cur.execute(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+        cur.close()
+
+    def _liberar_savepoint(self):
+        """Na devolução: mantém o trabalho do empréstimo aninhado na transação externa"""
+        try:
+            cur = self._conexao.cursor()
+            if self._conexao.get_transaction_status() == extensions.TRANSACTION_STATUS_INERROR:
+                cur.execute(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+            cur.execute(f"RELEASE SAVEPOINT {self._savepoint}")
+            cur.close()
+        except Exception as e:
+            print(f"⚠️ Erro ao liberar savepoint {self._savepoint}: {e}")
+
+    @property
+    def closed(self):
+        """Segue a semântica do psycopg2: 0 = aberta, diferente de 0 = fechada"""
+        return 1 if self._devolvida else self._conexao.closed
+
+    def close(self):
+        """Devolve a conexão ao pool (chamadas repetidas são ignoradas)"""
+        if not self._devolvida:
+            self._devolvida = True
+            if self._savepoint is not None:
+                self._liberar_savepoint()
+            self._pool.devolver_conexao(self._conexao)
+
+
+class ConnectionPool:
+    """
+    Pool de conexões thread-safe com:
+    - tamanho mínimo/máximo
+    - min_size conexões abertas já na criação do pool
+    - health check das conexões paradas há muito tempo
+    - descarte de conexões ociosas acima do mínimo; é preguiçoso: acontece
+      a cada devolução de conexão (ou em encerrar_ociosas()), sem thread próprio
+    - checkout por thread (chamadas aninhadas na mesma thread reutilizam a
+      conexão, dentro de um SAVEPOINT se já houver transação aberta: ver ConexaoPool)
+    """
+
+    def __init__(self, db_config, min_size=1, max_size=10, timeout=10.0,
+                 max_idle=300.0, health_check_interval=30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Tamanhos do pool inválidos")
+
+        self.db_config = dict(db_config)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Condition(threading.Lock())
+        self._local = threading.local()
+        self._ociosas = deque()  # (conexao, ultimo_uso) - mais recente à direita
+        self._em_uso = 0
+        self._fechado = False
+
+        self._stats = {
+            'conexoes_criadas': 0,
+            'checkouts': 0,
+            'reutilizadas': 0,
+            'reentrantes': 0,
+            'descartadas': 0,
+            'ociosas_encerradas': 0,
+            'esperas': 0,
+            'timeouts': 0,
+            'tempo_espera_total': 0.0,
+        }
+
+        self._abrir_minimo()
+
+    def _abrir_minimo(self):
+        """Abre as min_size conexões iniciais (falhas só adiam a abertura para o uso)"""
+        for _ in range(self.min_size):
+            try:
+                conexao = psycopg2.connect(**self.db_config)
+            except Exception as e:
+                print(f"⚠️ Pool iniciado sem o mínimo de conexões: {e}")
+                return
+            with self._lock:
+                self._stats['conexoes_criadas'] += 1
+                self._ociosas.append((conexao, time.monotonic()))
+
+    # ---------- CHECKOUT / CHECKIN ----------
+
+    def obter_conexao(self):
+        """
+        Empresta uma conexão do pool para a thread atual.
+        Se a thread já possui uma conexão emprestada, a mesma é reutilizada
+        (sem poder encerrar a transação de quem a emprestou antes).
+        """
+        local = self._local
+        if getattr(local, 'refs', 0) > 0:
+            conexao = local.conexao
+            savepoint = None
+            if conexao.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                savepoint = f"pool_aninhada_{local.refs}"
+                cur = conexao.cursor()
+                cur.execute(f"SAVEPOINT {savepoint}")
+                cur.close()
+            local.refs += 1
+            with self._lock:
+                self._stats['reentrantes'] += 1
+            return ConexaoPool(self, conexao, savepoint)
+
+        conexao = self._checkout()
+        local.conexao = conexao
+        local.refs = 1
+        return ConexaoPool(self, conexao)
+
+    def devolver_conexao(self, conexao):
+        """Recebe a conexão de volta quando a última referência da thread é fechada"""
+        local = self._local
+        if getattr(local, 'conexao', None) is conexao:
+            if local.refs > 1:
+                local.refs -= 1
+                return
+            local.conexao = None
+            local.refs = 0
+
+        reutilizavel = self._resetar(conexao)
+
+        with self._lock:
+            self._em_uso -= 1
+            if reutilizavel and not self._fechado:
+                self._ociosas.append((conexao, time.monotonic()))
+            else:
+                self._stats['descartadas'] += 1
+                self._fechar_silenciosamente(conexao)
+            self._encerrar_ociosas()
+            self._lock.notify()
+
+    def _checkout(self):
+        inicio = time.monotonic()
+        limite = inicio + self.timeout
+        esperou = False
+
+        with self._lock:
+            while True:
+                if self._fechado:
+                    raise PoolEsgotadoError("Pool de conexões encerrado")
+
+                if self._ociosas:
+                    conexao, ultimo_uso = self._ociosas.pop()
+                    self._em_uso += 1
+                    break
+
+                if self._em_uso < self.max_size:
+                    self._em_uso += 1
+                    conexao, ultimo_uso = None, None
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolEsgotadoError(
+                        f"Nenhuma conexão livre após {self.timeout}s (máximo: {self.max_size})"
+                    )
+                esperou = True
+                self._lock.wait(restante)
+
+            self._stats['checkouts'] += 1
+            if esperou:
+                self._stats['esperas'] += 1
+                self._stats['tempo_espera_total'] += time.monotonic() - inicio
+
+        # Abertura e health check acontecem fora do lock
+        try:
+            if conexao is not None and self._conexao_saudavel(conexao, ultimo_uso):
+                with self._lock:
+                    self._stats['reutilizadas'] += 1
+                return conexao
+
+            if conexao is not None:
+                with self._lock:
+                    self._stats['descartadas'] += 1
+                self._fechar_silenciosamente(conexao)
+
+            conexao = psycopg2.connect(**self.db_config)
+            with self._lock:
+                self._stats['conexoes_criadas'] += 1
+            print("✅ Conexão com PostgreSQL estabelecida com sucesso!")
+            return conexao
+
+        except Exception:
+            with self._lock:
+                self._em_uso -= 1
+                self._lock.notify()
+            raise
+
+    # ---------- MANUTENÇÃO ----------
+
+    def _conexao_saudavel(self, conexao, ultimo_uso):
+        """Verifica a conexão com SELECT 1 se ela ficou parada além do intervalo"""
+        if conexao.closed:
+            return False
+
+        if time.monotonic() - ultimo_uso < self.health_check_interval:
+            return True
+
+        try:
+            cur = conexao.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            conexao.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _resetar(self, conexao):
+        """Desfaz transações pendentes para que a próxima thread receba a conexão limpa"""
+        if conexao.closed:
+            return False
+
+        try:
+            status = conexao.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                conexao.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _encerrar_ociosas(self):
+        """Fecha conexões ociosas há mais de max_idle, preservando o mínimo (chamar com lock)"""
+        agora = time.monotonic()
+        while self._ociosas and len(self._ociosas) + self._em_uso > self.min_size:
+            conexao, ultimo_uso = self._ociosas[0]
+            if agora - ultimo_uso < self.max_idle:
+                break
+            self._ociosas.popleft()
+            self._stats['ociosas_encerradas'] += 1
+            self._fechar_silenciosamente(conexao)
+
+    def encerrar_ociosas(self):
+        """Executa o descarte de conexões ociosas sob demanda"""
+        with self._lock:
+            self._encerrar_ociosas()
+
+    @staticmethod
+    def _fechar_silenciosamente(conexao):
+        try:
+            conexao.close()
+        except Exception:
+            pass
+
+    def fechar_todas(self):
+        """Encerra o pool e fecha todas as conexões ociosas"""
+        with self._lock:
+            self._fechado = True
+            while self._ociosas:
+                conexao, _ = self._ociosas.popleft()
+                self._fechar_silenciosamente(conexao)
+            self._lock.notify_all()
+
+    # ---------- ESTATÍSTICAS ----------
+
+    def get_stats(self):
+        """Retorna estatísticas de uso do pool"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'em_uso': self._em_uso,
+                'ociosas': len(self._ociosas),
+                'total_abertas': self._em_uso + len(self._ociosas),
+                'tempo_espera_medio': (
+                    stats['tempo_espera_total'] / stats['esperas'] if stats['esperas'] else 0.0
+                ),
+            })
+            return stats
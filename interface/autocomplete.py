@@ -0,0 +1,83 @@
+# 📄 interface/autocomplete.py
+"""
+COMBOBOX COM AUTOCOMPLETAR
+As sugestões vêm do banco enquanto o usuário digita (em segundo plano),
+em vez de carregar a tabela inteira na lista do combobox
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from utils.prefix_index import normalizar
+
+# Teclas que não alteram o texto digitado
+_TECLAS_NAVEGACAO = {
+    'Up', 'Down', 'Left', 'Right', 'Home', 'End', 'Return', 'KP_Enter', 'Escape', 'Tab',
+    'Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R', 'Caps_Lock'
+}
+
+
+class AutocompleteCombobox(ttk.Combobox):
+    """
+    ttk.Combobox que consulta `buscar(termo, limite) -> [texto, ...]`
+    (roda no TaskExecutor) depois de `atraso_ms` sem digitação.
+    Completa o texto com a primeira sugestão que começa pelo que foi digitado
+    (sem diferenciar acentos/maiúsculas), deixando o complemento selecionado
+    (a próxima tecla o substitui).
+    """
+
+    def __init__(self, master, buscar, executor, nome, atraso_ms=250, limite=20, **kwargs):
+        super().__init__(master, **kwargs)
+        self.buscar = buscar
+        self.executor = executor
+        self.nome = nome
+        self.atraso_ms = atraso_ms
+        self.limite = limite
+
+        self._agendamento = None
+        self._apagando = False
+        self.bind('<KeyRelease>', self._ao_digitar, add='+')
+
+    def carregar_sugestoes(self, termo=''):
+        """Consulta as sugestões para `termo` imediatamente"""
+        self.executor.submit(
+            self.buscar, termo, self.limite,
+            chave=f'autocomplete_{self.nome}',
+            on_success=lambda valores: self._exibir(termo, valores)
+        )
+
+    def _texto_digitado(self):
+        """Texto sem o complemento sugerido (parte selecionada no fim)"""
+        texto = self.get()
+        if self.selection_present():
+            return texto[:self.index('sel.first')]
+        return texto
+
+    def _ao_digitar(self, event):
+        if event.keysym in _TECLAS_NAVEGACAO:
+            return
+        self._apagando = event.keysym in ('BackSpace', 'Delete')
+        if self._agendamento is not None:
+            self.after_cancel(self._agendamento)
+        self._agendamento = self.after(self.atraso_ms, self._consultar)
+
+    def _consultar(self):
+        self._agendamento = None
+        self.carregar_sugestoes(self._texto_digitado().strip())
+
+    def _exibir(self, termo, valores):
+        self['values'] = list(valores)
+
+        # O usuário continuou digitando: não mexe no texto
+        digitado = self._texto_digitado()
+        if digitado.strip() != termo or not termo or self._apagando:
+            return
+
+        prefixo = normalizar(digitado)
+        for valor in valores:
+            if normalizar(valor).startswith(prefixo) and len(valor) > len(digitado):
+                self.delete(0, tk.END)
+                self.insert(0, valor)  # valor exato (maiúsculas/acentos do cadastro)
+                self.select_range(len(digitado), tk.END)
+                self.icursor(len(digitado))
+                break
@@ -4,6 +4,8 @@ INTERFACE PRINCIPAL - Sistema de Gestão de Manutenção
 VERSÃO COMPLETA COM TODOS OS MÉTODOS
 """
 
+import json
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from datetime import datetime
@@ -12,14 +14,33 @@ from datetime import datetime
 from services.empresa_service import EmpresaService, EnderecoService
 from services.colaborador_service import ColaboradorService
 from services.solicitacao_service import SolicitacaoService
-from utils.pdf_generator import gerar_e_abrir_os_pdf
+from database.database import CANAL_INVALIDACAO, CANAL_SOLICITACOES
+from database.notificacoes import get_ouvinte
 from utils.validators import Validators  # ← NOVO IMPORT
+from interface.task_executor import TaskExecutor
+from interface.virtual_treeview import VirtualTreeview
+from interface.treeview_sync import TreeviewSync
+from interface.autocomplete import AutocompleteCombobox
 
 class SistemaManutencaoApp:
     """Classe principal da interface gráfica"""
     
-    def __init__(self, root):
+    def __init__(self, root, inicio=None):
         self.root = root
+        
+        # Medição do tempo de inicialização (inicio = instante em que o programa começou)
+        self._inicio = inicio if inicio is not None else time.perf_counter()
+        self._etapas_inicializacao = []
+        self._relatorio_inicializacao_exibido = False
+        
+        # Cada aba carrega seus dados na primeira vez em que é aberta
+        self._carregadores_abas = {}
+        self._abas_carregadas = set()
+        
+        # Alterações de solicitações avisadas pelo banco (aplicadas em lote)
+        self._ids_alterados = set()
+        self._recarga_completa = False
+        self._agendamento_alteracoes = None
         self.root.title("🏭 Sistema de Gestão de Manutenção - O Arquiteto")
         self.root.geometry("1920x1080")
         self.root.configure(bg='#2C3E50')
@@ -27,12 +48,22 @@ class SistemaManutencaoApp:
         # Configurar estilo moderno
         self.configurar_estilo()
         
+        # Executor para chamadas ao banco fora da thread do Tk
+        self.executor = TaskExecutor(
+            self.root,
+            on_ocupado=self.atualizar_indicador_carregamento,
+            on_erro=self.mostrar_erro_tarefa
+        )
+        
         # Criar interface
         self.criar_menu_superior()
         self.criar_abas_principais()
+        self.marcar_etapa_inicializacao("interface montada")
         
-        # Carregar dados iniciais
+        # Carregar dados iniciais (só o dashboard; o resto quando a aba for aberta)
         self.carregar_dados_iniciais()
+        self.assinar_alteracoes()
+        self.root.after_idle(lambda: self.marcar_etapa_inicializacao("janela pronta para uso"))
     
     def configurar_estilo(self):
         """Configura estilos modernos para a interface"""
@@ -79,6 +110,16 @@ class SistemaManutencaoApp:
         )
         self.label_data.pack(side='right', padx=20, pady=10)
         
+        # Indicador de carregamento (tarefas de banco em andamento)
+        self.label_carregando = tk.Label(
+            menu_frame,
+            text="",
+            font=('Arial', 10, 'bold'),
+            fg='#F39C12',
+            bg='#1C2833'
+        )
+        self.label_carregando.pack(side='right', padx=20, pady=10)
+        
         # Atualizar data a cada minuto
         self.atualizar_data()
     
@@ -102,11 +143,14 @@ class SistemaManutencaoApp:
         self.criar_aba_colaboradores()
         self.criar_aba_solicitacoes()
         self.criar_aba_dashboard()
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self.ao_trocar_aba)
     
     def criar_aba_empresas(self):
         """Cria a aba de gestão de empresas e filiais"""
         frame_empresas = ttk.Frame(self.notebook)
         self.notebook.add(frame_empresas, text="🏢 Empresas & Filiais")
+        self.registrar_aba(frame_empresas, self.carregar_aba_empresas)
         
         # Frame de cadastro (lado esquerdo)
         frame_cadastro = ttk.Frame(frame_empresas)
@@ -167,6 +211,7 @@ class SistemaManutencaoApp:
         # Treeview para listar empresas
         colunas_empresas = ('CNPJ', 'Razão Social')
         self.tree_empresas = ttk.Treeview(frame_empresas_lista, columns=colunas_empresas, show='headings', height=12)
+        self.sync_empresas = TreeviewSync(self.tree_empresas)
         
         # Configurar colunas empresas
         for col in colunas_empresas:
@@ -201,6 +246,7 @@ class SistemaManutencaoApp:
         # Treeview para listar filiais
         colunas_filiais = ('CNPJ', 'Nome da Filial')
         self.tree_filiais = ttk.Treeview(frame_filiais_lista, columns=colunas_filiais, show='headings', height=12)
+        self.sync_filiais = TreeviewSync(self.tree_filiais)
         
         # Configurar colunas filiais
         for col in colunas_filiais:
@@ -232,6 +278,7 @@ class SistemaManutencaoApp:
         """Cria a aba de gestão de colaboradores"""
         frame_colaboradores = ttk.Frame(self.notebook)
         self.notebook.add(frame_colaboradores, text="👥 Colaboradores")
+        self.registrar_aba(frame_colaboradores, self.carregar_colaboradores)
         
         # Frame de cadastro
         frame_cadastro = ttk.LabelFrame(frame_colaboradores, text="Cadastrar Colaborador", padding=10)
@@ -263,6 +310,7 @@ class SistemaManutencaoApp:
         # Treeview para colaboradores
         colunas = ('Matrícula', 'Nome', 'Cargo')
         self.tree_colaboradores = ttk.Treeview(frame_listagem, columns=colunas, show='headings', height=12)
+        self.sync_colaboradores = TreeviewSync(self.tree_colaboradores)
         
         for col in colunas:
             self.tree_colaboradores.heading(col, text=col)
@@ -293,6 +341,8 @@ class SistemaManutencaoApp:
         """Cria a aba de gestão de solicitações de manutenção - VERSÃO MELHORADA"""
         frame_solicitacoes = ttk.Frame(self.notebook)
         self.notebook.add(frame_solicitacoes, text="📋 Solicitações")
+        self.registrar_aba(frame_solicitacoes, self.carregar_aba_solicitacoes)
+        self.frame_solicitacoes = frame_solicitacoes
         
         # Frame de cadastro
         frame_cadastro = ttk.LabelFrame(frame_solicitacoes, text="Nova Solicitação (Número Automático)", padding=10)
@@ -314,11 +364,16 @@ class SistemaManutencaoApp:
         
         # Linha 2: Responsável e Filial
         ttk.Label(frame_cadastro, text="Responsável:*").grid(row=2, column=0, sticky='w', pady=2)
-        self.combo_responsavel = ttk.Combobox(frame_cadastro, width=20)
+        self.combo_responsavel = AutocompleteCombobox(
+            frame_cadastro, ColaboradorService.buscar_nomes_colaboradores, self.executor,
+            nome='responsavel', width=20
+        )
         self.combo_responsavel.grid(row=2, column=1, pady=2, padx=5)
         
         ttk.Label(frame_cadastro, text="Filial:").grid(row=2, column=2, sticky='w', pady=2, padx=(20,5))
-        self.combo_filial = ttk.Combobox(frame_cadastro, width=20)
+        self.combo_filial = AutocompleteCombobox(
+            frame_cadastro, self._buscar_nomes_filiais, self.executor, nome='filial', width=20
+        )
         self.combo_filial.grid(row=2, column=3, pady=2, padx=5)
         
         # Botões para atualizar listas
@@ -358,16 +413,96 @@ class SistemaManutencaoApp:
         frame_controle = ttk.LabelFrame(frame_solicitacoes, text="Controle de Solicitações", padding=10)
         frame_controle.pack(fill='both', expand=True, padx=10, pady=5)
         
+        # Filtros (aplicados no banco; campos de texto esperam o usuário parar de digitar)
+        self._filtros_solicitacoes = {}
+        self._ordenacao_solicitacoes = None
+        self._agendamento_filtro = None
+        
+        frame_filtros = ttk.Frame(frame_controle)
+        frame_filtros.pack(fill='x', pady=(0, 5))
+        
+        ttk.Label(frame_filtros, text="Buscar:").grid(row=0, column=0, sticky='w')
+        self.entry_busca_solic = ttk.Entry(frame_filtros, width=25)
+        self.entry_busca_solic.grid(row=0, column=1, padx=5, pady=2)
+        
+        ttk.Label(frame_filtros, text="Status:").grid(row=0, column=2, sticky='w')
+        self.combo_filtro_status = ttk.Combobox(
+            frame_filtros, width=14, state='readonly',
+            values=['', 'Aberta', 'Em Andamento', 'Concluída', 'Cancelada']
+        )
+        self.combo_filtro_status.grid(row=0, column=3, padx=5, pady=2)
+        
+        ttk.Label(frame_filtros, text="Área:").grid(row=0, column=4, sticky='w')
+        self.combo_filtro_area = ttk.Combobox(
+            frame_filtros, width=14, state='readonly',
+            values=['', 'Elétrica', 'Hidráulica', 'Civil', 'Serviços Gerais']
+        )
+        self.combo_filtro_area.grid(row=0, column=5, padx=5, pady=2)
+        
+        ttk.Label(frame_filtros, text="Responsável:").grid(row=1, column=0, sticky='w')
+        self.combo_filtro_responsavel = AutocompleteCombobox(
+            frame_filtros, ColaboradorService.buscar_nomes_colaboradores, self.executor,
+            nome='filtro_responsavel', width=23
+        )
+        self.combo_filtro_responsavel.grid(row=1, column=1, padx=5, pady=2)
+        
+        ttk.Label(frame_filtros, text="Filial:").grid(row=1, column=2, sticky='w')
+        self.combo_filtro_filial = AutocompleteCombobox(
+            frame_filtros, self._buscar_nomes_filiais, self.executor, nome='filtro_filial', width=14
+        )
+        self.combo_filtro_filial.grid(row=1, column=3, padx=5, pady=2)
+        
+        ttk.Label(frame_filtros, text="Abertura de/até:").grid(row=1, column=4, sticky='w')
+        frame_datas = ttk.Frame(frame_filtros)
+        frame_datas.grid(row=1, column=5, padx=5, pady=2, sticky='w')
+        self.entry_filtro_data_inicio = ttk.Entry(frame_datas, width=11)
+        self.entry_filtro_data_inicio.pack(side='left')
+        self.entry_filtro_data_fim = ttk.Entry(frame_datas, width=11)
+        self.entry_filtro_data_fim.pack(side='left', padx=(5, 0))
+        
+        ttk.Button(
+            frame_filtros, text="✖ Limpar Filtros", command=self.limpar_filtros_solicitacoes
+        ).grid(row=0, column=6, padx=10, pady=2, sticky='we')
+        
+        ttk.Button(
+            frame_filtros, text="🔍 Busca Textual", command=self.abrir_busca_textual
+        ).grid(row=1, column=6, padx=10, pady=2, sticky='we')
+        
+        self.label_total_filtrado = ttk.Label(frame_filtros, text="")
+        self.label_total_filtrado.grid(row=0, column=7, rowspan=2, padx=5, sticky='w')
+        
+        for widget in (self.entry_busca_solic, self.combo_filtro_responsavel, self.combo_filtro_filial,
+                       self.entry_filtro_data_inicio, self.entry_filtro_data_fim):
+            # add='+': os AutocompleteCombobox já usam <KeyRelease> para buscar sugestões
+            widget.bind('<KeyRelease>', self.agendar_filtro_solicitacoes, add='+')
+        for widget in (self.combo_filtro_status, self.combo_filtro_area,
+                       self.combo_filtro_responsavel, self.combo_filtro_filial):
+            widget.bind('<<ComboboxSelected>>', lambda e: self.aplicar_filtros_solicitacoes(), add='+')
+        
         # Treeview para solicitações
         colunas = ('Nº', 'Data Abertura', 'Data Conclusão', 'Área', 'Status', 'Responsável', 'Filial', 'Descrição')
-        self.tree_solicitacoes = ttk.Treeview(frame_controle, columns=colunas, show='headings', height=10)
+        # Lista virtualizada: só as linhas visíveis existem no Treeview,
+        # as páginas são buscadas no banco conforme a rolagem
+        self.lista_solicitacoes = VirtualTreeview(
+            frame_controle, colunas,
+            fonte_pagina=self._pagina_solicitacoes,
+            fonte_total=self._total_solicitacoes,
+            executor=self.executor, nome='solicitacoes', height=10,
+            ao_atualizar_total=self.exibir_total_filtrado
+        )
+        self.tree_solicitacoes = self.lista_solicitacoes.tree
         
+        # Clique no cabeçalho ordena pela coluna (no banco)
+        self._colunas_solicitacoes = dict(zip(colunas, (
+            'n_solicitacao', 'dt_abertura', 'dt_conclusao', 'area',
+            'status', 'responsavel', 'nome_filial', 'descricao'
+        )))
         larguras = [70, 100, 100, 90, 100, 120, 120, 200]
         for i, col in enumerate(colunas):
-            self.tree_solicitacoes.heading(col, text=col)
+            self.tree_solicitacoes.heading(col, text=col, command=lambda c=col: self.ordenar_solicitacoes(c))
             self.tree_solicitacoes.column(col, width=larguras[i])
         
-        self.tree_solicitacoes.pack(fill='both', expand=True)
+        self.lista_solicitacoes.pack(fill='both', expand=True)
         
         # Frame de botões para controle - COM BOTÃO PDF
         frame_botoes = ttk.Frame(frame_controle)
@@ -434,6 +569,8 @@ class SistemaManutencaoApp:
         """Cria a aba de dashboard com resumo do sistema"""
         frame_dashboard = ttk.Frame(self.notebook)
         self.notebook.add(frame_dashboard, text="📊 Dashboard")
+        self.registrar_aba(frame_dashboard, self.atualizar_dashboard)
+        self.frame_dashboard = frame_dashboard
         
         # Frame de estatísticas
         frame_stats = ttk.LabelFrame(frame_dashboard, text="Resumo do Sistema", padding=15)
@@ -519,6 +656,7 @@ class SistemaManutencaoApp:
         
         colunas = ('Nº', 'Data', 'Área', 'Status', 'Filial')
         self.tree_ultimas_solic = ttk.Treeview(frame_ultimas, columns=colunas, show='headings', height=8)
+        self.sync_ultimas_solic = TreeviewSync(self.tree_ultimas_solic)
         
         larguras_ultimas = [80, 100, 100, 100, 120]
         for i, col in enumerate(colunas):
@@ -527,33 +665,208 @@ class SistemaManutencaoApp:
         
         self.tree_ultimas_solic.pack(fill='both', expand=True)
     
+    # ========== EXECUÇÃO EM SEGUNDO PLANO ==========
+    
+    def executar_em_segundo_plano(self, funcao, *args, chave=None, on_success=None,
+                                  on_error=None, on_finally=None, **kwargs):
+        """
+        Executa uma chamada de serviço fora da thread do Tk
+        Os callbacks rodam na thread do Tk quando o resultado chega
+        """
+        return self.executor.submit(
+            funcao, *args, chave=chave, on_success=on_success,
+            on_error=on_error, on_finally=on_finally, **kwargs
+        )
+    
+    def atualizar_indicador_carregamento(self, pendentes):
+        """Mostra/esconde o indicador de carregamento no menu superior"""
+        if pendentes > 0:
+            self.label_carregando.config(text=f"⏳ Carregando... ({pendentes})")
+        else:
+            self.label_carregando.config(text="")
+    
+    def mostrar_erro_tarefa(self, erro):
+        """Tratador padrão para exceções das tarefas em segundo plano"""
+        print(f"❌ Erro em tarefa de segundo plano: {erro}")
+        messagebox.showerror("Erro", f"Erro ao acessar o banco de dados:\n{erro}")
+    
+    def ao_fechar(self):
+        """Libera as threads de trabalho ao encerrar a interface"""
+        self.executor.encerrar()
+    
     # ========== MÉTODOS DE CONTROLE ==========
     
     def carregar_dados_iniciais(self):
-        """Carrega dados iniciais na interface"""
+        """
+        Abre o sistema no dashboard (montado só com contagens, barato)
+        As demais abas carregam seus dados quando forem abertas
+        """
+        self.notebook.select(self.frame_dashboard)
+        self.ao_trocar_aba()
+    
+    # ========== CARREGAMENTO SOB DEMANDA ==========
+    
+    def registrar_aba(self, frame, carregar):
+        """Associa uma aba à função que carrega seus dados"""
+        self._carregadores_abas[str(frame)] = carregar
+    
+    def ao_trocar_aba(self, event=None):
+        """Carrega os dados da aba selecionada na primeira vez em que ela é aberta"""
+        aba = self.notebook.select()
+        if not aba or aba in self._abas_carregadas:
+            return
+        
+        carregar = self._carregadores_abas.get(aba)
+        if carregar:
+            self._abas_carregadas.add(aba)
+            carregar()
+    
+    def carregar_aba_empresas(self):
+        """Dados da aba Empresas & Filiais"""
         self.carregar_empresas()
         self.carregar_filiais()
-        self.carregar_colaboradores()
+    
+    def carregar_aba_solicitacoes(self):
+        """Dados da aba Solicitações (lista, comboboxes e próximo número)"""
         self.carregar_solicitacoes()
         self.carregar_responsaveis()
         self.carregar_filiais_combobox()
         self.atualizar_proximo_numero()
-        self.atualizar_dashboard()
+    
+    # ========== ALTERAÇÕES FEITAS EM OUTROS TERMINAIS ==========
+    
+    def assinar_alteracoes(self):
+        """
+        Recebe do banco (LISTEN/NOTIFY) as solicitações inseridas, alteradas ou
+        removidas por qualquer terminal e atualiza as telas abertas.
+        Os assinantes de main.py são chamados antes destes: quando a tela
+        recarrega, o cache já foi invalidado (e a carga em andamento, descartada),
+        então a recarga consulta o banco de novo.
+        """
+        try:
+            ouvinte = get_ouvinte()
+            ouvinte.assinar(CANAL_SOLICITACOES, self._ao_notificar_solicitacoes)
+            # As listas mostram o nome da filial (JOIN): renomear uma filial muda as linhas
+            ouvinte.assinar(CANAL_INVALIDACAO, self._ao_notificar_entidade)
+            # Avisos perdidos antes do LISTEN ou durante uma queda: recarrega tudo
+            ouvinte.ao_conectar(
+                lambda: self.executor.chamar_na_thread_principal(self._registrar_alteracao, None, None)
+            )
+        except Exception as e:
+            print(f"⚠️ Atualização automática desativada: {e}")
+    
+    def _ao_notificar_solicitacoes(self, payload):
+        """Roda no thread do ouvinte: só repassa o aviso para a thread do Tk"""
+        try:
+            aviso = json.loads(payload)
+            op, ids = aviso.get('op'), aviso.get('ids')
+        except (ValueError, AttributeError):
+            op, ids = None, None
+        self.executor.chamar_na_thread_principal(self._registrar_alteracao, op, ids)
+    
+    def _ao_notificar_entidade(self, entidade):
+        """Roda no thread do ouvinte: filiais alteradas recarregam as listas abertas"""
+        if entidade == 'filial':
+            self.executor.chamar_na_thread_principal(self._registrar_alteracao, None, None)
+    
+    def _registrar_alteracao(self, op, ids):
+        """Junta os avisos que chegam em rajada e os aplica de uma vez, 200 ms depois"""
+        if op == 'UPDATE' and ids is not None:
+            self._ids_alterados.update(ids)
+        else:
+            # Inserção/remoção muda as posições da lista; sem ids não há o que comparar
+            self._recarga_completa = True
+        
+        if self._agendamento_alteracoes is None:
+            self._agendamento_alteracoes = self.root.after(200, self._aplicar_alteracoes)
+    
+    def _aplicar_alteracoes(self):
+        """Atualiza o dashboard e a lista de solicitações, se já foram abertos"""
+        self._agendamento_alteracoes = None
+        completa, ids = self._recarga_completa, self._ids_alterados
+        self._recarga_completa, self._ids_alterados = False, set()
+        
+        if str(self.frame_dashboard) in self._abas_carregadas:
+            self.atualizar_dashboard()  # contadores + 8 linhas; o TreeviewSync troca só as alteradas
+        
+        if str(self.frame_solicitacoes) not in self._abas_carregadas:
+            return
+        
+        # Só a ordem padrão garante que uma alteração não move a linha de lugar
+        if completa or self._ordenacao_solicitacoes is not None or self.lista_solicitacoes.carregando:
+            self.carregar_solicitacoes()
+            return
+        
+        filtros = dict(self._filtros_solicitacoes)
+        self.executar_em_segundo_plano(
+            SolicitacaoService.listar_por_numeros, sorted(ids), filtros,
+            chave='solicitacoes_alteradas',
+            on_success=lambda solicitacoes: self._aplicar_solicitacoes_alteradas(ids, filtros, solicitacoes)
+        )
+    
+    def _aplicar_solicitacoes_alteradas(self, ids, filtros, solicitacoes):
+        """
+        Troca na lista só as linhas alteradas quando nenhuma delas mudou de
+        posição; se alguma entrou/saiu do filtro ou mudou de data, recarrega
+        """
+        if filtros != self._filtros_solicitacoes:
+            return  # os filtros mudaram: a lista já foi recarregada
+        
+        novas = {sol.n_solicitacao: self._formatar_solicitacao(sol) for sol in solicitacoes}
+        carregadas = self.lista_solicitacoes.valores_carregados()
+        coluna_data = 1  # 'Data Abertura' (ordem padrão: data, número)
+        
+        for n_solicitacao in ids:
+            antiga, nova = carregadas.get(n_solicitacao), novas.get(n_solicitacao)
+            if antiga is None:
+                if filtros:
+                    # Fora das páginas carregadas: pode ter entrado ou saído do filtro
+                    self.carregar_solicitacoes()
+                    return
+                continue  # sem filtros, a linha não muda de posição nem conta no total
+            if nova is None or nova[coluna_data] != antiga[coluna_data]:
+                self.carregar_solicitacoes()
+                return
+        
+        if novas:
+            self.lista_solicitacoes.atualizar_linhas(
+                (n, valores) for n, valores in novas.items() if n in carregadas
+            )
+    
+    def marcar_etapa_inicializacao(self, etapa):
+        """Registra quanto tempo após o início do programa a etapa foi concluída"""
+        self._etapas_inicializacao.append((etapa, time.perf_counter() - self._inicio))
+    
+    def exibir_relatorio_inicializacao(self):
+        """Mostra no console o tempo de cada etapa da inicialização"""
+        print("⏱️ Tempo de inicialização:")
+        for etapa, segundos in self._etapas_inicializacao:
+            print(f"   {etapa:<28} {segundos * 1000:>8.1f} ms")
     
     def atualizar_proximo_numero(self):
         """Atualiza o label com o próximo número de OS"""
-        try:
-            proximo_numero = SolicitacaoService.obter_proximo_numero_os()
+        def exibir(proximo_numero):
             self.label_proximo_numero.config(text=f"Próximo Nº: {proximo_numero}")
-        except Exception as e:
+        
+        def erro(e):
             print(f"❌ Erro ao obter próximo número: {e}")
             self.label_proximo_numero.config(text="Próximo Nº: Erro")
+        
+        self.executar_em_segundo_plano(
+            SolicitacaoService.obter_proximo_numero_os,
+            chave='proximo_numero', on_success=exibir, on_error=erro
+        )
+    
+    @staticmethod
+    def _buscar_nomes_filiais(termo, limite):
+        """Sugestões de filiais para os comboboxes (roda em segundo plano)"""
+        return [filial.nome for filial in EmpresaService.buscar_filiais(termo, limite)]
     
     def carregar_responsaveis(self):
-        """Carrega a lista de colaboradores no combobox de responsáveis"""
-        try:
-            responsaveis = ColaboradorService.listar_nomes_colaboradores()
+        """Carrega as primeiras sugestões no combobox de responsáveis (o resto vem ao digitar)"""
+        def exibir(responsaveis):
             self.combo_responsavel['values'] = responsaveis
+            self.combo_filtro_responsavel['values'] = [''] + list(responsaveis)
             
             if responsaveis:
                 self.combo_responsavel.set(responsaveis[0])
@@ -561,17 +874,21 @@ class SistemaManutencaoApp:
             else:
                 self.combo_responsavel.set('')
                 print("ℹ️ Nenhum colaborador cadastrado ainda")
-                
-        except Exception as e:
+        
+        def erro(e):
             print(f"❌ Erro ao carregar responsáveis: {e}")
             messagebox.showwarning("Atenção", "Erro ao carregar lista de responsáveis")
+        
+        self.executar_em_segundo_plano(
+            ColaboradorService.buscar_nomes_colaboradores, '', 50,
+            chave='combo_responsaveis', on_success=exibir, on_error=erro
+        )
     
     def carregar_filiais_combobox(self):
-        """Carrega a lista de filiais no combobox"""
-        try:
-            filiais = EmpresaService.listar_filiais()
-            nomes_filiais = [filial.nome for filial in filiais]
+        """Carrega as primeiras sugestões no combobox de filiais (o resto vem ao digitar)"""
+        def exibir(nomes_filiais):
             self.combo_filial['values'] = nomes_filiais
+            self.combo_filtro_filial['values'] = [''] + nomes_filiais
             
             if nomes_filiais:
                 self.combo_filial.set(nomes_filiais[0])
@@ -579,10 +896,15 @@ class SistemaManutencaoApp:
             else:
                 self.combo_filial.set('')
                 print("ℹ️ Nenhuma filial cadastrada ainda")
-                
-        except Exception as e:
+        
+        def erro(e):
             print(f"❌ Erro ao carregar filiais: {e}")
             messagebox.showwarning("Atenção", "Erro ao carregar lista de filiais")
+        
+        self.executar_em_segundo_plano(
+            self._buscar_nomes_filiais, '', 50,
+            chave='combo_filiais', on_success=exibir, on_error=erro
+        )
     
     # ========== MÉTODOS DE CADASTRO ==========
     
@@ -604,11 +926,14 @@ class SistemaManutencaoApp:
             messagebox.showerror("Erro", "Razão Social deve ter entre 5 e 150 caracteres!")
             return
         
-        if EmpresaService.criar_empresa(cnpj, razao_social):
-            self.entry_cnpj.delete(0, tk.END)
-            self.entry_razao_social.delete(0, tk.END)
-            self.carregar_empresas()
-            self.atualizar_dashboard()
+        def concluido(sucesso):
+            if sucesso:
+                self.entry_cnpj.delete(0, tk.END)
+                self.entry_razao_social.delete(0, tk.END)
+                self.carregar_empresas()
+                self.atualizar_dashboard()
+        
+        self.executar_em_segundo_plano(EmpresaService.criar_empresa, cnpj, razao_social, on_success=concluido)
     
     def cadastrar_filial(self):
         """Cadastra uma nova filial"""
@@ -619,12 +944,15 @@ class SistemaManutencaoApp:
             messagebox.showwarning("Atenção", "Por favor, preencha todos os campos!")
             return
         
-        if EmpresaService.criar_filial(cnpj_ind, nome):
-            self.entry_cnpj_filial.delete(0, tk.END)
-            self.entry_nome_filial.delete(0, tk.END)
-            self.carregar_filiais()
-            self.carregar_filiais_combobox()
-            self.atualizar_dashboard()
+        def concluido(sucesso):
+            if sucesso:
+                self.entry_cnpj_filial.delete(0, tk.END)
+                self.entry_nome_filial.delete(0, tk.END)
+                self.carregar_filiais()
+                self.carregar_filiais_combobox()
+                self.atualizar_dashboard()
+        
+        self.executar_em_segundo_plano(EmpresaService.criar_filial, cnpj_ind, nome, on_success=concluido)
     
     def cadastrar_colaborador(self):
         """Cadastra um novo colaborador"""
@@ -637,49 +965,62 @@ class SistemaManutencaoApp:
                 messagebox.showwarning("Atenção", "Por favor, preencha todos os campos!")
                 return
             
-            if ColaboradorService.criar_colaborador(matricula, nome, cargo):
-                self.entry_matricula.delete(0, tk.END)
-                self.entry_nome_colab.delete(0, tk.END)
-                self.entry_cargo.delete(0, tk.END)
-                self.carregar_colaboradores()
-                self.carregar_responsaveis()
-                self.atualizar_dashboard()
+            def concluido(sucesso):
+                if sucesso:
+                    self.entry_matricula.delete(0, tk.END)
+                    self.entry_nome_colab.delete(0, tk.END)
+                    self.entry_cargo.delete(0, tk.END)
+                    self.carregar_colaboradores()
+                    self.carregar_responsaveis()
+                    self.atualizar_dashboard()
+            
+            self.executar_em_segundo_plano(
+                ColaboradorService.criar_colaborador, matricula, nome, cargo, on_success=concluido
+            )
                 
         except ValueError:
             messagebox.showerror("Erro", "Matrícula deve ser um número!")
     
+    @staticmethod
+    def _criar_solicitacao_validada(area, responsavel, filial_nome, descricao):
+        """
+        Parte da criação de solicitação que acessa o banco (roda em segundo plano)
+        Retorna (numero_os, mensagem_de_erro)
+        """
+        # Verifica se o responsável está cadastrado
+        if not ColaboradorService.existe_colaborador(responsavel):
+            return None, "Por favor, selecione um responsável válido da lista!"
+        
+        # Buscar CNPJ da filial selecionada
+        filial_cnpj = None
+        if filial_nome:
+            filial = EmpresaService.buscar_filial_por_nome(filial_nome)
+            if filial:
+                filial_cnpj = filial.cnpj_ind
+        
+        # Criar solicitação com número automático
+        numero_os = SolicitacaoService.criar_solicitacao_automatica(area, responsavel, descricao, filial_cnpj)
+        return numero_os, None
+    
     def criar_solicitacao_automatica(self):
         """Cria solicitação com número automático E VALIDAÇÕES"""
-        try:
-            area = self.combo_area.get().strip()
-            responsavel = self.combo_responsavel.get().strip()
-            filial_nome = self.combo_filial.get().strip()
-            descricao = self.text_descricao.get('1.0', tk.END).strip()
-            
-            # VALIDAÇÕES ROBUSTAS
-            errors = Validators.validar_solicitacao_dados(area, responsavel, descricao)
-            if errors:
-                messagebox.showerror("Erro de Validação", "\n".join(errors))
-                return
-            
-            # Verifica se o responsável existe na lista
-            responsaveis_validos = ColaboradorService.listar_nomes_colaboradores()
-            if responsavel not in responsaveis_validos:
-                messagebox.showerror("Erro", "Por favor, selecione um responsável válido da lista!")
+        area = self.combo_area.get().strip()
+        responsavel = self.combo_responsavel.get().strip()
+        filial_nome = self.combo_filial.get().strip()
+        descricao = self.text_descricao.get('1.0', tk.END).strip()
+        
+        # VALIDAÇÕES ROBUSTAS
+        errors = Validators.validar_solicitacao_dados(area, responsavel, descricao)
+        if errors:
+            messagebox.showerror("Erro de Validação", "\n".join(errors))
+            return
+        
+        def concluido(resultado):
+            numero_os, erro = resultado
+            if erro:
+                messagebox.showerror("Erro", erro)
                 return
             
-            # Buscar CNPJ da filial selecionada
-            filial_cnpj = None
-            if filial_nome:
-                filiais = EmpresaService.listar_filiais()
-                for filial in filiais:
-                    if filial.nome == filial_nome:
-                        filial_cnpj = filial.cnpj_ind
-                        break
-            
-            # Criar solicitação com número automático
-            numero_os = SolicitacaoService.criar_solicitacao_automatica(area, responsavel, descricao, filial_cnpj)
-            
             if numero_os:
                 messagebox.showinfo("Sucesso", f"Solicitação #{numero_os} criada com sucesso!")
                 
@@ -693,16 +1034,21 @@ class SistemaManutencaoApp:
                 self.carregar_solicitacoes()
                 self.atualizar_proximo_numero()
                 self.atualizar_dashboard()
-                
-        except Exception as e:
+        
+        def falhou(e):
             messagebox.showerror("Erro", f"Erro ao criar solicitação: {e}")
+        
+        self.executar_em_segundo_plano(
+            self._criar_solicitacao_validada, area, responsavel, filial_nome, descricao,
+            on_success=concluido, on_error=falhou
+        )
             
     
     # ========== MÉTODOS DE PDF ==========
     
     def gerar_pdf_solicitacao(self):
         """NOVO: Gera PDF da solicitação selecionada"""
-        selecionado = self.tree_solicitacoes.selection()
+        selecionado = self.lista_solicitacoes.selecao()
         if not selecionado:
             messagebox.showwarning("Atenção", "Por favor, selecione uma solicitação para gerar o PDF!")
             return
@@ -710,10 +1056,14 @@ class SistemaManutencaoApp:
         item = selecionado[0]
         n_solicitacao = self.tree_solicitacoes.item(item)['values'][0]
         
-        try:
-            # Buscar dados completos da solicitação
-            solicitacao = SolicitacaoService.buscar_solicitacao_por_numero(n_solicitacao)
-            
+        def buscar():
+            # O gerador de PDF (reportlab) só é importado no primeiro uso,
+            # ainda na thread de trabalho, para não pesar na inicialização
+            from utils.pdf_generator import gerar_e_abrir_os_pdf
+            return gerar_e_abrir_os_pdf, SolicitacaoService.buscar_solicitacao_por_numero(n_solicitacao)
+        
+        def gerar(resultado):
+            gerar_e_abrir_os_pdf, solicitacao = resultado
             if solicitacao:
                 # Gerar e abrir PDF
                 if gerar_e_abrir_os_pdf(solicitacao):
@@ -722,85 +1072,242 @@ class SistemaManutencaoApp:
                     messagebox.showerror("Erro", "Não foi possível gerar o PDF")
             else:
                 messagebox.showerror("Erro", "Solicitação não encontrada")
-                
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao gerar PDF: {e}")        
+        
+        def falhou(e):
+            messagebox.showerror("Erro", f"Erro ao gerar PDF: {e}")
+        
+        # Buscar dados completos da solicitação
+        self.executar_em_segundo_plano(buscar, on_success=gerar, on_error=falhou)
             
     # ========== MÉTODOS DE CARREGAMENTO ==========
     
     def carregar_empresas(self):
         """Carrega a lista de empresas no treeview"""
-        for item in self.tree_empresas.get_children():
-            self.tree_empresas.delete(item)
-        
-        empresas = EmpresaService.listar_empresas()
-        for empresa in empresas:
-            self.tree_empresas.insert('', 'end', values=(empresa.cnpj, empresa.razao_social))
+        self.executar_em_segundo_plano(
+            EmpresaService.listar_empresas, chave='empresas', on_success=self.exibir_empresas
+        )
+    
+    def exibir_empresas(self, empresas):
+        """Atualiza o treeview de empresas (só as linhas que mudaram)"""
+        self.sync_empresas.aplicar(
+            (empresa.cnpj, (empresa.cnpj, empresa.razao_social)) for empresa in empresas
+        )
     
     def carregar_filiais(self):
         """Carrega a lista de filiais no treeview"""
-        for item in self.tree_filiais.get_children():
-            self.tree_filiais.delete(item)
-        
-        filiais = EmpresaService.listar_filiais()
-        for filial in filiais:
-            self.tree_filiais.insert('', 'end', values=(filial.cnpj_ind, filial.nome))
+        self.executar_em_segundo_plano(
+            EmpresaService.listar_filiais, chave='filiais', on_success=self.exibir_filiais
+        )
+    
+    def exibir_filiais(self, filiais):
+        """Atualiza o treeview de filiais (só as linhas que mudaram)"""
+        self.sync_filiais.aplicar(
+            (filial.cnpj_ind, (filial.cnpj_ind, filial.nome)) for filial in filiais
+        )
     
     def carregar_colaboradores(self):
         """Carrega a lista de colaboradores"""
-        for item in self.tree_colaboradores.get_children():
-            self.tree_colaboradores.delete(item)
-        
-        colaboradores = ColaboradorService.listar_colaboradores()
-        for colab in colaboradores:
-            self.tree_colaboradores.insert('', 'end', values=(colab.matricula, colab.nome, colab.cargo))
+        self.executar_em_segundo_plano(
+            ColaboradorService.listar_colaboradores, chave='colaboradores',
+            on_success=self.exibir_colaboradores
+        )
+    
+    def exibir_colaboradores(self, colaboradores):
+        """Atualiza o treeview de colaboradores (só as linhas que mudaram)"""
+        self.sync_colaboradores.aplicar(
+            (colab.matricula, (colab.matricula, colab.nome, colab.cargo)) for colab in colaboradores
+        )
     
     def carregar_solicitacoes(self):
-        """Carrega a lista de solicitações - VERSÃO MELHORADA"""
-        for item in self.tree_solicitacoes.get_children():
-            self.tree_solicitacoes.delete(item)
-        
-        solicitacoes = SolicitacaoService.listar_solicitacoes()
-        for sol in solicitacoes:
-            # Data de abertura formatada
-            data_abertura = ""
-            if sol.dt_abertura:
-                if hasattr(sol.dt_abertura, 'strftime'):
-                    data_abertura = sol.dt_abertura.strftime('%d/%m/%Y')
-                else:
-                    data_abertura = str(sol.dt_abertura)
-            
-            # Data de conclusão formatada
-            data_conclusao = ""
-            if sol.dt_conclusao:
-                if hasattr(sol.dt_conclusao, 'strftime'):
-                    data_conclusao = sol.dt_conclusao.strftime('%d/%m/%Y')
-                else:
-                    data_conclusao = str(sol.dt_conclusao)
-            
-            # Descrição com verificação segura para None
-            descricao_exibicao = ""
-            if sol.descricao:
-                if len(sol.descricao) > 50:
-                    descricao_exibicao = sol.descricao[:50] + '...'
-                else:
-                    descricao_exibicao = sol.descricao
+        """Recarrega a lista de solicitações (total + janela visível)"""
+        self.lista_solicitacoes.recarregar()
+    
+    def _pagina_solicitacoes(self, offset, limite, cursor):
+        """Busca e formata uma página da lista virtualizada (roda em segundo plano)"""
+        solicitacoes, proximo_cursor = SolicitacaoService.listar_solicitacoes_intervalo(
+            offset, limite, cursor,
+            filtros=self._filtros_solicitacoes, ordenacao=self._ordenacao_solicitacoes
+        )
+        linhas = [(sol.n_solicitacao, self._formatar_solicitacao(sol)) for sol in solicitacoes]
+        return linhas, proximo_cursor
+    
+    def _total_solicitacoes(self):
+        """Total da lista com os filtros atuais (roda em segundo plano)"""
+        return SolicitacaoService.contar_solicitacoes(self._filtros_solicitacoes)
+    
+    def exibir_total_filtrado(self, total):
+        """Mostra quantas solicitações atendem aos filtros"""
+        if self._filtros_solicitacoes:
+            self.label_total_filtrado.config(text=f"🔎 {total} encontrada(s)")
+        else:
+            self.label_total_filtrado.config(text=f"📋 {total} no total")
+    
+    # ========== FILTROS E ORDENAÇÃO ==========
+    
+    def agendar_filtro_solicitacoes(self, event=None):
+        """Aplica os filtros 300 ms depois da última tecla (evita uma consulta por tecla)"""
+        if self._agendamento_filtro is not None:
+            self.root.after_cancel(self._agendamento_filtro)
+        self._agendamento_filtro = self.root.after(300, self.aplicar_filtros_solicitacoes)
+    
+    @staticmethod
+    def _ler_data_filtro(entry):
+        """Data DD/MM/AAAA do campo de filtro (None se vazio ou incompleto)"""
+        texto = entry.get().strip()
+        try:
+            return datetime.strptime(texto, '%d/%m/%Y').date() if texto else None
+        except ValueError:
+            return None
+    
+    def aplicar_filtros_solicitacoes(self):
+        """Lê os campos de filtro e recarrega a lista se algo mudou"""
+        self._agendamento_filtro = None
+        filtros = {
+            'busca': self.entry_busca_solic.get().strip(),
+            'status': self.combo_filtro_status.get(),
+            'area': self.combo_filtro_area.get(),
+            'responsavel': self.combo_filtro_responsavel.get().strip(),
+            'filial': self.combo_filtro_filial.get().strip(),
+            'data_inicio': self._ler_data_filtro(self.entry_filtro_data_inicio),
+            'data_fim': self._ler_data_filtro(self.entry_filtro_data_fim),
+        }
+        filtros = {chave: valor for chave, valor in filtros.items() if valor}
+        
+        if filtros != self._filtros_solicitacoes:
+            self._filtros_solicitacoes = filtros
+            self.lista_solicitacoes.recarregar(nova_consulta=True)
+    
+    def limpar_filtros_solicitacoes(self):
+        """Remove todos os filtros da lista de solicitações"""
+        for entry in (self.entry_busca_solic, self.entry_filtro_data_inicio, self.entry_filtro_data_fim):
+            entry.delete(0, tk.END)
+        for combo in (self.combo_filtro_status, self.combo_filtro_area,
+                      self.combo_filtro_responsavel, self.combo_filtro_filial):
+            combo.set('')
+        self.aplicar_filtros_solicitacoes()
+    
+    def abrir_busca_textual(self):
+        """Janela de busca textual nas descrições das solicitações"""
+        janela = tk.Toplevel(self.root)
+        janela.title("🔍 Busca Textual nas Solicitações")
+        janela.geometry("900x450")
+        janela.configure(bg='#34495E')
+        
+        frame_busca = ttk.Frame(janela, padding=10)
+        frame_busca.pack(fill='x')
+        
+        ttk.Label(frame_busca, text='Termos (ex.: "quadro elétrico" -disjuntor):').pack(side='left')
+        entry_termo = ttk.Entry(frame_busca, width=45)
+        entry_termo.pack(side='left', padx=5)
+        label_resultado = ttk.Label(frame_busca, text="")
+        
+        colunas = ('Nº', 'Abertura', 'Status', 'Relevância', 'Trecho')
+        tree = ttk.Treeview(janela, columns=colunas, show='headings')
+        for col, largura in zip(colunas, (70, 90, 100, 80, 520)):
+            tree.heading(col, text=col)
+            tree.column(col, width=largura)
+        tree.pack(fill='both', expand=True, padx=10, pady=5)
+        sync = TreeviewSync(tree)
+        
+        def exibir(resultados):
+            linhas = []
+            for sol, relevancia, trecho in resultados:
+                abertura = sol.dt_abertura.strftime('%d/%m/%Y') if hasattr(sol.dt_abertura, 'strftime') else ""
+                linhas.append((sol.n_solicitacao, (
+                    sol.n_solicitacao, abertura, sol.status or "",
+                    f"{relevancia:.3f}", ' '.join((trecho or '').split())
+                )))
+            sync.aplicar(linhas)
+            label_resultado.config(text=f"{len(linhas)} resultado(s)")
+        
+        def buscar(event=None):
+            termo = entry_termo.get().strip()
+            if not termo:
+                return
+            label_resultado.config(text="Buscando...")
+            self.executar_em_segundo_plano(
+                SolicitacaoService.buscar_texto, termo, 100,
+                chave='busca_textual', on_success=exibir
+            )
+        
+        def abrir_na_lista(event=None):
+            selecionado = tree.selection()
+            if not selecionado:
+                return
+            # Mostra a OS na lista principal usando o filtro por número
+            self.limpar_filtros_solicitacoes()
+            self.entry_busca_solic.insert(0, selecionado[0])
+            self.aplicar_filtros_solicitacoes()
+        
+        ttk.Button(frame_busca, text="Buscar", command=buscar).pack(side='left', padx=5)
+        label_resultado.pack(side='left', padx=10)
+        
+        entry_termo.bind('<Return>', buscar)
+        tree.bind('<Double-1>', abrir_na_lista)
+        entry_termo.focus_set()
+    
+    def ordenar_solicitacoes(self, coluna):
+        """Ordena pela coluna clicada; clicar de novo inverte; a terceira volta ao padrão"""
+        atributo = self._colunas_solicitacoes[coluna]
+        atual = self._ordenacao_solicitacoes
+        
+        if atual is None or atual[0] != atributo:
+            self._ordenacao_solicitacoes = (atributo, 'ASC')
+        elif atual[1] == 'ASC':
+            self._ordenacao_solicitacoes = (atributo, 'DESC')
+        else:
+            self._ordenacao_solicitacoes = None
+        
+        for nome, attr in self._colunas_solicitacoes.items():
+            seta = ''
+            if self._ordenacao_solicitacoes and self._ordenacao_solicitacoes[0] == attr:
+                seta = ' ▲' if self._ordenacao_solicitacoes[1] == 'ASC' else ' ▼'
+            self.tree_solicitacoes.heading(nome, text=nome + seta)
+        
+        self.lista_solicitacoes.recarregar(nova_consulta=True)
+    
+    @staticmethod
+    def _formatar_solicitacao(sol):
+        """Valores exibidos no treeview de solicitações"""
+        # Data de abertura formatada
+        data_abertura = ""
+        if sol.dt_abertura:
+            if hasattr(sol.dt_abertura, 'strftime'):
+                data_abertura = sol.dt_abertura.strftime('%d/%m/%Y')
             else:
-                descricao_exibicao = "Sem descrição"
-            
-            # Nome da filial (usa nome_filial se disponível, senão usa filial)
-            nome_filial = sol.nome_filial if sol.nome_filial else (sol.filial if sol.filial else "Não informada")
-            
-            self.tree_solicitacoes.insert('', 'end', values=(
-                str(sol.n_solicitacao) if sol.n_solicitacao else "",
-                data_abertura,
-                data_conclusao,
-                str(sol.area) if sol.area else "",
-                str(sol.status) if sol.status else "",
-                str(sol.responsavel) if sol.responsavel else "",
-                nome_filial,
-                descricao_exibicao
-            ))
+                data_abertura = str(sol.dt_abertura)
+        
+        # Data de conclusão formatada
+        data_conclusao = ""
+        if sol.dt_conclusao:
+            if hasattr(sol.dt_conclusao, 'strftime'):
+                data_conclusao = sol.dt_conclusao.strftime('%d/%m/%Y')
+            else:
+                data_conclusao = str(sol.dt_conclusao)
+        
+        # Descrição com verificação segura para None
+        descricao_exibicao = ""
+        if sol.descricao:
+            if len(sol.descricao) > 50:
+                descricao_exibicao = sol.descricao[:50] + '...'
+            else:
+                descricao_exibicao = sol.descricao
+        else:
+            descricao_exibicao = "Sem descrição"
+        
+        # Nome da filial (usa nome_filial se disponível, senão usa filial)
+        nome_filial = sol.nome_filial if sol.nome_filial else (sol.filial if sol.filial else "Não informada")
+        
+        return (
+            str(sol.n_solicitacao) if sol.n_solicitacao else "",
+            data_abertura,
+            data_conclusao,
+            str(sol.area) if sol.area else "",
+            str(sol.status) if sol.status else "",
+            str(sol.responsavel) if sol.responsavel else "",
+            nome_filial,
+            descricao_exibicao
+        )
     
     # ========== MÉTODOS DE DELETE ==========
     
@@ -821,12 +1328,15 @@ class SistemaManutencaoApp:
         )
         
         if confirmacao:
-            if EmpresaService.deletar_empresa(cnpj):
-                messagebox.showinfo("Sucesso", "Empresa deletada com sucesso!")
-                self.carregar_empresas()
-                self.atualizar_dashboard()
-            else:
-                messagebox.showerror("Erro", "Erro ao deletar empresa. Verifique se não há registros vinculados.")
+            def concluido(sucesso):
+                if sucesso:
+                    messagebox.showinfo("Sucesso", "Empresa deletada com sucesso!")
+                    self.carregar_empresas()
+                    self.atualizar_dashboard()
+                else:
+                    messagebox.showerror("Erro", "Erro ao deletar empresa. Verifique se não há registros vinculados.")
+            
+            self.executar_em_segundo_plano(EmpresaService.deletar_empresa, cnpj, on_success=concluido)
     
     def deletar_filial(self):
         """Deleta a filial selecionada"""
@@ -845,13 +1355,16 @@ class SistemaManutencaoApp:
         )
         
         if confirmacao:
-            if EmpresaService.deletar_filial(cnpj_ind):
-                messagebox.showinfo("Sucesso", "Filial deletada com sucesso!")
-                self.carregar_filiais()
-                self.carregar_filiais_combobox()
-                self.atualizar_dashboard()
-            else:
-                messagebox.showerror("Erro", "Erro ao deletar filial. Verifique se não há registros vinculados.")
+            def concluido(sucesso):
+                if sucesso:
+                    messagebox.showinfo("Sucesso", "Filial deletada com sucesso!")
+                    self.carregar_filiais()
+                    self.carregar_filiais_combobox()
+                    self.atualizar_dashboard()
+                else:
+                    messagebox.showerror("Erro", "Erro ao deletar filial. Verifique se não há registros vinculados.")
+            
+            self.executar_em_segundo_plano(EmpresaService.deletar_filial, cnpj_ind, on_success=concluido)
     
     def deletar_colaborador(self):
         """Deleta o colaborador selecionado"""
@@ -870,17 +1383,20 @@ class SistemaManutencaoApp:
         )
         
         if confirmacao:
-            if ColaboradorService.deletar_colaborador(matricula):
-                messagebox.showinfo("Sucesso", "Colaborador deletado com sucesso!")
-                self.carregar_colaboradores()
-                self.carregar_responsaveis()
-                self.atualizar_dashboard()
-            else:
-                messagebox.showerror("Erro", "Erro ao deletar colaborador. Verifique se não há registros vinculados.")
+            def concluido(sucesso):
+                if sucesso:
+                    messagebox.showinfo("Sucesso", "Colaborador deletado com sucesso!")
+                    self.carregar_colaboradores()
+                    self.carregar_responsaveis()
+                    self.atualizar_dashboard()
+                else:
+                    messagebox.showerror("Erro", "Erro ao deletar colaborador. Verifique se não há registros vinculados.")
+            
+            self.executar_em_segundo_plano(ColaboradorService.deletar_colaborador, matricula, on_success=concluido)
     
     def deletar_solicitacao(self):
         """Deleta a solicitação selecionada"""
-        selecionado = self.tree_solicitacoes.selection()
+        selecionado = self.lista_solicitacoes.selecao()
         if not selecionado:
             messagebox.showwarning("Atenção", "Por favor, selecione uma solicitação para deletar!")
             return
@@ -895,18 +1411,21 @@ class SistemaManutencaoApp:
         )
         
         if confirmacao:
-            if SolicitacaoService.deletar_solicitacao(n_solicitacao):
-                messagebox.showinfo("Sucesso", "Solicitação deletada com sucesso!")
-                self.carregar_solicitacoes()
-                self.atualizar_dashboard()
-            else:
-                messagebox.showerror("Erro", "Erro ao deletar solicitação.")
+            def concluido(sucesso):
+                if sucesso:
+                    messagebox.showinfo("Sucesso", "Solicitação deletada com sucesso!")
+                    self.carregar_solicitacoes()
+                    self.atualizar_dashboard()
+                else:
+                    messagebox.showerror("Erro", "Erro ao deletar solicitação.")
+            
+            self.executar_em_segundo_plano(SolicitacaoService.deletar_solicitacao, n_solicitacao, on_success=concluido)
     
     # ========== MÉTODOS DE ATUALIZAÇÃO ==========
     
     def atualizar_status_solicitacao(self, novo_status):
         """Atualiza o status da solicitação selecionada"""
-        selecionado = self.tree_solicitacoes.selection()
+        selecionado = self.lista_solicitacoes.selecao()
         if not selecionado:
             messagebox.showwarning("Atenção", "Por favor, selecione uma solicitação!")
             return
@@ -914,62 +1433,88 @@ class SistemaManutencaoApp:
         item = selecionado[0]
         n_solicitacao = self.tree_solicitacoes.item(item)['values'][0]
         
-        if SolicitacaoService.atualizar_status_solicitacao(n_solicitacao, novo_status):
-            messagebox.showinfo("Sucesso", f"Status atualizado para: {novo_status}")
-            self.carregar_solicitacoes()
-            self.atualizar_dashboard()
+        def concluido(sucesso):
+            if sucesso:
+                messagebox.showinfo("Sucesso", f"Status atualizado para: {novo_status}")
+                self.carregar_solicitacoes()
+                self.atualizar_dashboard()
+        
+        self.executar_em_segundo_plano(
+            SolicitacaoService.atualizar_status_solicitacao, n_solicitacao, novo_status,
+            on_success=concluido
+        )
+    
+    @staticmethod
+    def _coletar_dashboard():
+        """Busca os dados do dashboard (roda em segundo plano)"""
+        return {
+            # Estatísticas básicas (apenas contagens, sem carregar as tabelas)
+            'total_empresas': EmpresaService.contar_empresas(),
+            'total_filiais': EmpresaService.contar_filiais(),
+            'total_colaboradores': ColaboradorService.contar_colaboradores(),
+            # Estatísticas detalhadas das solicitações (inclui o total)
+            'estatisticas': SolicitacaoService.obter_estatisticas_solicitacoes(),
+            'ultimas': SolicitacaoService.listar_ultimas_solicitacoes(8)  # 8 mais recentes
+        }
     
     def atualizar_dashboard(self):
         """Atualiza as informações do dashboard - VERSÃO MELHORADA"""
-        try:
-            # Estatísticas básicas
-            empresas = EmpresaService.listar_empresas() or []
-            filiais = EmpresaService.listar_filiais() or []
-            colaboradores = ColaboradorService.listar_colaboradores() or []
-            solicitacoes = SolicitacaoService.listar_solicitacoes() or []
-            
-            # Estatísticas detalhadas das solicitações
-            estatisticas = SolicitacaoService.obter_estatisticas_solicitacoes()
-            
-            # Atualizar labels principais
-            self.label_total_empresas.config(text=f"🏢 Empresas: {len(empresas)}")
-            self.label_total_filiais.config(text=f"🏪 Filiais: {len(filiais)}")
-            self.label_total_colaboradores.config(text=f"👥 Colaboradores: {len(colaboradores)}")
-            self.label_total_solicitacoes.config(text=f"📋 Total Solicitações: {len(solicitacoes)}")
-            
-            # Atualizar estatísticas detalhadas de solicitações
-            self.label_solicitacoes_abertas.config(text=f"🟢 Abertas: {estatisticas.get('aberta', 0)}")
-            self.label_solicitacoes_andamento.config(text=f"🟡 Em Andamento: {estatisticas.get('em andamento', 0)}")
-            self.label_solicitacoes_concluidas.config(text=f"🔵 Concluídas: {estatisticas.get('concluída', 0)}")
-            self.label_solicitacoes_canceladas.config(text=f"🔴 Canceladas: {estatisticas.get('cancelada', 0)}")
+        def erro(e):
+            print(f"⚠️ Erro ao atualizar dashboard: {e}")
+        
+        self.executar_em_segundo_plano(
+            self._coletar_dashboard, chave='dashboard',
+            on_success=self.exibir_dashboard, on_error=erro
+        )
+    
+    def exibir_dashboard(self, dados):
+        """Preenche o dashboard com os dados coletados"""
+        if not self._relatorio_inicializacao_exibido:
+            self._relatorio_inicializacao_exibido = True
+            self.root.after_idle(self._concluir_inicializacao)
+        
+        estatisticas = dados['estatisticas']
+        
+        # Atualizar labels principais
+        self.label_total_empresas.config(text=f"🏢 Empresas: {dados['total_empresas']}")
+        self.label_total_filiais.config(text=f"🏪 Filiais: {dados['total_filiais']}")
+        self.label_total_colaboradores.config(text=f"👥 Colaboradores: {dados['total_colaboradores']}")
+        self.label_total_solicitacoes.config(text=f"📋 Total Solicitações: {estatisticas.get('total', 0)}")
+        
+        # Atualizar estatísticas detalhadas de solicitações
+        self.label_solicitacoes_abertas.config(text=f"🟢 Abertas: {estatisticas.get('aberta', 0)}")
+        self.label_solicitacoes_andamento.config(text=f"🟡 Em Andamento: {estatisticas.get('em andamento', 0)}")
+        self.label_solicitacoes_concluidas.config(text=f"🔵 Concluídas: {estatisticas.get('concluída', 0)}")
+        self.label_solicitacoes_canceladas.config(text=f"🔴 Canceladas: {estatisticas.get('cancelada', 0)}")
+        
+        # Atualizar últimas solicitações (só as linhas que mudaram)
+        linhas = []
+        for sol in dados['ultimas']:
+            # Data formatada com verificação segura
+            data_formatada = ""
+            if sol.dt_abertura:
+                if hasattr(sol.dt_abertura, 'strftime'):
+                    data_formatada = sol.dt_abertura.strftime('%d/%m/%Y')
+                else:
+                    data_formatada = str(sol.dt_abertura)
             
-            # Atualizar últimas solicitações
-            for item in self.tree_ultimas_solic.get_children():
-                self.tree_ultimas_solic.delete(item)
+            # Nome da filial
+            nome_filial = sol.nome_filial if sol.nome_filial else (sol.filial if sol.filial else "Não informada")
             
-            ultimas = solicitacoes[:8]  # 8 mais recentes
-            for sol in ultimas:
-                # Data formatada com verificação segura
-                data_formatada = ""
-                if sol.dt_abertura:
-                    if hasattr(sol.dt_abertura, 'strftime'):
-                        data_formatada = sol.dt_abertura.strftime('%d/%m/%Y')
-                    else:
-                        data_formatada = str(sol.dt_abertura)
-                
-                # Nome da filial
-                nome_filial = sol.nome_filial if sol.nome_filial else (sol.filial if sol.filial else "Não informada")
-                
-                self.tree_ultimas_solic.insert('', 'end', values=(
-                    str(sol.n_solicitacao) if sol.n_solicitacao else "",
-                    data_formatada,
-                    str(sol.area) if sol.area else "",
-                    str(sol.status) if sol.status else "",
-                    nome_filial
-                ))
-                
-        except Exception as e:
-            print(f"⚠️ Erro ao atualizar dashboard: {e}")
+            linhas.append((sol.n_solicitacao, (
+                str(sol.n_solicitacao) if sol.n_solicitacao else "",
+                data_formatada,
+                str(sol.area) if sol.area else "",
+                str(sol.status) if sol.status else "",
+                nome_filial
+            )))
+        
+        self.sync_ultimas_solic.aplicar(linhas)
+
+    def _concluir_inicializacao(self):
+        """Primeiro dashboard na tela: fecha a medição da inicialização"""
+        self.marcar_etapa_inicializacao("dashboard exibido")
+        self.exibir_relatorio_inicializacao()
 
 # Função para iniciar a aplicação
 def main():
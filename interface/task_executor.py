@@ -0,0 +1,158 @@
+# 📄 interface/task_executor.py
+"""
+EXECUTOR DE TAREFAS EM SEGUNDO PLANO PARA A INTERFACE
+Roda o trabalho de banco em threads e devolve os resultados na thread do Tk
+"""
+
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskExecutor:
+    """
+    Pool de threads para chamadas aos serviços.
+
+    - submit() executa a função em uma thread de trabalho
+    - os callbacks (on_success / on_error / on_finally) rodam sempre na thread
+      do Tk: os resultados passam por uma fila consumida via root.after
+    - tarefas com a mesma `chave` se substituem: a mais nova cancela a anterior
+      (se ainda não começou) e o resultado da antiga é descartado
+    """
+
+    def __init__(self, root, max_workers=4, intervalo_ms=50, on_ocupado=None, on_erro=None):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.on_ocupado = on_ocupado      # callback(qtd_tarefas_pendentes)
+        self.on_erro = on_erro            # tratador padrão de exceções
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tarefa')
+        self._fila = queue.Queue()
+        self._lock = threading.Lock()
+        self._geracoes = {}   # chave -> número da tarefa mais recente
+        self._futuros = {}    # chave -> future da tarefa mais recente
+        self._contador = 0
+        self._pendentes = 0
+        self._encerrado = False
+
+        self.root.after(self.intervalo_ms, self._processar_fila)
+
+    # ---------- API ----------
+
+    def submit(self, funcao, *args, chave=None, on_success=None, on_error=None,
+               on_finally=None, **kwargs):
+        """
+        Agenda funcao(*args, **kwargs) em segundo plano.
+        Deve ser chamado a partir da thread do Tk.
+        """
+        if self._encerrado:
+            return None
+
+        with self._lock:
+            self._contador += 1
+            geracao = self._contador
+            if chave is not None:
+                self._geracoes[chave] = geracao
+                anterior = self._futuros.pop(chave, None)
+            else:
+                anterior = None
+
+        if anterior is not None and anterior.cancel():
+            # A tarefa substituída nem começou: não vai gerar resultado
+            self._alterar_pendentes(-1)
+
+        self._alterar_pendentes(+1)
+
+        def executar():
+            try:
+                resultado = funcao(*args, **kwargs)
+                self._fila.put((chave, geracao, True, resultado, on_success, on_error, on_finally))
+            except Exception as e:
+                e.traceback_texto = traceback.format_exc()
+                self._fila.put((chave, geracao, False, e, on_success, on_error, on_finally))
+
+        futuro = self._executor.submit(executar)
+        if chave is not None:
+            with self._lock:
+                if self._geracoes.get(chave) == geracao:
+                    self._futuros[chave] = futuro
+        return futuro
+
+    def cancelar(self, chave):
+        """Descarta a tarefa pendente de uma chave (o resultado será ignorado)"""
+        with self._lock:
+            self._contador += 1
+            self._geracoes[chave] = self._contador
+            futuro = self._futuros.pop(chave, None)
+        if futuro is not None and futuro.cancel():
+            self._alterar_pendentes(-1)
+
+    def chamar_na_thread_principal(self, funcao, *args):
+        """Agenda funcao(*args) na thread do Tk (pode ser chamado de qualquer thread)"""
+        self._fila.put((None, None, None, (funcao, args), None, None, None))
+
+    def encerrar(self):
+        """Para de aceitar tarefas e cancela as que ainda não começaram"""
+        self._encerrado = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def pendentes(self):
+        return self._pendentes
+
+    # ---------- THREAD DO TK ----------
+
+    def _alterar_pendentes(self, delta):
+        self._pendentes += delta
+        if self.on_ocupado:
+            try:
+                self.on_ocupado(self._pendentes)
+            except Exception as e:
+                print(f"⚠️ Erro no indicador de carregamento: {e}")
+
+    def _processar_fila(self):
+        """Executa na thread do Tk os callbacks das tarefas concluídas"""
+        if self._encerrado:
+            return
+
+        try:
+            while True:
+                chave, geracao, sucesso, valor, on_success, on_error, on_finally = self._fila.get_nowait()
+
+                if sucesso is None:
+                    funcao, args = valor
+                    self._executar_callback(funcao, *args)
+                    continue
+
+                self._alterar_pendentes(-1)
+
+                with self._lock:
+                    if chave is not None:
+                        if self._geracoes.get(chave) != geracao:
+                            continue  # resultado de uma tarefa substituída
+                        self._futuros.pop(chave, None)
+
+                if sucesso:
+                    if on_success:
+                        self._executar_callback(on_success, valor)
+                else:
+                    tratador = on_error or self.on_erro
+                    if tratador:
+                        self._executar_callback(tratador, valor)
+                    else:
+                        print(f"❌ Erro em tarefa de segundo plano: {valor}")
+
+                if on_finally:
+                    self._executar_callback(on_finally)
+        except queue.Empty:
+            pass
+
+        self.root.after(self.intervalo_ms, self._processar_fila)
+
+    def _executar_callback(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"❌ Erro ao atualizar a interface: {e}")
+            traceback.print_exc()
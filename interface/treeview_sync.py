@@ -0,0 +1,70 @@
+# 📄 interface/treeview_sync.py
+"""
+ATUALIZAÇÃO INCREMENTAL DE TREEVIEW
+Compara o novo resultado com as linhas exibidas (por chave) e aplica
+somente as inserções, alterações, remoções e reordenações necessárias.
+Como os itens existentes não são recriados, seleção e rolagem são preservadas.
+"""
+
+
+class TreeviewSync:
+    """
+    Reconciliação por chave para um ttk.Treeview plano (sem hierarquia).
+    Cada linha exibida usa str(chave) como iid.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._valores = {}   # iid -> valores exibidos
+        self._ordem = []     # iids na ordem exibida
+
+    def aplicar(self, linhas):
+        """
+        linhas: [(chave, valores), ...] na ordem desejada
+        Retorna (inseridas, alteradas, removidas, movidas)
+        """
+        novas = []
+        chaves_novas = set()
+        for chave, valores in linhas:
+            iid = str(chave)
+            if iid not in chaves_novas:  # chave repetida: vale a primeira ocorrência
+                chaves_novas.add(iid)
+                novas.append((iid, tuple(valores)))
+
+        # Itens inseridos por fora do sincronizador (não têm chave conhecida)
+        estranhos = [iid for iid in self.tree.get_children() if iid not in self._valores]
+        if estranhos:
+            self.tree.delete(*estranhos)
+
+        removidas = [iid for iid in self._ordem if iid not in chaves_novas]
+        if removidas:
+            self.tree.delete(*removidas)
+            for iid in removidas:
+                del self._valores[iid]
+
+        atual = [iid for iid in self._ordem if iid in chaves_novas]
+        inseridas = alteradas = movidas = 0
+
+        for posicao, (iid, valores) in enumerate(novas):
+            if iid in self._valores:
+                if self._valores[iid] != valores:
+                    self.tree.item(iid, values=valores)
+                    self._valores[iid] = valores
+                    alteradas += 1
+                if posicao >= len(atual) or atual[posicao] != iid:
+                    self.tree.move(iid, '', posicao)
+                    atual.remove(iid)
+                    atual.insert(posicao, iid)
+                    movidas += 1
+            else:
+                self.tree.insert('', posicao, iid=iid, values=valores)
+                self._valores[iid] = valores
+                atual.insert(posicao, iid)
+                inseridas += 1
+
+        self._ordem = atual
+        return inseridas, alteradas, len(removidas), movidas
+
+    def limpar(self):
+        """Remove todas as linhas"""
+        return self.aplicar([])
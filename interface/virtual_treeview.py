@@ -0,0 +1,287 @@
+# 📄 interface/virtual_treeview.py
+"""
+TREEVIEW VIRTUALIZADO
+Mostra listas enormes materializando apenas as linhas visíveis;
+as páginas são buscadas no banco sob demanda, conforme a rolagem
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+
+from interface.treeview_sync import TreeviewSync
+
+
+class VirtualTreeview(ttk.Frame):
+    """
+    Treeview + barra de rolagem própria que cobre `total` linhas virtuais.
+
+    fonte_pagina(offset, limite, cursor) -> (linhas, proximo_cursor)
+        roda em segundo plano; linhas = [(chave, valores), ...]
+        cursor = proximo_cursor da página anterior, quando já carregada
+        (permite paginação por chave em vez de OFFSET na rolagem sequencial)
+    fonte_total() -> int
+        roda em segundo plano; quantidade total de linhas
+    ao_atualizar_total(total)
+        opcional; chamado na thread do Tk quando o total chega
+    """
+
+    PLACEHOLDER = '…'
+    PREFIXO_CARREGANDO = '__carregando_'  # chave das linhas ainda não carregadas
+
+    def __init__(self, master, columns, fonte_pagina, fonte_total, executor,
+                 tamanho_pagina=100, max_paginas=20, nome='virtual', ao_atualizar_total=None,
+                 **tree_kwargs):
+        super().__init__(master)
+
+        self.fonte_pagina = fonte_pagina
+        self.fonte_total = fonte_total
+        self.executor = executor
+        self.tamanho_pagina = tamanho_pagina
+        self.max_paginas = max_paginas
+        self.nome = nome
+        self.colunas = columns
+        self.ao_atualizar_total = ao_atualizar_total
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', **tree_kwargs)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self._ao_rolar)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.sync = TreeviewSync(self.tree)
+
+        self.total = 0
+        self.inicio = 0
+        self.linhas_visiveis = int(tree_kwargs.get('height', 10))
+
+        self._paginas = OrderedDict()   # índice -> (linhas, proximo_cursor) (LRU)
+        self._paginas_antigas = {}      # páginas de antes do último recarregar()
+        self._solicitadas = set()       # índices de página com busca em andamento
+        self._geracao = 0
+        self._selecionadas = set()      # chaves selecionadas (sobrevivem à rolagem)
+        self._renderizando = False
+
+        self.tree.bind('<<TreeviewSelect>>', self._ao_selecionar)
+        self.tree.bind('<Configure>', self._ao_redimensionar)
+        self.tree.bind('<MouseWheel>', self._ao_roda_mouse)
+        self.tree.bind('<Button-4>', lambda e: self.rolar(-3))
+        self.tree.bind('<Button-5>', lambda e: self.rolar(3))
+        self.tree.bind('<Prior>', lambda e: self.rolar(-self.linhas_visiveis))
+        self.tree.bind('<Next>', lambda e: self.rolar(self.linhas_visiveis))
+
+    # ---------- API ----------
+
+    def recarregar(self, nova_consulta=False):
+        """
+        Busca novamente total + janela visível.
+        As páginas atuais continuam exibidas até as novas chegarem; aí só as
+        linhas que mudaram são atualizadas no Treeview.
+        nova_consulta=True (filtros/ordenação mudaram): volta ao topo e
+        descarta as páginas antigas em vez de exibi-las enquanto carrega.
+        """
+        self._geracao += 1
+        geracao = self._geracao
+        for indice in list(self._solicitadas):
+            self.executor.cancelar(self._chave_tarefa(indice))
+        if nova_consulta:
+            self.inicio = 0
+            self._paginas_antigas = {}
+        else:
+            visiveis = self._paginas_visiveis()
+            self._paginas_antigas = {
+                indice: pagina
+                for indice, pagina in {**self._paginas_antigas, **self._paginas}.items()
+                if indice in visiveis
+            }
+        self._paginas.clear()
+        self._solicitadas.clear()
+
+        def exibir_total(total):
+            if geracao != self._geracao:
+                return
+            self.total = max(0, int(total or 0))
+            self.inicio = min(self.inicio, max(0, self.total - self.linhas_visiveis))
+            self._renderizar()
+            if self.ao_atualizar_total:
+                self.ao_atualizar_total(self.total)
+
+        self.executor.submit(self.fonte_total, chave=f'{self.nome}_total', on_success=exibir_total)
+
+    @property
+    def carregando(self):
+        """Há páginas sendo buscadas (o resultado pode ser anterior a uma alteração)"""
+        return bool(self._solicitadas)
+
+    def valores_carregados(self):
+        """{chave: valores} das linhas das páginas em memória"""
+        valores = {}
+        for paginas in (self._paginas_antigas, self._paginas):
+            for linhas, _ in paginas.values():
+                valores.update(linhas)
+        return valores
+
+    def atualizar_linhas(self, linhas):
+        """
+        Substitui os valores das linhas já carregadas com estas chaves (sem
+        buscar páginas de novo); quem chama garante que a posição não mudou
+        """
+        novos = dict(linhas)
+        for paginas in (self._paginas_antigas, self._paginas):
+            for indice, (linhas_pagina, cursor) in list(paginas.items()):
+                if any(chave in novos for chave, _ in linhas_pagina):
+                    paginas[indice] = (
+                        [(chave, novos.get(chave, valores)) for chave, valores in linhas_pagina],
+                        cursor
+                    )
+        self._renderizar()
+
+    def rolar(self, linhas):
+        """Desloca a janela visível em `linhas` (negativo = para cima)"""
+        self._posicionar(self.inicio + linhas)
+        return 'break'
+
+    def selecionadas(self):
+        """Chaves das linhas selecionadas"""
+        return {chave for chave in self._selecionadas if not self.carregando_linha(chave)}
+
+    def selecao(self):
+        """Itens selecionados no Treeview (só linhas carregadas), como tree.selection()"""
+        return tuple(item for item in self.tree.selection() if not self.carregando_linha(item))
+
+    @classmethod
+    def carregando_linha(cls, chave):
+        """A chave é de uma linha provisória (valores '…'), não de um registro"""
+        return str(chave).startswith(cls.PREFIXO_CARREGANDO)
+
+    # ---------- EVENTOS ----------
+
+    def _ao_rolar(self, *args):
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._posicionar(int(float(args[1]) * self.total))
+        elif args[0] == 'scroll':
+            passo = int(args[1])
+            if args[2] == 'pages':
+                passo *= self.linhas_visiveis
+            self._posicionar(self.inicio + passo)
+
+    def _ao_roda_mouse(self, event):
+        return self.rolar(-3 if event.delta > 0 else 3)
+
+    def _ao_redimensionar(self, event):
+        altura_linha = 20
+        try:
+            altura_linha = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        except (tk.TclError, ValueError):
+            pass
+        # Desconta o cabeçalho (aproximadamente uma linha)
+        visiveis = max(1, event.height // altura_linha - 1)
+        if visiveis != self.linhas_visiveis:
+            self.linhas_visiveis = visiveis
+            self.tree.configure(height=visiveis)
+            self._posicionar(self.inicio)
+
+    def _ao_selecionar(self, event=None):
+        if self._renderizando:
+            return
+        # Linhas provisórias não podem ser selecionadas
+        provisorias = [item for item in self.tree.selection() if self.carregando_linha(item)]
+        if provisorias:
+            self.tree.selection_remove(provisorias)
+        visiveis = set(self.tree.get_children())
+        self._selecionadas -= visiveis
+        self._selecionadas |= set(self.tree.selection()) - set(provisorias)
+
+    # ---------- JANELA VISÍVEL ----------
+
+    def _posicionar(self, inicio):
+        maximo = max(0, self.total - self.linhas_visiveis)
+        self.inicio = max(0, min(int(inicio), maximo))
+        self._renderizar()
+
+    def _linha(self, indice):
+        numero = indice // self.tamanho_pagina
+        pagina = self._paginas.get(numero) or self._paginas_antigas.get(numero)
+        if pagina is None:
+            return None
+        linhas = pagina[0]
+        posicao = indice % self.tamanho_pagina
+        return linhas[posicao] if posicao < len(linhas) else None
+
+    def _paginas_visiveis(self):
+        """Índices das páginas que cobrem a janela visível"""
+        fim = min(self.total, self.inicio + self.linhas_visiveis)
+        if fim <= self.inicio:
+            return set()
+        return set(range(self.inicio // self.tamanho_pagina, (fim - 1) // self.tamanho_pagina + 1))
+
+    def _renderizar(self):
+        fim = min(self.total, self.inicio + self.linhas_visiveis)
+        necessarias = self._paginas_visiveis()
+
+        # Páginas que saíram da janela não precisam mais ser buscadas
+        for indice in list(self._solicitadas - necessarias):
+            self.executor.cancelar(self._chave_tarefa(indice))
+            self._solicitadas.discard(indice)
+
+        for indice in necessarias:
+            if indice in self._paginas:
+                self._paginas.move_to_end(indice)
+            elif indice not in self._solicitadas:
+                self._buscar_pagina(indice)
+
+        linhas = []
+        for indice in range(self.inicio, fim):
+            linha = self._linha(indice)
+            if linha is None:
+                linha = (f'{self.PREFIXO_CARREGANDO}{indice}', tuple(self.PLACEHOLDER for _ in self.colunas))
+            linhas.append(linha)
+
+        self._exibir(linhas)
+
+        if self.total > 0:
+            self.scrollbar.set(self.inicio / self.total, fim / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _exibir(self, linhas):
+        """Ajusta as linhas materializadas à janela atual (só o que mudou)"""
+        self._renderizando = True
+        try:
+            self.sync.aplicar(linhas)
+            selecionar = [str(chave) for chave, _ in linhas if str(chave) in self._selecionadas]
+            self.tree.selection_set(selecionar)
+        finally:
+            self._renderizando = False
+
+    # ---------- PÁGINAS ----------
+
+    def _chave_tarefa(self, indice):
+        return f'{self.nome}_pagina_{indice}'
+
+    def _buscar_pagina(self, indice):
+        geracao = self._geracao
+        anterior = self._paginas.get(indice - 1)
+        cursor = anterior[1] if anterior else None
+        self._solicitadas.add(indice)
+
+        def recebida(resultado):
+            if geracao != self._geracao:
+                return
+            self._solicitadas.discard(indice)
+            self._paginas_antigas.pop(indice, None)
+            self._paginas[indice] = resultado
+            self._paginas.move_to_end(indice)
+            while len(self._paginas) > self.max_paginas:
+                self._paginas.popitem(last=False)
+            self._renderizar()
+
+        def falhou(erro):
+            if geracao == self._geracao:
+                self._solicitadas.discard(indice)
+            print(f"❌ Erro ao carregar página {indice}: {erro}")
+
+        self.executor.submit(
+            self.fonte_pagina, indice * self.tamanho_pagina, self.tamanho_pagina, cursor,
+            chave=self._chave_tarefa(indice), on_success=recebida, on_error=falhou
+        )
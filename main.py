@@ -4,6 +4,9 @@ PROGRAMA PRINCIPAL - Sistema de Gestão de Manutenção
 Ponto de entrada do sistema completo
 """
 
+import time
+INICIO = time.perf_counter()  # referência para o relatório de tempo de inicialização
+
 import tkinter as tk
 from tkinter import messagebox
 from interface.main_app import SistemaManutencaoApp
@@ -20,6 +23,60 @@ def verificar_dependencias():
         print(f"❌ Dependência não encontrada: {e}")
         return False
 
+def configurar_cache_em_disco():
+    """
+    Liga o cache em disco (CACHE_DISCO=0 desliga): ao reabrir o sistema as
+    listas de referência aparecem na hora e são revalidadas em segundo plano
+    """
+    from config.settings import CACHE_CONFIG, APP_CONFIG
+    if not CACHE_CONFIG['disco']:
+        return
+    
+    try:
+        from utils.cache_manager import cache_manager
+        from utils.disk_cache import DiskCache
+        from database.database import ler_versoes_entidades
+        
+        disco = DiskCache(CACHE_CONFIG['diretorio'], versao=APP_CONFIG['version'])
+        cache_manager.configurar_disco(disco, ler_versoes_entidades)
+        print(f"💾 Cache em disco: {disco.caminho}")
+    except Exception as e:
+        print(f"⚠️ Cache em disco desativado: {e}")
+
+def iniciar_ouvinte_notificacoes():
+    """
+    Escuta os avisos de alteração enviados pelo banco (NOTIFY dos triggers):
+    quando outro cliente altera uma entidade, o cache local dela é invalidado.
+    Enquanto o ouvinte não está escutando (antes do primeiro LISTEN ou durante
+    uma queda), os itens do cache valem no máximo CacheManager.TTL_SEM_AVISOS.
+    """
+    try:
+        from database.database import CANAL_INVALIDACAO, CANAL_SOLICITACOES, ENTIDADES_VERSIONADAS
+        from database.notificacoes import get_ouvinte
+        from utils.cache_manager import cache_manager
+        
+        def invalidar(entidade):
+            # 'solicitacao' chega também (e antes) por CANAL_SOLICITACOES: invalida só uma vez
+            if entidade in ENTIDADES_VERSIONADAS and entidade != 'solicitacao':
+                cache_manager.invalidar_tag(entidade)
+        
+        ouvinte = get_ouvinte()
+        ouvinte.assinar(CANAL_INVALIDACAO, invalidar)
+        # Assinado antes da interface: o cache já está limpo quando a tela busca as linhas
+        ouvinte.assinar(CANAL_SOLICITACOES, lambda payload: cache_manager.invalidar_tag('solicitacao'))
+        
+        def ao_conectar():
+            # O que mudou antes deste LISTEN (ou durante a queda) não foi avisado
+            cache_manager.invalidar_tag(*ENTIDADES_VERSIONADAS)
+            cache_manager.limitar_ttl(None)
+        
+        ouvinte.ao_conectar(ao_conectar)
+        ouvinte.ao_desconectar(lambda: cache_manager.limitar_ttl(cache_manager.TTL_SEM_AVISOS))
+        cache_manager.limitar_ttl(cache_manager.TTL_SEM_AVISOS)  # até o primeiro LISTEN
+        ouvinte.iniciar()
+    except Exception as e:
+        print(f"⚠️ Invalidação entre clientes desativada: {e}")
+
 def main():
     """
     Função principal do sistema
@@ -39,7 +96,8 @@ def main():
     
     # Verificar conexão com banco
     try:
-        from database.database import get_connection
+        from database.database import get_connection, fechar_pool
+        from database.notificacoes import fechar_ouvinte
         conn = get_connection()
         if conn:
             print("✅ Conexão com PostgreSQL: OK")
@@ -58,17 +116,23 @@ def main():
         messagebox.showerror("Erro", f"Erro inesperado: {e}")
         return
     
+    configurar_cache_em_disco()
+    iniciar_ouvinte_notificacoes()
+    
     # Iniciar interface gráfica
     try:
         print("🎨 Iniciando interface gráfica...")
         root = tk.Tk()
-        app = SistemaManutencaoApp(root)
+        app = SistemaManutencaoApp(root, inicio=INICIO)
         
         # Configurar fechamento seguro
         def on_closing():
             if messagebox.askokcancel("Sair", "Deseja realmente sair do sistema?"):
                 print("👋 Encerrando sistema...")
+                app.ao_fechar()
                 root.destroy()
+                fechar_ouvinte()
+                fechar_pool()
         
         root.protocol("WM_DELETE_WINDOW", on_closing)
         root.mainloop()
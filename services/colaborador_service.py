@@ -1,8 +1,10 @@
 # 📄 services/colaborador_service.py - ADICIONAR CACHE
 
-from database.database import get_connection, DatabaseConnection
+from psycopg2 import errors as pg_errors
+from database.database import get_connection, DatabaseConnection, ler_alteracoes
 from database.models import Colaborador
-from utils.cache_manager import cache_manager  # ← NOVO IMPORT
+from utils.cache_manager import cache_manager, cached, CacheManager
+from utils.prefix_index import PrefixIndex
 
 class ColaboradorService:
     """Serviço para gerenciar colaboradores e suas aptidões"""
@@ -31,8 +33,7 @@ class ColaboradorService:
                 print(f"✅ Colaborador {nome} cadastrado com sucesso!")
                 
                 # INVALIDAR CACHE - dados mudaram
-                cache_manager.delete('colaboradores_lista')
-                cache_manager.delete('colaboradores_nomes')
+                cache_manager.invalidar_tag('colaborador')
                 
                 return True
                 
@@ -45,50 +46,71 @@ class ColaboradorService:
         """
         Lista todos os colaboradores
         VERSÃO COM CACHE: Reduz queries ao banco
+        (get_or_load: com o cache vazio, chamadas simultâneas fazem uma única consulta)
         """
-        # Tentar obter do cache primeiro
-        cache_key = 'colaboradores_lista'
-        cached_data = cache_manager.get(cache_key)
-        
-        if cached_data is not None:
-            print("📦 Colaboradores carregados do cache")
-            return cached_data
-        
         try:
-            with DatabaseConnection() as conn:
-                if conn is None:
-                    return []
-                
-                cur = conn.cursor()
-                cur.execute("SELECT MATRICULA, NOME, CARGO FROM COLABORADORES ORDER BY NOME")
-                
-                colaboradores = []
-                for matricula, nome, cargo in cur.fetchall():
-                    colaboradores.append(Colaborador(matricula, nome, cargo))
-                
-                # Armazenar no cache
-                cache_manager.set(cache_key, colaboradores, cache_manager.TTL_COLABORADORES)
-                print(f"✅ {len(colaboradores)} colaboradores carregados do banco e armazenados no cache")
-                
-                return colaboradores
-                
+            return ColaboradorService._carregar_colaboradores()
         except Exception as e:
             print(f"❌ Erro ao listar colaboradores: {e}")
             return []
     
+    @staticmethod
+    @cached(tags=('colaborador',), ttl=CacheManager.TTL_COLABORADORES,
+            ttl_maximo=CacheManager.TTL_MAXIMO_COLABORADORES, persistente=True)
+    def _carregar_colaboradores():
+        """Consulta do banco para listar_colaboradores (erros sobem: nada vai ao cache)"""
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
+            cur = conn.cursor()
+            cur.execute("SELECT MATRICULA, NOME, CARGO FROM COLABORADORES ORDER BY NOME")
+            
+            colaboradores = []
+            for matricula, nome, cargo in cur.fetchall():
+                colaboradores.append(Colaborador(matricula, nome, cargo))
+            
+            print(f"✅ {len(colaboradores)} colaboradores carregados do banco")
+            return colaboradores
+    
     @staticmethod
     def listar_nomes_colaboradores():
         """
         Retorna apenas os nomes dos colaboradores
         VERSÃO COM CACHE: Otimizado para combobox
         """
-        # Tentar obter do cache primeiro
-        cache_key = 'colaboradores_nomes'
-        cached_data = cache_manager.get(cache_key)
-        
-        if cached_data is not None:
-            print("📦 Nomes de colaboradores carregados do cache")
-            return cached_data
+        try:
+            return ColaboradorService._carregar_nomes_colaboradores()
+        except Exception as e:
+            print(f"❌ Erro ao listar nomes de colaboradores: {e}")
+            return []
+    
+    @staticmethod
+    @cached(tags=('colaborador',), ttl=CacheManager.TTL_COLABORADORES,
+            ttl_maximo=CacheManager.TTL_MAXIMO_COLABORADORES, persistente=True)
+    def _carregar_nomes_colaboradores():
+        """Consulta do banco para listar_nomes_colaboradores"""
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
+            cur = conn.cursor()
+            cur.execute("SELECT NOME FROM COLABORADORES ORDER BY NOME")
+            
+            # Retorna lista simples com apenas os nomes
+            nomes = [row[0] for row in cur.fetchall()]
+            print(f"✅ {len(nomes)} nomes de colaboradores carregados do banco")
+            return nomes
+    
+    @staticmethod
+    def buscar_nomes_colaboradores(termo, limite=20):
+        """
+        Nomes de colaboradores parecidos com `termo` (para autocompletar)
+        Usa os índices de trigramas (pg_trgm): acha por trecho e tolera erros
+        de digitação; os nomes que começam pelo termo vêm primeiro.
+        Sem pg_trgm no banco, busca por prefixo de palavra em um índice em memória.
+        """
+        termo = (termo or '').strip()
         
         try:
             with DatabaseConnection() as conn:
@@ -96,21 +118,95 @@ class ColaboradorService:
                     return []
                 
                 cur = conn.cursor()
-                cur.execute("SELECT NOME FROM COLABORADORES ORDER BY NOME")
-                
-                # Retorna lista simples com apenas os nomes
-                nomes = [row[0] for row in cur.fetchall()]
                 
-                # Armazenar no cache
-                cache_manager.set(cache_key, nomes, cache_manager.TTL_COLABORADORES)
-                print(f"✅ {len(nomes)} nomes de colaboradores carregados do banco e armazenados no cache")
-                
-                return nomes
+                if not termo:
+                    cur.execute("SELECT NOME FROM COLABORADORES ORDER BY NOME LIMIT %s", (limite,))
+                    return [row[0] for row in cur.fetchall()]
+                
+                escapado = termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                try:
+                    cur.execute("""
+                        SELECT NOME FROM COLABORADORES
+                        WHERE NOME ILIKE %(contem)s OR NOME %% %(termo)s
+                        ORDER BY NOME ILIKE %(prefixo)s DESC, similarity(NOME, %(termo)s) DESC, NOME
+                        LIMIT %(limite)s
+                    """, {'termo': termo, 'contem': f'%{escapado}%', 'prefixo': f'{escapado}%', 'limite': limite})
+                    return [row[0] for row in cur.fetchall()]
+                except pg_errors.UndefinedFunction:
+                    conn.rollback()  # pg_trgm não instalado: usa o índice em memória
                 
         except Exception as e:
-            print(f"❌ Erro ao listar nomes de colaboradores: {e}")
+            print(f"❌ Erro ao buscar colaboradores: {e}")
+            return []
+        
+        try:
+            return ColaboradorService._indice_nomes().buscar(termo, limite)
+        except Exception as e:
+            print(f"❌ Erro ao buscar colaboradores: {e}")
             return []
     
+    @staticmethod
+    @cached(tags=('colaborador',), ttl=CacheManager.TTL_COLABORADORES,
+            ttl_maximo=CacheManager.TTL_MAXIMO_COLABORADORES)
+    def _indice_nomes():
+        """Índice de prefixos dos nomes (montado uma vez e guardado no cache)"""
+        return PrefixIndex(ColaboradorService._carregar_nomes_colaboradores())
+    
+    @staticmethod
+    def existe_colaborador(nome):
+        """Indica se há colaborador com exatamente este nome"""
+        try:
+            return ColaboradorService._consultar_existe_colaborador(nome)
+        except Exception as e:
+            print(f"❌ Erro ao verificar colaborador: {e}")
+            return False
+    
+    @staticmethod
+    @cached(tags=('colaborador',), ttl=CacheManager.TTL_COLABORADORES)
+    def _consultar_existe_colaborador(nome):
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
+            cur = conn.cursor()
+            cur.execute("SELECT 1 FROM COLABORADORES WHERE NOME = %s LIMIT 1", (nome,))
+            return cur.fetchone() is not None
+    
+    @staticmethod
+    def contar_colaboradores():
+        """
+        Retorna apenas a quantidade de colaboradores (para o dashboard)
+        """
+        try:
+            return ColaboradorService._consultar_total_colaboradores()
+        except Exception as e:
+            print(f"❌ Erro ao contar colaboradores: {e}")
+            return 0
+    
+    @staticmethod
+    @cached(tags=('colaborador',), ttl=CacheManager.TTL_COLABORADORES)
+    def _consultar_total_colaboradores():
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) FROM COLABORADORES")
+            return cur.fetchone()[0]
+    
+    @staticmethod
+    def alteracoes_colaboradores_desde(versao):
+        """
+        Colaboradores inseridos/alterados e matrículas excluídas depois de `versao`
+        (Alteracoes; versao=0 traz todos). None se o banco estiver inacessível.
+        """
+        return ler_alteracoes(
+            'colaborador', versao,
+            "SELECT MATRICULA, NOME, CARGO FROM COLABORADORES",
+            lambda row: Colaborador(*row),
+            tipo_chave=int
+        )
+    
     @staticmethod
     def deletar_colaborador(matricula):
         """
@@ -133,8 +229,7 @@ class ColaboradorService:
                     print(f"✅ Colaborador {matricula_int} deletado com sucesso!")
                     
                     # INVALIDAR CACHE - dados mudaram
-                    cache_manager.delete('colaboradores_lista')
-                    cache_manager.delete('colaboradores_nomes')
+                    cache_manager.invalidar_tag('colaborador')
                     
                     return True
                 else:
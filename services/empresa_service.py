@@ -4,8 +4,11 @@ SERVIÇO DE EMPRESAS - Gerencia tudo relacionado a empresas e filiais
 VERSÃO COM FUNÇÕES DE DELETE
 """
 
-from database.database import get_connection, DatabaseConnection
+from psycopg2 import errors as pg_errors
+from database.database import get_connection, DatabaseConnection, ler_alteracoes
 from database.models import Empresa, Filial, Endereco
+from utils.cache_manager import cache_manager, cached, CacheManager
+from utils.prefix_index import PrefixIndex
 
 class EmpresaService:
     """Serviço para gerenciar empresas e filiais"""
@@ -51,6 +54,7 @@ class EmpresaService:
             )
             conn.commit()
             print(f"✅ Empresa {razao_social} criada com sucesso!")
+            cache_manager.invalidar_tag('empresa')
             return True
             
         except Exception as e:
@@ -81,6 +85,9 @@ class EmpresaService:
                 
                 if cur.rowcount > 0:
                     print(f"✅ Empresa {cnpj_str} deletada com sucesso!")
+                    # O CASCADE só alcança POSSUI_FILIAIS_ENDERECO_EMPRESA (não cacheada):
+                    # FILIAIS não tem chave para EMPRESA e continua igual
+                    cache_manager.invalidar_tag('empresa')
                     return True
                 else:
                     print(f"⚠️ Empresa {cnpj_str} não encontrada")
@@ -95,11 +102,20 @@ class EmpresaService:
         """
         Lista todas as empresas do sistema
         """
-        conn = get_connection()
-        if conn is None:
-            return []
-        
         try:
+            return EmpresaService._carregar_empresas()
+        except Exception as e:
+            print(f"❌ Erro ao listar empresas: {e}")
+            return []
+    
+    @staticmethod
+    @cached(tags=('empresa',), ttl=CacheManager.TTL_EMPRESAS, persistente=True)
+    def _carregar_empresas():
+        """Consulta do banco para listar_empresas (erros sobem: nada vai ao cache)"""
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
             cur = conn.cursor()
             cur.execute("SELECT CNPJ, RAZAO_SOCIAL FROM EMPRESA ORDER BY RAZAO_SOCIAL")
             
@@ -108,13 +124,6 @@ class EmpresaService:
                 empresas.append(Empresa(cnpj, razao_social))
             
             return empresas
-            
-        except Exception as e:
-            print(f"❌ Erro ao listar empresas: {e}")
-            return []
-        finally:
-            cur.close()
-            conn.close()
     
     @staticmethod
     def criar_filial(cnpj_ind, nome):
@@ -137,6 +146,7 @@ class EmpresaService:
             )
             conn.commit()
             print(f"✅ Filial {nome} criada com sucesso!")
+            cache_manager.invalidar_tag('filial')
             return True
             
         except Exception as e:
@@ -158,20 +168,21 @@ class EmpresaService:
             # CORREÇÃO: Garantir que CNPJ seja string
             cnpj_ind_str = str(cnpj_ind).strip()
             
-            with DatabaseConnection as conn:
+            with DatabaseConnection() as conn:
                 if conn is None:
                     return False
-            
-            cur = conn.cursor()
-            cur.execute("DELETE FROM FILIAIS WHERE CNPJ_IND_ = %s", (cnpj_ind_str,))
-            conn.commit()
-            
-            if cur.rowcount > 0:
-                print(f"✅ Filial {cnpj_ind_str} deletada com sucesso!")
-                return True
-            else:
-                print(f"⚠️ Filial {cnpj_ind_str} não encontrada")
-                return False
+                
+                cur = conn.cursor()
+                cur.execute("DELETE FROM FILIAIS WHERE CNPJ_IND_ = %s", (cnpj_ind_str,))
+                conn.commit()
+                
+                if cur.rowcount > 0:
+                    print(f"✅ Filial {cnpj_ind_str} deletada com sucesso!")
+                    cache_manager.invalidar_tag('filial')
+                    return True
+                else:
+                    print(f"⚠️ Filial {cnpj_ind_str} não encontrada")
+                    return False
                 
         except Exception as e:
             print(f"❌ Erro ao deletar filial: {e}")
@@ -183,11 +194,21 @@ class EmpresaService:
         """
         Lista todas as filiais
         """
-        conn = get_connection()
-        if conn is None:
-            return []
-        
         try:
+            return EmpresaService._carregar_filiais()
+        except Exception as e:
+            print(f"❌ Erro ao listar filiais: {e}")
+            return []
+    
+    @staticmethod
+    @cached(tags=('filial',), ttl=CacheManager.TTL_FILIAIS,
+            ttl_maximo=CacheManager.TTL_MAXIMO_FILIAIS, persistente=True)
+    def _carregar_filiais():
+        """Consulta do banco para listar_filiais (erros sobem: nada vai ao cache)"""
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
             cur = conn.cursor()
             cur.execute("SELECT CNPJ_IND_, NOME FROM FILIAIS ORDER BY NOME")
             
@@ -196,13 +217,135 @@ class EmpresaService:
                 filiais.append(Filial(cnpj_ind, nome))
             
             return filiais
-            
+
+    @staticmethod
+    def buscar_filiais(termo, limite=20):
+        """
+        Filiais com nome parecido com `termo` (para autocompletar)
+        Usa os índices de trigramas (pg_trgm): acha por trecho e tolera erros
+        de digitação; os nomes que começam pelo termo vêm primeiro.
+        Sem pg_trgm no banco, busca por prefixo de palavra em um índice em memória.
+        """
+        termo = (termo or '').strip()
+        
+        try:
+            with DatabaseConnection() as conn:
+                if conn is None:
+                    return []
+                
+                cur = conn.cursor()
+                
+                if not termo:
+                    cur.execute("SELECT CNPJ_IND_, NOME FROM FILIAIS ORDER BY NOME LIMIT %s", (limite,))
+                    return [Filial(cnpj_ind, nome) for cnpj_ind, nome in cur.fetchall()]
+                
+                escapado = termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                try:
+                    cur.execute("""
+                        SELECT CNPJ_IND_, NOME FROM FILIAIS
+                        WHERE NOME ILIKE %(contem)s OR NOME %% %(termo)s
+                        ORDER BY NOME ILIKE %(prefixo)s DESC, similarity(NOME, %(termo)s) DESC, NOME
+                        LIMIT %(limite)s
+                    """, {'termo': termo, 'contem': f'%{escapado}%', 'prefixo': f'{escapado}%', 'limite': limite})
+                    return [Filial(cnpj_ind, nome) for cnpj_ind, nome in cur.fetchall()]
+                except pg_errors.UndefinedFunction:
+                    conn.rollback()  # pg_trgm não instalado: usa o índice em memória
+                
         except Exception as e:
-            print(f"❌ Erro ao listar filiais: {e}")
+            print(f"❌ Erro ao buscar filiais: {e}")
             return []
-        finally:
-            cur.close()
-            conn.close()
+        
+        try:
+            return EmpresaService._indice_filiais().buscar(termo, limite)
+        except Exception as e:
+            print(f"❌ Erro ao buscar filiais: {e}")
+            return []
+    
+    @staticmethod
+    @cached(tags=('filial',), ttl=CacheManager.TTL_FILIAIS,
+            ttl_maximo=CacheManager.TTL_MAXIMO_FILIAIS)
+    def _indice_filiais():
+        """Índice de prefixos dos nomes das filiais (montado uma vez e guardado no cache)"""
+        return PrefixIndex(EmpresaService._carregar_filiais(), chave=lambda filial: filial.nome)
+    
+    @staticmethod
+    def buscar_filial_por_nome(nome):
+        """Filial com exatamente este nome (ou None)"""
+        try:
+            return EmpresaService._consultar_filial_por_nome(nome)
+        except Exception as e:
+            print(f"❌ Erro ao buscar filial: {e}")
+            return None
+    
+    @staticmethod
+    @cached(tags=('filial',), ttl=CacheManager.TTL_FILIAIS)
+    def _consultar_filial_por_nome(nome):
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
+            cur = conn.cursor()
+            cur.execute("SELECT CNPJ_IND_, NOME FROM FILIAIS WHERE NOME = %s LIMIT 1", (nome,))
+            resultado = cur.fetchone()
+            return Filial(*resultado) if resultado else None
+    
+    @staticmethod
+    def contar_empresas():
+        """
+        Retorna apenas a quantidade de empresas (para o dashboard)
+        """
+        try:
+            return EmpresaService._consultar_total('EMPRESA')
+        except Exception as e:
+            print(f"❌ Erro ao contar empresas: {e}")
+            return 0
+    
+    @staticmethod
+    def contar_filiais():
+        """
+        Retorna apenas a quantidade de filiais (para o dashboard)
+        """
+        try:
+            return EmpresaService._consultar_total('FILIAIS')
+        except Exception as e:
+            print(f"❌ Erro ao contar filiais: {e}")
+            return 0
+    
+    @staticmethod
+    @cached(tags=('empresa', 'filial'), ttl=CacheManager.TTL_EMPRESAS)
+    def _consultar_total(tabela):
+        """COUNT(*) de EMPRESA ou FILIAIS (nome fixo no código, nunca vindo da interface)"""
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
+            cur = conn.cursor()
+            cur.execute(f"SELECT COUNT(*) FROM {tabela}")
+            return cur.fetchone()[0]
+    
+    @staticmethod
+    def alteracoes_empresas_desde(versao):
+        """
+        Empresas inseridas/alteradas e CNPJs excluídos depois de `versao`
+        (Alteracoes; versao=0 traz todas). None se o banco estiver inacessível.
+        """
+        return ler_alteracoes(
+            'empresa', versao,
+            "SELECT CNPJ, RAZAO_SOCIAL FROM EMPRESA",
+            lambda row: Empresa(*row)
+        )
+    
+    @staticmethod
+    def alteracoes_filiais_desde(versao):
+        """
+        Filiais inseridas/alteradas e CNPJs excluídos depois de `versao`
+        (Alteracoes; versao=0 traz todas). None se o banco estiver inacessível.
+        """
+        return ler_alteracoes(
+            'filial', versao,
+            "SELECT CNPJ_IND_, NOME FROM FILIAIS",
+            lambda row: Filial(*row)
+        )
 
 class EnderecoService:
     """Serviço para gerenciar endereços"""
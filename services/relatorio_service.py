@@ -8,13 +8,27 @@ from database.database import DatabaseConnection
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+def _dimensao(valor):
+    """O resumo diário guarda nulos como '' (faz parte da chave primária)"""
+    return None if valor == '' else valor
+
 class RelatorioService:
-    """Serviço para geração de relatórios analíticos"""
+    """
+    Serviço para geração de relatórios analíticos
+    Os relatórios leem SOLICITACAO_RESUMO_DIARIO (uma linha por dia, área,
+    status, responsável e filial, mantida por trigger) em vez de varrer
+    SOLICITACAO, então o custo não cresce com o histórico de OS
+    """
     
     @staticmethod
     def relatorio_estatisticas_gerais() -> Dict[str, Any]:
         """
         Gera relatório com estatísticas gerais do sistema
+        VERSÃO OTIMIZADA: uma única consulta (GROUPING SETS) sobre o resumo diário
+        - conjunto (STATUS): solicitações por status
+        - conjunto (AREA): solicitações por área
+        - conjunto (): totais, últimos 30 dias e tempo médio de conclusão
+        As contagens de empresas, filiais e colaboradores vêm como subconsultas
         """
         try:
             with DatabaseConnection() as conn:
@@ -23,52 +37,43 @@ class RelatorioService:
                 
                 cur = conn.cursor()
                 
-                # Estatísticas básicas
-                cur.execute("SELECT COUNT(*) FROM EMPRESA")
-                total_empresas = cur.fetchone()[0]
-                
-                cur.execute("SELECT COUNT(*) FROM FILIAIS")
-                total_filiais = cur.fetchone()[0]
-                
-                cur.execute("SELECT COUNT(*) FROM COLABORADORES")
-                total_colaboradores = cur.fetchone()[0]
-                
-                cur.execute("SELECT COUNT(*) FROM SOLICITACAO")
-                total_solicitacoes = cur.fetchone()[0]
-                
-                # Solicitações por status
-                cur.execute("""
-                    SELECT STATUS, COUNT(*) as quantidade 
-                    FROM SOLICITACAO 
-                    GROUP BY STATUS
-                """)
-                solicitacoes_por_status = {row[0]: row[1] for row in cur.fetchall()}
-                
-                # Solicitações por área
-                cur.execute("""
-                    SELECT AREA, COUNT(*) as quantidade 
-                    FROM SOLICITACAO 
-                    GROUP BY AREA
-                    ORDER BY quantidade DESC
-                """)
-                solicitacoes_por_area = {row[0]: row[1] for row in cur.fetchall()}
-                
-                # Solicitações dos últimos 30 dias
                 data_30_dias_atras = (datetime.now() - timedelta(days=30)).date()
                 cur.execute("""
-                    SELECT COUNT(*) 
-                    FROM SOLICITACAO 
-                    WHERE DT_ABERTURA >= %s
+                    SELECT 
+                        GROUPING(STATUS) AS agrupado_status,
+                        GROUPING(AREA) AS agrupado_area,
+                        STATUS,
+                        AREA,
+                        COALESCE(SUM(QUANTIDADE), 0)::BIGINT AS quantidade,
+                        COALESCE(SUM(QUANTIDADE) FILTER (WHERE DIA >= %s), 0)::BIGINT AS ultimos_30_dias,
+                        SUM(SOMA_DIAS_CONCLUSAO) FILTER (WHERE STATUS = 'Concluída')
+                            / NULLIF(SUM(QTD_COM_CONCLUSAO) FILTER (WHERE STATUS = 'Concluída'), 0) AS tempo_medio,
+                        (SELECT COUNT(*) FROM EMPRESA) AS total_empresas,
+                        (SELECT COUNT(*) FROM FILIAIS) AS total_filiais,
+                        (SELECT COUNT(*) FROM COLABORADORES) AS total_colaboradores
+                    FROM SOLICITACAO_RESUMO_DIARIO
+                    GROUP BY GROUPING SETS ((STATUS), (AREA), ())
                 """, (data_30_dias_atras,))
-                solicitacoes_30_dias = cur.fetchone()[0]
                 
-                # Tempo médio de conclusão
-                cur.execute("""
-                    SELECT AVG(DT_CONCLUSAO - DT_ABERTURA) 
-                    FROM SOLICITACAO 
-                    WHERE STATUS = 'Concluída' AND DT_CONCLUSAO IS NOT NULL
-                """)
-                tempo_medio_conclusao = cur.fetchone()[0]
+                solicitacoes_por_status = {}
+                por_area = []
+                totais = None
+                
+                for (agrupado_status, agrupado_area, status, area, quantidade,
+                     ultimos_30_dias, tempo_medio, *contagens) in cur.fetchall():
+                    if agrupado_status and agrupado_area:
+                        totais = (quantidade, ultimos_30_dias, tempo_medio, *contagens)
+                    elif quantidade <= 0:
+                        continue
+                    elif agrupado_area:
+                        solicitacoes_por_status[_dimensao(status)] = quantidade
+                    else:
+                        por_area.append((_dimensao(area), quantidade))
+                
+                total_solicitacoes, solicitacoes_30_dias, tempo_medio_conclusao, \
+                    total_empresas, total_filiais, total_colaboradores = totais
+                
+                por_area.sort(key=lambda item: item[1], reverse=True)
                 
                 return {
                     'total_empresas': total_empresas,
@@ -76,7 +81,7 @@ class RelatorioService:
                     'total_colaboradores': total_colaboradores,
                     'total_solicitacoes': total_solicitacoes,
                     'solicitacoes_por_status': solicitacoes_por_status,
-                    'solicitacoes_por_area': solicitacoes_por_area,
+                    'solicitacoes_por_area': dict(por_area),
                     'solicitacoes_30_dias': solicitacoes_30_dias,
                     'tempo_medio_conclusao': tempo_medio_conclusao,
                     'data_geracao': datetime.now().strftime('%d/%m/%Y %H:%M')
@@ -101,15 +106,17 @@ class RelatorioService:
                 cur.execute("""
                     SELECT 
                         RESPONSAVEL,
-                        COUNT(*) as total_solicitacoes,
-                        COUNT(CASE WHEN STATUS = 'Concluída' THEN 1 END) as concluidas,
-                        COUNT(CASE WHEN STATUS = 'Em Andamento' THEN 1 END) as em_andamento,
-                        COUNT(CASE WHEN STATUS = 'Aberta' THEN 1 END) as abertas,
-                        AVG(CASE WHEN STATUS = 'Concluída' AND DT_CONCLUSAO IS NOT NULL 
-                            THEN (DT_CONCLUSAO - DT_ABERTURA) END) as tempo_medio_conclusao
-                    FROM SOLICITACAO
-                    WHERE RESPONSAVEL IS NOT NULL
+                        SUM(QUANTIDADE)::BIGINT as total_solicitacoes,
+                        COALESCE(SUM(QUANTIDADE) FILTER (WHERE STATUS = 'Concluída'), 0)::BIGINT as concluidas,
+                        COALESCE(SUM(QUANTIDADE) FILTER (WHERE STATUS = 'Em Andamento'), 0)::BIGINT as em_andamento,
+                        COALESCE(SUM(QUANTIDADE) FILTER (WHERE STATUS = 'Aberta'), 0)::BIGINT as abertas,
+                        SUM(SOMA_DIAS_CONCLUSAO) FILTER (WHERE STATUS = 'Concluída')
+                            / NULLIF(SUM(QTD_COM_CONCLUSAO) FILTER (WHERE STATUS = 'Concluída'), 0)
+                            as tempo_medio_conclusao
+                    FROM SOLICITACAO_RESUMO_DIARIO
+                    WHERE RESPONSAVEL <> ''
                     GROUP BY RESPONSAVEL
+                    HAVING SUM(QUANTIDADE) > 0
                     ORDER BY total_solicitacoes DESC
                 """)
                 
@@ -135,6 +142,8 @@ class RelatorioService:
     def relatorio_solicitacoes_periodo(data_inicio: str, data_fim: str) -> Dict[str, Any]:
         """
         Relatório de solicitações por período
+        Uma consulta sobre o resumo diário: por área + totais do período (GROUPING SETS)
+        CORREÇÃO: percentual por área agora é relativo ao total do período
         """
         try:
             with DatabaseConnection() as conn:
@@ -145,50 +154,44 @@ class RelatorioService:
                 
                 cur.execute("""
                     SELECT 
-                        COUNT(*) as total,
-                        COUNT(CASE WHEN STATUS = 'Concluída' THEN 1 END) as concluidas,
-                        COUNT(CASE WHEN STATUS = 'Em Andamento' THEN 1 END) as em_andamento,
-                        COUNT(CASE WHEN STATUS = 'Aberta' THEN 1 END) as abertas,
-                        COUNT(CASE WHEN STATUS = 'Cancelada' THEN 1 END) as canceladas,
+                        GROUPING(AREA) as agrupado,
                         AREA,
-                        COUNT(*) as quantidade
-                    FROM SOLICITACAO
-                    WHERE DT_ABERTURA BETWEEN %s AND %s
-                    GROUP BY AREA
-                    ORDER BY quantidade DESC
+                        COALESCE(SUM(QUANTIDADE), 0)::BIGINT as quantidade,
+                        COALESCE(SUM(QUANTIDADE) FILTER (WHERE STATUS = 'Concluída'), 0)::BIGINT as concluidas,
+                        SUM(SOMA_DIAS_CONCLUSAO) FILTER (WHERE STATUS = 'Concluída')
+                            / NULLIF(SUM(QTD_COM_CONCLUSAO) FILTER (WHERE STATUS = 'Concluída'), 0)
+                            as tempo_medio
+                    FROM SOLICITACAO_RESUMO_DIARIO
+                    WHERE DIA BETWEEN %s AND %s
+                    GROUP BY GROUPING SETS ((AREA), ())
                 """, (data_inicio, data_fim))
                 
-                por_area = []
-                for row in cur.fetchall():
-                    por_area.append({
-                        'area': row[5],
-                        'quantidade': row[6],
-                        'percentual': (row[6] / row[0] * 100) if row[0] > 0 else 0
-                    })
-                
-                # Estatísticas gerais do período
-                cur.execute("""
-                    SELECT 
-                        COUNT(*) as total,
-                        COUNT(CASE WHEN STATUS = 'Concluída' THEN 1 END) as concluidas,
-                        AVG(CASE WHEN STATUS = 'Concluída' AND DT_CONCLUSAO IS NOT NULL 
-                            THEN (DT_CONCLUSAO - DT_ABERTURA) END) as tempo_medio
-                    FROM SOLICITACAO
-                    WHERE DT_ABERTURA BETWEEN %s AND %s
-                """, (data_inicio, data_fim))
+                linhas = cur.fetchall()
+                total, concluidas, tempo_medio = 0, 0, None
+                for agrupado, _, quantidade, concluidas_linha, tempo_medio_linha in linhas:
+                    if agrupado:
+                        total, concluidas, tempo_medio = quantidade, concluidas_linha, tempo_medio_linha
                 
-                stats_row = cur.fetchone()
+                por_area = []
+                for agrupado, area, quantidade, _, _ in linhas:
+                    if not agrupado and quantidade > 0:
+                        por_area.append({
+                            'area': _dimensao(area),
+                            'quantidade': quantidade,
+                            'percentual': (quantidade / total * 100) if total > 0 else 0
+                        })
+                por_area.sort(key=lambda item: item['quantidade'], reverse=True)
                 
                 return {
                     'periodo': f"{data_inicio} a {data_fim}",
-                    'total_solicitacoes': stats_row[0],
-                    'concluidas': stats_row[1],
-                    'taxa_conclusao': (stats_row[1] / stats_row[0] * 100) if stats_row[0] > 0 else 0,
-                    'tempo_medio_conclusao': stats_row[2] or 0,
+                    'total_solicitacoes': total,
+                    'concluidas': concluidas,
+                    'taxa_conclusao': (concluidas / total * 100) if total > 0 else 0,
+                    'tempo_medio_conclusao': tempo_medio or 0,
                     'solicitacoes_por_area': por_area,
                     'data_geracao': datetime.now().strftime('%d/%m/%Y %H:%M')
                 }
                 
         except Exception as e:
             print(f"❌ Erro ao gerar relatório por período: {e}")
-            return {}
\ No newline at end of file
+            return {}
@@ -4,62 +4,160 @@ SERVIÇO DE SOLICITAÇÕES - O coração do sistema de manutenção
 VERSÃO COM NÚMERO AUTOMÁTICO E FUNÇÕES DE RELATÓRIO
 """
 
-from database.database import get_connection, DatabaseConnection
+from psycopg2 import errors as pg_errors
+from database.database import get_connection, DatabaseConnection, SEQUENCIA_SOLICITACAO, ler_alteracoes
 from database.models import Solicitacao
+from utils.pagination import DatabasePaginator
+from utils.cache_manager import cache_manager, cached, CacheManager
 from datetime import datetime
 
+# Solicitação + nome da filial em uma única consulta (evita uma query por linha)
+# Quem a usa depende também das filiais: cache com tags ('solicitacao', 'filial')
+SELECT_SOLICITACAO = """
+    SELECT S.N_SOLICITACAO, S.DT_ABERTURA, S.AREA, S.STATUS,
+           S.RESPONSAVEL, S.DESCRICAO, S.DT_CONCLUSAO, S.FILIAL,
+           F.NOME AS NOME_FILIAL
+    FROM SOLICITACAO S
+    LEFT JOIN FILIAIS F ON F.CNPJ_IND_ = S.FILIAL
+"""
+
+# Ordem padrão das listagens (a última coluna desempata e torna a chave única)
+ORDEM_SOLICITACOES = [('DT_ABERTURA', 'DESC'), ('N_SOLICITACAO', 'DESC')]
+
+# Colunas que a interface pode usar para ordenar (nome do atributo -> coluna SQL)
+# Só nomes desta lista entram no ORDER BY; nunca texto vindo da interface
+COLUNAS_ORDENACAO = {
+    'n_solicitacao': 'S.N_SOLICITACAO',
+    'dt_abertura': 'S.DT_ABERTURA',
+    'dt_conclusao': 'S.DT_CONCLUSAO',
+    'area': 'S.AREA',
+    'status': 'S.STATUS',
+    'responsavel': 'S.RESPONSAVEL',
+    'nome_filial': 'F.NOME',
+    'descricao': 'S.DESCRICAO',
+}
+
+def montar_solicitacao(row):
+    """Converte uma linha de SELECT_SOLICITACAO em objeto Solicitacao"""
+    return Solicitacao(*row)
+
+def montar_filtros_solicitacao(filtros):
+    """
+    Converte o dicionário de filtros da interface em (cláusula WHERE, parâmetros)
+    Chaves aceitas: status, area, responsavel, filial (nome), data_inicio,
+    data_fim (datas de abertura, inclusivas) e busca (número da OS ou trecho
+    da descrição). Valores vazios são ignorados.
+    """
+    condicoes = []
+    params = []
+    filtros = filtros or {}
+
+    for chave, coluna in (('status', 'S.STATUS'), ('area', 'S.AREA'),
+                          ('responsavel', 'S.RESPONSAVEL'), ('filial', 'F.NOME')):
+        if filtros.get(chave):
+            condicoes.append(f"{coluna} = %s")
+            params.append(filtros[chave])
+
+    if filtros.get('data_inicio'):
+        condicoes.append("S.DT_ABERTURA >= %s")
+        params.append(filtros['data_inicio'])
+    if filtros.get('data_fim'):
+        condicoes.append("S.DT_ABERTURA <= %s")
+        params.append(filtros['data_fim'])
+
+    busca = (filtros.get('busca') or '').strip()
+    if busca:
+        if busca.isdigit():
+            condicoes.append("S.N_SOLICITACAO = %s")
+            params.append(int(busca))
+        else:
+            condicoes.append("S.DESCRICAO ILIKE %s")
+            params.append('%' + busca.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+
+    where = (" WHERE " + " AND ".join(condicoes)) if condicoes else ""
+    return where, tuple(params)
+
 class SolicitacaoService:
     """Serviço para gerenciar solicitações de manutenção"""
     
     @staticmethod
     def obter_proximo_numero_os():
         """
-        NOVO: Obtém o próximo número de OS automaticamente
+        Consulta (sem consumir) o próximo número de OS da sequência
+        Uso apenas informativo (label da interface): outro operador pode
+        criar uma OS antes, o número definitivo vem de criar_solicitacao_automatica
+        Sem a sequência (migração não executada) usa MAX(N_SOLICITACAO) + 1.
+        Erros sobem: a interface mostra a falha em vez de um número inventado.
         """
-        conn = get_connection()
-        if conn is None:
-            return 1  # Retorna 1 se não conseguir conectar
-        
-        try:
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
             cur = conn.cursor()
-            cur.execute("SELECT MAX(N_SOLICITACAO) FROM SOLICITACAO")
-            resultado = cur.fetchone()
+            try:
+                cur.execute(f"SELECT last_value, is_called FROM {SEQUENCIA_SOLICITACAO}")
+            except pg_errors.UndefinedTable:
+                conn.rollback()
+                print("⚠️ Sequência das OS não encontrada: execute database/database.py")
+                cur.execute("SELECT COALESCE(MAX(N_SOLICITACAO), 0) + 1 FROM SOLICITACAO")
+                return cur.fetchone()[0]
             
-            if resultado[0] is None:
-                return 1  # Primeira OS
-            else:
-                return resultado[0] + 1  # Próximo número
-                
-        except Exception as e:
-            print(f"❌ Erro ao obter próximo número: {e}")
-            return 1
-        finally:
-            cur.close()
-            conn.close()
+            last_value, is_called = cur.fetchone()
+            return last_value + 1 if is_called else last_value
     
     @staticmethod
     def criar_solicitacao_automatica(area, responsavel, descricao, filial=None, status="Aberta"):
         """
-        NOVO: Cria solicitação com número automático
+        Cria solicitação com número automático
+        O número vem da sequência no próprio INSERT (... RETURNING), em um único
+        round trip e sem risco de números duplicados entre operadores
         """
-        n_solicitacao = SolicitacaoService.obter_proximo_numero_os()
-        return SolicitacaoService.criar_solicitacao(n_solicitacao, area, responsavel, descricao, filial, status)
+        try:
+            data_abertura = datetime.now().date()
+            
+            with DatabaseConnection() as conn:
+                if conn is None:
+                    return False
+                
+                cur = conn.cursor()
+                cur.execute(
+                    """INSERT INTO SOLICITACAO 
+                    (DT_ABERTURA, AREA, STATUS, RESPONSAVEL, DESCRICAO, FILIAL) 
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    RETURNING N_SOLICITACAO""",
+                    (data_abertura, area, status, responsavel, descricao, filial)
+                )
+                n_solicitacao = cur.fetchone()[0]
+                conn.commit()
+                cache_manager.invalidar_tag('solicitacao')
+                
+                print(f"✅ Solicitação #{n_solicitacao} criada com sucesso!")
+                return n_solicitacao  # Retorna o número da OS criada
+                
+        except Exception as e:
+            print(f"❌ Erro ao criar solicitação: {e}")
+            return False
     
     @staticmethod
     def criar_solicitacao(n_solicitacao, area, responsavel, descricao, filial=None, status="Aberta"):
         """
-        Cria uma nova solicitação de manutenção
+        Cria uma nova solicitação de manutenção com número informado
+        (para OS novas use criar_solicitacao_automatica, que usa a sequência)
+        Se o número passar da sequência, ela é avançada: a numeração
+        automática nunca devolve um número já usado
         """
         conn = get_connection()
         if conn is None:
             return False
         
+        cur = conn.cursor()
         try:
             # Garantir que número seja inteiro
             n_solicitacao_int = int(n_solicitacao)
             data_abertura = datetime.now().date()
             
-            cur = conn.cursor()
+            # Nenhum INSERT automático (nextval) entre este INSERT e o setval abaixo
+            cur.execute("LOCK TABLE SOLICITACAO IN EXCLUSIVE MODE")
             cur.execute(
                 """INSERT INTO SOLICITACAO 
                 (N_SOLICITACAO, DT_ABERTURA, AREA, STATUS, RESPONSAVEL, DESCRICAO, FILIAL) 
@@ -67,7 +165,16 @@ class SolicitacaoService:
                 (n_solicitacao_int, data_abertura, area, status, responsavel, descricao, filial)
             )
             
+            cur.execute("SELECT to_regclass(%s)", (SEQUENCIA_SOLICITACAO,))
+            if cur.fetchone()[0] is not None:
+                cur.execute(f"""
+                    SELECT setval('{SEQUENCIA_SOLICITACAO}', %s)
+                    FROM {SEQUENCIA_SOLICITACAO}
+                    WHERE %s > CASE WHEN is_called THEN last_value ELSE last_value - 1 END
+                """, (n_solicitacao_int, n_solicitacao_int))
+            
             conn.commit()
+            cache_manager.invalidar_tag('solicitacao')
             print(f"✅ Solicitação #{n_solicitacao_int} criada com sucesso!")
             return n_solicitacao_int  # Retorna o número da OS criada
             
@@ -98,6 +205,7 @@ class SolicitacaoService:
                 conn.commit()
                 
                 if cur.rowcount > 0:
+                    cache_manager.invalidar_tag('solicitacao')
                     print(f"✅ Solicitação #{n_solicitacao_int} deletada com sucesso!")
                     return True
                 else:
@@ -112,51 +220,292 @@ class SolicitacaoService:
     def listar_solicitacoes():
         """
         Lista todas as solicitações
-        VERSÃO SIMPLIFICADA: Busca direto da tabela SOLICITACAO
+        VERSÃO OTIMIZADA: Nome da filial vem no mesmo SELECT (LEFT JOIN)
         """
-        conn = get_connection()
-        if conn is None:
+        try:
+            with DatabaseConnection() as conn:
+                if conn is None:
+                    return []
+                
+                cur = conn.cursor()
+                cur.execute(SELECT_SOLICITACAO + """
+                    ORDER BY S.DT_ABERTURA DESC
+                """)
+                
+                return [montar_solicitacao(row) for row in cur.fetchall()]
+                
+        except Exception as e:
+            print(f"❌ Erro ao listar solicitações: {e}")
             return []
-        
+    
+    @staticmethod
+    def listar_ultimas_solicitacoes(limite=8):
+        """
+        Lista apenas as N solicitações mais recentes (para o dashboard)
+        Usa o índice (DT_ABERTURA, N_SOLICITACAO): lê só as linhas exibidas
+        """
         try:
+            return SolicitacaoService._carregar_ultimas(int(limite))
+        except Exception as e:
+            print(f"❌ Erro ao listar últimas solicitações: {e}")
+            return []
+    
+    @staticmethod
+    @cached(tags=('solicitacao', 'filial'), ttl=CacheManager.TTL_SOLICITACOES)
+    def _carregar_ultimas(limite):
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+            
             cur = conn.cursor()
-            cur.execute("""
-                SELECT N_SOLICITACAO, DT_ABERTURA, AREA, STATUS, 
-                       RESPONSAVEL, DESCRICAO, DT_CONCLUSAO, FILIAL
-                FROM SOLICITACAO 
-                ORDER BY DT_ABERTURA DESC
-            """)
+            cur.execute(SELECT_SOLICITACAO + """
+                ORDER BY S.DT_ABERTURA DESC, S.N_SOLICITACAO DESC
+                LIMIT %s
+            """, (limite,))
             
-            solicitacoes = []
-            for (n_solicitacao, dt_abertura, area, status, responsavel, 
-                 descricao, dt_conclusao, filial) in cur.fetchall():
+            return [montar_solicitacao(row) for row in cur.fetchall()]
+    
+    @staticmethod
+    def listar_solicitacoes_pagina(cursor=None, por_pagina=50, count_mode='estimated'):
+        """
+        Lista uma página de solicitações (mais recentes primeiro)
+        Paginação por chave: o custo por página não cresce com a profundidade
+        Retorna (lista de Solicitacao, pagination_info com next_cursor/previous_cursor)
+        """
+        try:
+            rows, info = DatabasePaginator.paginate_keyset(
+                SELECT_SOLICITACAO, ORDEM_SOLICITACOES, por_pagina, cursor,
+                count_mode=count_mode
+            )
+            return [montar_solicitacao(row) for row in rows], info
+            
+        except ValueError as e:
+            print(f"❌ Erro ao paginar solicitações: {e}")
+            return [], {}
+
+    @staticmethod
+    def listar_solicitacoes_intervalo(offset, limite, cursor=None, filtros=None, ordenacao=None):
+        """
+        Lista `limite` solicitações a partir da posição `offset`
+        Usado pela listagem virtualizada: com o cursor da página anterior a busca
+        é por chave; sem ele (salto pela barra de rolagem) usa OFFSET
+        filtros: ver montar_filtros_solicitacao
+        ordenacao: (atributo de COLUNAS_ORDENACAO, 'ASC'|'DESC');
+                   None = mais recentes primeiro
+        Retorna (lista de Solicitacao, cursor da página seguinte ou None)
+        """
+        try:
+            return SolicitacaoService._carregar_intervalo(offset, limite, cursor, filtros, ordenacao)
+        except Exception as e:
+            print(f"❌ Erro ao listar intervalo de solicitações: {e}")
+            return [], None
+
+    @staticmethod
+    @cached(tags=('solicitacao', 'filial'), ttl=CacheManager.TTL_SOLICITACOES)
+    def _carregar_intervalo(offset, limite, cursor, filtros, ordenacao):
+        """Consulta de listar_solicitacoes_intervalo (erros sobem: nada vai ao cache)"""
+        where, params = montar_filtros_solicitacao(filtros)
+
+        # Paginação por chave só na ordem padrão (colunas indexadas). DT_ABERTURA
+        # aceita NULL (primeiro no DESC): cursor a partir dessas linhas não é
+        # gerado, e um cursor com NULL (ValueError) também cai no OFFSET
+        padrao = ordenacao is None
+        if cursor and padrao:
+            try:
+                rows, info = DatabasePaginator.paginate_keyset(
+                    SELECT_SOLICITACAO + where, ORDEM_SOLICITACOES, limite, cursor,
+                    params=params, count_mode='none'
+                )
+                return [montar_solicitacao(row) for row in rows], info.get('next_cursor')
+            except ValueError as e:
+                print(f"⚠️ Cursor inválido, usando OFFSET: {e}")
+
+        if padrao:
+            ordem = [(f"S.{coluna}", direcao) for coluna, direcao in ORDEM_SOLICITACOES]
+        else:
+            atributo, direcao = ordenacao
+            coluna = COLUNAS_ORDENACAO.get(atributo)
+            direcao = str(direcao).upper()
+            if coluna is None or direcao not in ('ASC', 'DESC'):
+                print(f"❌ Ordenação não permitida: {ordenacao}")
+                return [], None
+            # N_SOLICITACAO desempata e mantém a ordem estável entre as páginas
+            ordem = [(coluna, direcao)]
+            if coluna != 'S.N_SOLICITACAO':
+                ordem.append(('S.N_SOLICITACAO', direcao))
+
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+
+            cur = conn.cursor()
+            order_sql = ', '.join(f"{coluna} {direcao}" for coluna, direcao in ordem)
+            cur.execute(
+                SELECT_SOLICITACAO + where + f" ORDER BY {order_sql} LIMIT %s OFFSET %s",
+                params + (int(limite), max(0, int(offset)))
+            )
+            solicitacoes = [montar_solicitacao(row) for row in cur.fetchall()]
+
+            proximo_cursor = None
+            ultima = solicitacoes[-1] if solicitacoes else None
+            if padrao and len(solicitacoes) == limite and ultima.dt_abertura is not None:
+                proximo_cursor = DatabasePaginator.encode_cursor(
+                    'next', (ultima.dt_abertura, ultima.n_solicitacao)
+                )
+            return solicitacoes, proximo_cursor
+
+    @staticmethod
+    def listar_por_numeros(numeros, filtros=None):
+        """
+        Solicitações com os números informados que atendem aos filtros
+        Sempre lida do banco (sem cache): usada para aplicar na tela as
+        alterações avisadas por outros clientes
+        """
+        numeros = [int(numero) for numero in numeros]
+        if not numeros:
+            return []
+        
+        where, params = montar_filtros_solicitacao(filtros)
+        where += (" AND " if where else " WHERE ") + "S.N_SOLICITACAO = ANY(%s)"
+        
+        try:
+            with DatabaseConnection() as conn:
+                if conn is None:
+                    return []
                 
-                # Buscar nome da filial se existir CNPJ
-                nome_filial = None
-                if filial:
-                    try:
-                        cur_filial = conn.cursor()
-                        cur_filial.execute("SELECT NOME FROM FILIAIS WHERE CNPJ_IND_ = %s", (filial,))
-                        resultado_filial = cur_filial.fetchone()
-                        if resultado_filial:
-                            nome_filial = resultado_filial[0]
-                        cur_filial.close()
-                    except:
-                        nome_filial = filial  # Usa o CNPJ se não encontrar nome
+                cur = conn.cursor()
+                cur.execute(SELECT_SOLICITACAO + where, params + (numeros,))
+                return [montar_solicitacao(row) for row in cur.fetchall()]
                 
-                solicitacoes.append(Solicitacao(
-                    n_solicitacao, dt_abertura, area, status, responsavel, 
-                    descricao, dt_conclusao, filial, nome_filial
-                ))
-            
-            return solicitacoes
-            
         except Exception as e:
-            print(f"❌ Erro ao listar solicitações: {e}")
+            print(f"❌ Erro ao buscar solicitações alteradas: {e}")
+            return []
+
+    @staticmethod
+    def alteracoes_solicitacoes_desde(versao):
+        """
+        Solicitações inseridas/alteradas e números excluídos depois de `versao`
+        (Alteracoes; versao=0 traz todas). None se o banco estiver inacessível.
+        O nome da filial vem do JOIN: renomear uma filial não muda a versão
+        das solicitações dela (acompanhar também alteracoes_filiais_desde).
+        """
+        return ler_alteracoes(
+            'solicitacao', versao, SELECT_SOLICITACAO, montar_solicitacao,
+            coluna_versao='S.VERSAO_ALTERACAO', tipo_chave=int
+        )
+
+    @staticmethod
+    def contar_solicitacoes(filtros=None):
+        """
+        Total de solicitações que atendem aos filtros
+        Sem filtros (ou só por status) o valor vem dos contadores mantidos por trigger
+        """
+        filtros = {chave: valor for chave, valor in (filtros or {}).items() if valor}
+        if not filtros:
+            return SolicitacaoService.obter_estatisticas_solicitacoes().get('total', 0)
+
+        try:
+            if list(filtros) == ['status']:
+                # Contador exato do status (as estatísticas juntam maiúsculas/minúsculas,
+                # a lista filtra com S.STATUS = %s)
+                return SolicitacaoService._contar_por_status(filtros['status'])
+            return SolicitacaoService._contar_filtradas(filtros)
+        except Exception as e:
+            print(f"❌ Erro ao contar solicitações: {e}")
+            return 0
+
+    @staticmethod
+    @cached(tags=('solicitacao',), ttl=CacheManager.TTL_SOLICITACOES)
+    def _contar_por_status(status):
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+
+            cur = conn.cursor()
+            try:
+                cur.execute(
+                    "SELECT QUANTIDADE FROM SOLICITACAO_CONTADORES WHERE STATUS = %s", (status,)
+                )
+            except pg_errors.UndefinedTable:
+                # Banco ainda sem contadores: conta direto da tabela
+                conn.rollback()
+                cur.execute("SELECT COUNT(*) FROM SOLICITACAO WHERE STATUS = %s", (status,))
+            linha = cur.fetchone()
+            return linha[0] if linha else 0
+
+    @staticmethod
+    @cached(tags=('solicitacao', 'filial'), ttl=CacheManager.TTL_SOLICITACOES)
+    def _contar_filtradas(filtros):
+        where, params = montar_filtros_solicitacao(filtros)
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
+
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT COUNT(*) FROM SOLICITACAO S "
+                "LEFT JOIN FILIAIS F ON F.CNPJ_IND_ = S.FILIAL" + where,
+                params
+            )
+            return cur.fetchone()[0]
+
+    @staticmethod
+    def buscar_texto(termo, limite=50):
+        """
+        Busca textual (português) nas descrições, mais relevantes primeiro
+        Aceita a sintaxe de buscadores: "quadro elétrico", -vazamento, bomba or motor
+        Retorna [(Solicitacao, relevancia, trecho), ...]; no trecho os termos
+        encontrados vêm entre « »
+        """
+        termo = (termo or '').strip()
+        if not termo:
+            return []
+        
+        # ts_headline é caro: só é calculado para as `limite` linhas já ranqueadas
+        consulta_sql = """
+            SELECT R.*, ts_headline('portuguese', COALESCE(R.DESCRICAO, ''), R.CONSULTA,
+                                    'StartSel=«, StopSel=», MaxWords=20, MinWords=8, MaxFragments=2')
+            FROM (
+                SELECT S.N_SOLICITACAO, S.DT_ABERTURA, S.AREA, S.STATUS,
+                       S.RESPONSAVEL, S.DESCRICAO, S.DT_CONCLUSAO, S.FILIAL,
+                       F.NOME AS NOME_FILIAL,
+                       ts_rank({vetor}, Q.CONSULTA) AS RELEVANCIA,
+                       Q.CONSULTA
+                FROM SOLICITACAO S
+                LEFT JOIN FILIAIS F ON F.CNPJ_IND_ = S.FILIAL
+                CROSS JOIN websearch_to_tsquery('portuguese', %s) AS Q(CONSULTA)
+                WHERE {vetor} @@ Q.CONSULTA
+                ORDER BY RELEVANCIA DESC, S.N_SOLICITACAO DESC
+                LIMIT %s
+            ) R
+            ORDER BY R.RELEVANCIA DESC, R.N_SOLICITACAO DESC
+        """
+        
+        try:
+            with DatabaseConnection() as conn:
+                if conn is None:
+                    return []
+                
+                cur = conn.cursor()
+                
+                try:
+                    cur.execute(consulta_sql.format(vetor="S.DESCRICAO_TSV"), (termo, int(limite)))
+                except pg_errors.UndefinedColumn:
+                    # Banco ainda sem a coluna indexada: calcula o vetor na hora (lento)
+                    conn.rollback()
+                    cur.execute(
+                        consulta_sql.format(vetor="to_tsvector('portuguese', COALESCE(S.DESCRICAO, ''))"),
+                        (termo, int(limite))
+                    )
+                
+                return [
+                    (montar_solicitacao(row[:9]), float(row[9]), row[11])
+                    for row in cur.fetchall()
+                ]
+                
+        except Exception as e:
+            print(f"❌ Erro na busca textual: {e}")
             return []
-        finally:
-            cur.close()
-            conn.close()
     
     @staticmethod
     def atualizar_status_solicitacao(n_solicitacao, novo_status):
@@ -190,6 +539,7 @@ class SolicitacaoService:
                 )
             
             conn.commit()
+            cache_manager.invalidar_tag('solicitacao')
             print(f"✅ Status da solicitação #{n_solicitacao_int} atualizado para: {novo_status}")
             return True
             
@@ -206,81 +556,70 @@ class SolicitacaoService:
         """
         Busca uma solicitação específica pelo número
         """
-        conn = get_connection()
-        if conn is None:
-            return None
-        
         try:
             # Garantir que número seja inteiro
-            n_solicitacao_int = int(n_solicitacao)
+            return SolicitacaoService._carregar_por_numero(int(n_solicitacao))
+        except Exception as e:
+            print(f"❌ Erro ao buscar solicitação: {e}")
+            return None
+
+    @staticmethod
+    @cached(tags=('solicitacao', 'filial'), ttl=CacheManager.TTL_SOLICITACOES)
+    def _carregar_por_numero(n_solicitacao):
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
             
             cur = conn.cursor()
-            cur.execute(
-                """SELECT N_SOLICITACAO, DT_ABERTURA, AREA, STATUS, 
-                          RESPONSAVEL, DESCRICAO, DT_CONCLUSAO, FILIAL
-                   FROM SOLICITACAO 
-                   WHERE N_SOLICITACAO = %s""",
-                (n_solicitacao_int,)
-            )
+            cur.execute(SELECT_SOLICITACAO + """
+                WHERE S.N_SOLICITACAO = %s
+            """, (n_solicitacao,))
             
             resultado = cur.fetchone()
-            if resultado:
-                # Buscar nome da filial
-                nome_filial = None
-                if resultado[7]:  # FILIAL
-                    try:
-                        cur_filial = conn.cursor()
-                        cur_filial.execute("SELECT NOME FROM FILIAIS WHERE CNPJ_IND_ = %s", (resultado[7],))
-                        resultado_filial = cur_filial.fetchone()
-                        if resultado_filial:
-                            nome_filial = resultado_filial[0]
-                        cur_filial.close()
-                    except:
-                        nome_filial = resultado[7]
-                
-                return Solicitacao(*resultado[:7], resultado[7], nome_filial)
-            return None
-            
-        except Exception as e:
-            print(f"❌ Erro ao buscar solicitação: {e}")
-            return None
-        finally:
-            cur.close()
-            conn.close()
+            return montar_solicitacao(resultado) if resultado else None
 
     @staticmethod
     def obter_estatisticas_solicitacoes():
         """
         Retorna estatísticas detalhadas das solicitações
         Para usar no dashboard
+        VERSÃO OTIMIZADA: Lê a tabela SOLICITACAO_CONTADORES (mantida por trigger)
+        em vez de varrer SOLICITACAO a cada atualização
         """
-        conn = get_connection()
-        if conn is None:
-            return {}
-        
         try:
-            cur = conn.cursor()
+            # Cópia: quem chama pode alterar o dicionário sem afetar o cache
+            return dict(SolicitacaoService._carregar_estatisticas())
+        except Exception as e:
+            print(f"❌ Erro ao obter estatísticas: {e}")
+            return {}
+
+    @staticmethod
+    @cached(tags=('solicitacao',), ttl=CacheManager.TTL_SOLICITACOES)
+    def _carregar_estatisticas():
+        with DatabaseConnection() as conn:
+            if conn is None:
+                raise ConnectionError("Sem conexão com o banco de dados")
             
-            # Contagem por status
-            cur.execute("""
-                SELECT STATUS, COUNT(*) as quantidade 
-                FROM SOLICITACAO 
-                GROUP BY STATUS
-            """)
+            cur = conn.cursor()
             
-            estatisticas = {}
-            for status, quantidade in cur.fetchall():
-                estatisticas[status.lower()] = quantidade
+            try:
+                cur.execute("SELECT STATUS, QUANTIDADE FROM SOLICITACAO_CONTADORES")
+                linhas = cur.fetchall()
+            except pg_errors.UndefinedTable:
+                # Banco ainda sem contadores: calcula direto da tabela
+                conn.rollback()
+                cur.execute("""
+                    SELECT COALESCE(STATUS, ''), COUNT(*) as quantidade 
+                    FROM SOLICITACAO 
+                    GROUP BY STATUS
+                """)
+                linhas = cur.fetchall()
             
-            # Total geral
-            cur.execute("SELECT COUNT(*) FROM SOLICITACAO")
-            estatisticas['total'] = cur.fetchone()[0]
+            estatisticas = {'total': 0}
+            for status, quantidade in linhas:
+                estatisticas['total'] += quantidade
+                if status and quantidade > 0:
+                    chave = status.lower()
+                    estatisticas[chave] = estatisticas.get(chave, 0) + quantidade
             
             return estatisticas
-            
-        except Exception as e:
-            print(f"❌ Erro ao obter estatísticas: {e}")
-            return {}
-        finally:
-            cur.close()
-            conn.close()
\ No newline at end of file
@@ -0,0 +1,107 @@
+# 📄 tests/test_cache_manager.py
+"""
+TESTES DO CACHE MANAGER
+Invalidação de cargas em andamento (single-flight + tags)
+"""
+
+import threading
+
+import pytest
+
+from utils.cache_manager import CacheManager
+
+
+@pytest.fixture
+def cache():
+    cache = CacheManager()
+    yield cache
+    cache.parar_limpeza()
+
+
+def _carga_bloqueada(cache, key, tags=()):
+    """Inicia get_or_load em outro thread; o loader fica parado até `liberar`"""
+    iniciou, liberar = threading.Event(), threading.Event()
+    resultado = {}
+
+    def loader():
+        iniciou.set()
+        liberar.wait(5)
+        return 'antes da escrita'
+
+    def carregar():
+        resultado['valor'] = cache.get_or_load(key, loader, tags=tags)
+
+    thread = threading.Thread(target=carregar)
+    thread.start()
+    assert iniciou.wait(5)
+    return thread, liberar, resultado
+
+
+@pytest.mark.parametrize('invalidar', [
+    lambda cache: cache.invalidar_tag('solicitacao'),
+    lambda cache: cache.delete('lista'),
+    lambda cache: cache.clear(),
+], ids=['invalidar_tag', 'delete', 'clear'])
+def test_chamada_apos_invalidar_refaz_a_consulta(cache, invalidar):
+    thread, liberar, resultado = _carga_bloqueada(cache, 'lista', tags=('solicitacao',))
+
+    invalidar(cache)  # escrita enquanto a primeira consulta ainda roda
+
+    cargas = []
+    def loader_novo():
+        cargas.append(1)
+        return 'depois da escrita'
+
+    assert cache.get_or_load('lista', loader_novo, tags=('solicitacao',)) == 'depois da escrita'
+    assert cargas == [1]
+
+    liberar.set()
+    thread.join(5)
+    assert resultado['valor'] == 'antes da escrita'
+    # A carga antiga terminou depois, mas não sobrescreve o valor novo
+    assert cache.get('lista') == 'depois da escrita'
+
+
+class _EventoObservado(threading.Event):
+    """threading.Event que avisa quando alguém começa a esperar por ele"""
+
+    def __init__(self):
+        super().__init__()
+        self.esperando = threading.Event()
+
+    def wait(self, timeout=None):
+        self.esperando.set()
+        return super().wait(timeout)
+
+
+def test_chamadas_simultaneas_compartilham_a_carga(cache):
+    cargas = []
+    iniciou, liberar = threading.Event(), threading.Event()
+
+    def loader():
+        cargas.append(1)
+        iniciou.set()
+        liberar.wait(5)
+        return 'valor'
+
+    resultados = []
+    def carregar():
+        resultados.append(cache.get_or_load('lista', loader))
+
+    primeiro = threading.Thread(target=carregar)
+    primeiro.start()
+    assert iniciou.wait(5)
+
+    # Observa a carga em andamento: o segundo só é liberado depois de entrar na espera
+    carga = cache._carregando['lista']
+    carga.evento = _EventoObservado()
+
+    segundo = threading.Thread(target=carregar)
+    segundo.start()
+    assert carga.evento.esperando.wait(5)
+
+    liberar.set()
+    primeiro.join(5)
+    segundo.join(5)
+    assert resultados == ['valor', 'valor']
+    assert cargas == [1]
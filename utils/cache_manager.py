@@ -2,100 +2,654 @@
 """
 SISTEMA DE CACHE PARA MELHORAR PERFORMANCE
 Cache de dados frequentes para reduzir queries ao banco
+Limitado por quantidade de itens e por tamanho aproximado em bytes (LRU)
 """
 
+import functools
+import heapq
+import inspect
+import os
+import sys
 import time
+from collections import OrderedDict
 from typing import Any, Dict
 import threading
 
+
+def tamanho_aproximado(obj, amostra=100, _profundidade=0):
+    """
+    Estimativa barata do tamanho em bytes de um objeto (com o conteúdo)
+    Listas grandes são medidas por amostragem e extrapoladas
+    """
+    tamanho = sys.getsizeof(obj)
+    if _profundidade > 3:
+        return tamanho
+
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return tamanho
+
+    if isinstance(obj, dict):
+        itens = list(obj.items())
+        passo = max(1, len(itens) // amostra)
+        medidos = itens[::passo]
+        soma = sum(tamanho_aproximado(k, amostra, _profundidade + 1) +
+                   tamanho_aproximado(v, amostra, _profundidade + 1) for k, v in medidos)
+        return tamanho + (soma * len(itens) // len(medidos) if medidos else 0)
+
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        itens = list(obj) if not isinstance(obj, (list, tuple)) else obj
+        passo = max(1, len(itens) // amostra)
+        medidos = itens[::passo]
+        soma = sum(tamanho_aproximado(item, amostra, _profundidade + 1) for item in medidos)
+        return tamanho + (soma * len(itens) // len(medidos) if medidos else 0)
+
+    atributos = getattr(obj, '__dict__', None)
+    if atributos is not None:
+        return tamanho + tamanho_aproximado(atributos, amostra, _profundidade + 1)
+
+    return tamanho
+
+
+_AUSENTE = object()  # marca "não está no cache" (None é um valor válido)
+
+
+def namespace_da_chave(key):
+    """
+    Grupo da chave para as estatísticas: o nome da função nas chaves do @cached
+    ('services.x.ColaboradorService._carregar_colaboradores()' ->
+    'ColaboradorService._carregar_colaboradores'); o prefixo antes de ':' nas demais
+    """
+    nome = key.split('(', 1)[0].split(':', 1)[0]
+    return '.'.join(nome.split('.')[-2:])
+
+
+class _Estatisticas:
+    """Contadores de um namespace (alterados sempre com o lock do cache)"""
+
+    __slots__ = ('hits', 'stale_hits', 'disk_hits', 'misses', 'loads', 'load_errors',
+                 'load_time', 'load_time_max', 'evictions', 'expirations',
+                 'invalidations', 'items', 'bytes')
+
+    def __init__(self):
+        for campo in self.__slots__:
+            setattr(self, campo, 0)
+
+    def como_dict(self):
+        dados = {campo: getattr(self, campo) for campo in self.__slots__}
+        consultas = self.hits + self.stale_hits + self.disk_hits + self.misses
+        dados['hit_rate'] = (consultas - self.misses) / consultas if consultas else 0.0
+        dados['load_time_avg'] = self.load_time / self.loads if self.loads else 0.0
+        return dados
+
+
+class _Carga:
+    """Carregamento em andamento de uma chave (compartilhado pelos que esperam)"""
+
+    def __init__(self, tags=()):
+        self.tags = frozenset(tags)
+        self.evento = threading.Event()
+        self.valor = None
+        self.erro = None
+        self.invalidada = False
+
+
 class CacheManager:
     """
     Gerenciador de cache em memória para dados frequentes
+
+    - TTL por item; um thread de limpeza remove os expirados periodicamente
+    - limite de itens (MAX_ITENS) e de bytes (MAX_BYTES): ao estourar,
+      os itens usados há mais tempo são descartados (LRU)
+    - get_stats() não percorre os itens: os totais são mantidos a cada alteração
+    - get_or_load(): em um cache miss só um thread executa a consulta;
+      os demais esperam e recebem o mesmo resultado (ou a mesma exceção)
+    - stale-while-revalidate: com ttl_maximo > ttl, um item vencido (mais
+      velho que ttl, mas não que ttl_maximo) é devolvido na hora por
+      get_or_load enquanto um thread o recarrega em segundo plano
+    - tags: cada item pode ser marcado com entidades ('colaborador',
+      'filial', ...); invalidar_tag() remove de uma vez tudo que depende delas
+    - disco (opcional, ver configurar_disco): itens persistentes também vão
+      para um DiskCache; depois de reiniciar, o valor do disco é devolvido
+      na hora e revalidado em segundo plano pelo marcador de versão do banco
+      (só é consultado de novo se os dados mudaram)
+    - estatísticas por namespace (acertos, falhas, tempo de carga, bytes...)
+      em get_stats(); o thread de limpeza imprime relatorio_stats() a cada
+      INTERVALO_RELATORIO segundos (0 desliga)
     """
-    
+
     _instance = None
-    _cache: Dict[str, Dict[str, Any]] = {}
-    _lock = threading.RLock()
-    
+    _instance_lock = threading.Lock()
+
     # Tempos de expiração em segundos
-    TTL_COLABORADORES = 300  # 5 minutos
-    TTL_EMPRESAS = 600       # 10 minutos  
-    TTL_FILIAIS = 600        # 10 minutos
-    TTL_SOLICITACOES = 120   # 2 minutos
+    # Longos porque as alterações (deste e dos outros clientes) invalidam o
+    # cache na hora via NOTIFY; o TTL só limita o estrago de um aviso perdido.
+    # Sem o ouvinte conectado, nada é avisado: valem no máximo TTL_SEM_AVISOS
+    # (ver limitar_ttl)
+    TTL_COLABORADORES = 4 * 3600  # 4 horas
+    TTL_EMPRESAS = 4 * 3600       # 4 horas
+    TTL_FILIAIS = 4 * 3600        # 4 horas
+    TTL_SOLICITACOES = 3600       # 1 hora
     
+    # Até quando um item vencido ainda pode ser servido enquanto é recarregado
+    TTL_MAXIMO_COLABORADORES = 12 * 3600  # 12 horas
+    TTL_MAXIMO_FILIAIS = 12 * 3600        # 12 horas
+
+    # Teto de ttl/ttl_maximo enquanto as alterações não são avisadas
+    TTL_SEM_AVISOS = 120  # 2 minutos
+
+    # Limites (podem ser ajustados pelo .env)
+    MAX_ITENS = int(os.getenv("CACHE_MAX_ITENS", "1000"))
+    MAX_BYTES = int(os.getenv("CACHE_MAX_MB", "64")) * 1024 * 1024
+    INTERVALO_LIMPEZA = float(os.getenv("CACHE_INTERVALO_LIMPEZA", "30"))
+    TIMEOUT_CARGA = float(os.getenv("CACHE_TIMEOUT_CARGA", "30"))
+    INTERVALO_RELATORIO = float(os.getenv("CACHE_INTERVALO_RELATORIO", "300"))
+
     @classmethod
     def get_instance(cls):
         """Singleton pattern"""
         if cls._instance is None:
-            cls._instance = CacheManager()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = CacheManager()
         return cls._instance
-    
-    def __init__(self):
-        self._cache = {}
-    
+
+    def __init__(self, max_itens=None, max_bytes=None, intervalo_limpeza=None):
+        self.max_itens = max_itens or self.MAX_ITENS
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self.intervalo_limpeza = intervalo_limpeza or self.INTERVALO_LIMPEZA
+
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # ordem = uso (LRU no início)
+        self._expiracoes = []  # heap de (expira_em, chave, versao) para a limpeza
+        self._versao = 0
+        self._bytes = 0
+        self._despejos = 0
+        self._expirados = 0
+        self._stats: Dict[str, _Estatisticas] = {}
+        self._ultimo_relatorio = (time.time(), None)  # (quando, assinatura dos contadores)
+
+        self._parar_limpeza = threading.Event()
+        self._thread_limpeza = None
+        self._carregando: Dict[str, _Carga] = {}
+        self._tags: Dict[str, set] = {}  # tag -> chaves marcadas com ela
+        self._disco = None
+        self._marcador = None
+        self._ttl_teto = None  # ver limitar_ttl
+
+    def configurar_disco(self, disco, marcador):
+        """
+        Habilita o segundo nível em disco para os itens persistentes
+        disco: DiskCache (ou None para desabilitar)
+        marcador: função(tags) -> {tag: versão} lida do banco (None se indisponível)
+        """
+        self._disco = disco
+        self._marcador = marcador
+
+    def limitar_ttl(self, teto):
+        """
+        Teto (segundos) para ttl e ttl_maximo de todos os itens; None remove.
+        Usado enquanto o ouvinte de notificações está desconectado: os itens já
+        guardados também passam a ser descartados no teto, contado a partir de agora.
+        """
+        with self._lock:
+            self._ttl_teto = teto
+            if teto is None:
+                return
+            limite = time.time() + teto
+            for key, entrada in self._cache.items():
+                entrada['expira_em'] = min(entrada['expira_em'], limite)
+                if entrada['descarta_em'] > limite:
+                    entrada['descarta_em'] = limite
+                    heapq.heappush(self._expiracoes, (limite, key, entrada['versao']))
+
     def get(self, key: str) -> Any:
         """
         Recupera dados do cache se ainda forem válidos
         """
         with self._lock:
-            if key in self._cache:
-                cache_data = self._cache[key]
-                # Verifica se o cache ainda é válido
-                if time.time() - cache_data['timestamp'] < cache_data['ttl']:
-                    return cache_data['data']
-                else:
-                    # Remove do cache se expirado
-                    del self._cache[key]
-                    print(f"🔄 Cache expirado: {key}")
-            return None
-    
-    def set(self, key: str, data: Any, ttl: int = 300):
+            valor, vencido = self._buscar(key)
+            estatisticas = self._estatisticas(key)
+            if valor is _AUSENTE or vencido:
+                estatisticas.misses += 1
+                return None
+            estatisticas.hits += 1
+            return valor
+
+    def get_or_load(self, key: str, loader, ttl: int = 300, timeout: float = None,
+                    ttl_maximo: int = None, tags=(), persistente: bool = False) -> Any:
+        """
+        Retorna o valor em cache ou executa loader() para obtê-lo e guardá-lo
+        Chamadas simultâneas para a mesma chave não repetem a consulta: a
+        primeira carrega e as demais esperam até `timeout` segundos
+        (TimeoutError se estourar). Se loader() falhar, todos recebem a exceção
+        e nada é guardado no cache.
+        ttl_maximo (> ttl): depois de `ttl` segundos o valor antigo continua
+        sendo devolvido imediatamente enquanto é recarregado em segundo plano;
+        só depois de `ttl_maximo` a chamada espera pela consulta.
+        tags: ver set()
+        persistente: usa também o cache em disco (se configurado)
+        """
+        with self._lock:
+            valor, vencido = self._buscar(key)
+            estatisticas = self._estatisticas(key)
+            if valor is not _AUSENTE and not vencido:
+                estatisticas.hits += 1
+                return valor
+            if valor is _AUSENTE:
+                estatisticas.misses += 1
+            else:
+                estatisticas.stale_hits += 1
+
+        conhecido = None
+        if persistente and self._disco is not None and tags:
+            if valor is _AUSENTE:
+                # Reinício: o valor do disco é servido já vencido (será revalidado)
+                conhecido = self._disco.ler(key)
+                if conhecido is not None:
+                    valor = conhecido.valor
+                    self.set(key, valor, 0, max(ttl, ttl_maximo or ttl), tags)
+                    with self._lock:
+                        estatisticas.misses -= 1
+                        estatisticas.disk_hits += 1
+            loader = self._loader_persistente(key, loader, tags, conhecido)
+
+        with self._lock:
+            if conhecido is None:
+                # Outro thread pode ter acabado de carregar (o lock foi solto acima)
+                valor, vencido = self._buscar(key)
+                if valor is not _AUSENTE and not vencido:
+                    return valor
+
+            carga = self._carregando.get(key)
+            responsavel = carga is None
+            if responsavel:
+                carga = _Carga(tags)
+                self._carregando[key] = carga
+
+        if valor is not _AUSENTE:
+            # Vencido, mas dentro do ttl_maximo: serve o antigo e recarrega em paralelo
+            if responsavel:
+                threading.Thread(
+                    target=self._recarregar_em_segundo_plano,
+                    args=(key, loader, ttl, ttl_maximo, carga),
+                    name=f'cache-recarga-{key}', daemon=True
+                ).start()
+            return valor
+
+        if not responsavel:
+            if not carga.evento.wait(self.TIMEOUT_CARGA if timeout is None else timeout):
+                raise TimeoutError(f"Tempo esgotado aguardando o carregamento de '{key}'")
+            if carga.erro is not None:
+                raise carga.erro
+            return carga.valor
+
+        return self._carregar(key, loader, ttl, ttl_maximo, carga)
+
+    def set(self, key: str, data: Any, ttl: int = 300, ttl_maximo: int = None, tags=()):
         """
         Armazena dados no cache com tempo de expiração
+        ttl_maximo: idade a partir da qual o item é descartado de vez
+        (padrão = ttl; maior que ttl habilita o stale-while-revalidate)
+        tags: entidades das quais o item depende (ver invalidar_tag)
         """
+        ttl_maximo = max(ttl, ttl_maximo or ttl)
+        if self._ttl_teto is not None:
+            ttl, ttl_maximo = min(ttl, self._ttl_teto), min(ttl_maximo, self._ttl_teto)
+        tamanho = tamanho_aproximado(data)
+
         with self._lock:
+            if key in self._cache:
+                self._remover(key)
+
+            if tamanho > self.max_bytes:
+                print(f"⚠️ Item grande demais para o cache: {key} (~{tamanho // 1024} KB)")
+                return
+
+            estatisticas = self._estatisticas(key)
+            estatisticas.items += 1
+            estatisticas.bytes += tamanho
+
+            self._versao += 1
+            agora = time.time()
             self._cache[key] = {
                 'data': data,
-                'timestamp': time.time(),
-                'ttl': ttl
+                'timestamp': agora,
+                'ttl': ttl,
+                'expira_em': agora + ttl,          # a partir daqui está vencido
+                'descarta_em': agora + ttl_maximo,  # a partir daqui é removido
+                'tamanho': tamanho,
+                'versao': self._versao,
+                'tags': frozenset(tags)
             }
-            print(f"💾 Cache atualizado: {key} (TTL: {ttl}s)")
-    
+            self._bytes += tamanho
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            heapq.heappush(self._expiracoes, (agora + ttl_maximo, key, self._versao))
+
+            self._aplicar_limites()
+
+        self._iniciar_limpeza()
+
     def delete(self, key: str):
         """
         Remove dados específicos do cache
         """
         with self._lock:
+            # Quem chegar depois da escrita faz uma nova consulta, não entra nesta carga
+            carga = self._carregando.pop(key, None)
+            if carga is not None:
+                carga.invalidada = True
             if key in self._cache:
-                del self._cache[key]
-                print(f"🗑️  Cache removido: {key}")
-    
+                self._remover(key, 'invalidations')
+
+    def invalidar_tag(self, *tags):
+        """
+        Remove todos os itens marcados com alguma das tags (chamado após escritas)
+        Cargas em andamento com essas tags não chegam a ser guardadas e deixam
+        de ser compartilhadas: quem pedir a chave depois refaz a consulta.
+        Retorna quantos itens foram removidos
+        """
+        with self._lock:
+            for key, carga in list(self._carregando.items()):
+                if carga.tags.intersection(tags):
+                    carga.invalidada = True
+                    del self._carregando[key]
+
+            chaves = set()
+            for tag in tags:
+                chaves.update(self._tags.get(tag, ()))
+            for key in chaves:
+                self._remover(key, 'invalidations')
+
+        if self._disco is not None:
+            self._disco.remover_tags(tags)
+        return len(chaves)
+
     def clear(self):
         """
         Limpa todo o cache
         """
         with self._lock:
+            for carga in self._carregando.values():
+                carga.invalidada = True
+            self._carregando.clear()
             self._cache.clear()
-            print("🧹 Cache limpo completamente")
-    
+            self._tags.clear()
+            self._expiracoes = []
+            self._bytes = 0
+            for estatisticas in self._stats.values():
+                estatisticas.items = estatisticas.bytes = 0
+        if self._disco is not None:
+            self._disco.limpar()
+        print("🧹 Cache limpo completamente")
+
+    def limpar_expirados(self):
+        """
+        Remove os itens expirados (chamado periodicamente pelo thread de limpeza)
+        Retorna quantos itens foram removidos
+        """
+        removidos = 0
+        agora = time.time()
+        with self._lock:
+            while self._expiracoes and self._expiracoes[0][0] <= agora:
+                _, key, versao = heapq.heappop(self._expiracoes)
+                entrada = self._cache.get(key)
+                # Entradas regravadas depois deixam registros antigos no heap
+                if entrada is not None and entrada['versao'] == versao:
+                    self._remover(key, 'expirations')
+                    removidos += 1
+            self._expirados += removidos
+
+            # Evita que o heap cresça com registros de itens já substituídos
+            if len(self._expiracoes) > 2 * len(self._cache) + 64:
+                self._expiracoes = [
+                    (e['descarta_em'], k, e['versao']) for k, e in self._cache.items()
+                ]
+                heapq.heapify(self._expiracoes)
+        return removidos
+
     def get_stats(self) -> Dict[str, Any]:
         """
-        Retorna estatísticas do cache
+        Retorna estatísticas do cache (totais mantidos incrementalmente)
+        'namespaces': {namespace: {hits, stale_hits, disk_hits, misses, hit_rate,
+        loads, load_errors, load_time, load_time_avg, load_time_max (segundos),
+        evictions, expirations, invalidations, items, bytes}}
         """
         with self._lock:
-            total_items = len(self._cache)
-            expired_items = 0
-            now = time.time()
-            
-            for key, data in self._cache.items():
-                if now - data['timestamp'] > data['ttl']:
-                    expired_items += 1
-            
+            namespaces = {nome: e.como_dict() for nome, e in self._stats.items()}
+            hits = sum(e['hits'] + e['stale_hits'] + e['disk_hits'] for e in namespaces.values())
+            misses = sum(e['misses'] for e in namespaces.values())
             return {
-                'total_items': total_items,
-                'expired_items': expired_items,
-                'valid_items': total_items - expired_items
+                'total_items': len(self._cache),
+                'total_bytes': self._bytes,
+                'max_items': self.max_itens,
+                'max_bytes': self.max_bytes,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'evictions': self._despejos,
+                'expirations': self._expirados,
+                'namespaces': namespaces
             }
 
+    def relatorio_stats(self) -> str:
+        """Tabela de texto com as estatísticas por namespace (mais consultados primeiro)"""
+        stats = self.get_stats()
+        linhas = [
+            f"📈 Cache: {stats['total_items']} itens, {stats['total_bytes'] // 1024} KB, "
+            f"acertos {stats['hit_rate']:.0%} ({stats['hits']}/{stats['hits'] + stats['misses']}), "
+            f"{stats['evictions']} despejos, {stats['expirations']} expirados",
+            f"   {'namespace':<48} {'hits':>6} {'venc':>5} {'disco':>5} {'miss':>5} "
+            f"{'cargas':>6} {'média ms':>8} {'máx ms':>7} {'inval':>5} {'itens':>5} {'KB':>6}"
+        ]
+        ordem = sorted(stats['namespaces'].items(),
+                       key=lambda item: -(item[1]['hits'] + item[1]['misses']))
+        for nome, e in ordem:
+            linhas.append(
+                f"   {nome:<48} {e['hits']:>6} {e['stale_hits']:>5} {e['disk_hits']:>5} {e['misses']:>5} "
+                f"{e['loads']:>6} {e['load_time_avg'] * 1000:>8.1f} {e['load_time_max'] * 1000:>7.1f} "
+                f"{e['invalidations']:>5} {e['items']:>5} {e['bytes'] // 1024:>6}"
+            )
+        return '\n'.join(linhas)
+
+    def parar_limpeza(self):
+        """Encerra o thread de limpeza (ao fechar o sistema)"""
+        self._parar_limpeza.set()
+
+    # ---------- INTERNOS (chamar com o lock) ----------
+
+    def _estatisticas(self, key):
+        nome = namespace_da_chave(key)
+        estatisticas = self._stats.get(nome)
+        if estatisticas is None:
+            estatisticas = self._stats[nome] = _Estatisticas()
+        return estatisticas
+
+    def _buscar(self, key):
+        """(valor da chave ou _AUSENTE, se já passou do ttl), marcando como usado"""
+        entrada = self._cache.get(key)
+        if entrada is None:
+            return _AUSENTE, False
+
+        agora = time.time()
+        if agora >= entrada['descarta_em']:
+            # Remove do cache se expirado
+            self._remover(key, 'expirations')
+            self._expirados += 1
+            return _AUSENTE, False
+
+        self._cache.move_to_end(key)
+        return entrada['data'], agora >= entrada['expira_em']
+
+    def _carregar(self, key, loader, ttl, ttl_maximo, carga):
+        """Executa o loader como responsável pela carga da chave (sem o lock)"""
+        inicio = time.perf_counter()
+        try:
+            carga.valor = loader()
+            with self._lock:
+                self._registrar_carga(key, time.perf_counter() - inicio)
+                # Invalidado durante a consulta: o resultado pode estar desatualizado
+                if not carga.invalidada:
+                    self.set(key, carga.valor, ttl, ttl_maximo, carga.tags)
+            return carga.valor
+        except BaseException as e:
+            carga.erro = e
+            with self._lock:
+                self._registrar_carga(key, time.perf_counter() - inicio, erro=True)
+            raise
+        finally:
+            with self._lock:
+                if self._carregando.get(key) is carga:
+                    del self._carregando[key]
+            carga.evento.set()
+
+    def _registrar_carga(self, key, duracao, erro=False):
+        estatisticas = self._estatisticas(key)
+        if erro:
+            estatisticas.load_errors += 1
+            return
+        estatisticas.loads += 1
+        estatisticas.load_time += duracao
+        estatisticas.load_time_max = max(estatisticas.load_time_max, duracao)
+
+    def _loader_persistente(self, key, loader, tags, conhecido=None):
+        """
+        Envolve o loader com o cache em disco: se o marcador do banco não mudou
+        desde a gravação, reaproveita o valor do disco sem refazer a consulta
+        """
+        def carregar():
+            marcador = self._ler_marcador(tags)  # lido antes: escrita durante a carga muda o marcador
+            if marcador is None:
+                return loader()
+
+            entrada = conhecido or self._disco.ler(key)
+            if entrada is not None and entrada.marcador == marcador:
+                return entrada.valor
+
+            valor = loader()
+            self._disco.gravar(key, valor, marcador, tags)
+            return valor
+        return carregar
+
+    def _ler_marcador(self, tags):
+        """Versões das entidades das tags como texto, ou None se não der para validar"""
+        try:
+            versoes = self._marcador(tags)
+        except Exception as e:
+            print(f"⚠️ Erro ao ler o marcador de versão: {e}")
+            return None
+        if not versoes or any(tag not in versoes for tag in tags):
+            return None
+        return repr(sorted((tag, versoes[tag]) for tag in tags))
+
+    def _recarregar_em_segundo_plano(self, key, loader, ttl, ttl_maximo, carga):
+        try:
+            self._carregar(key, loader, ttl, ttl_maximo, carga)
+        except Exception as e:
+            # O valor antigo continua disponível até o ttl_maximo
+            print(f"⚠️ Erro ao recarregar '{key}' em segundo plano: {e}")
+
+    def _remover(self, key, motivo=None):
+        """motivo: contador do namespace a incrementar ('evictions', 'expirations'...)"""
+        entrada = self._cache.pop(key)
+        self._bytes -= entrada['tamanho']
+
+        estatisticas = self._estatisticas(key)
+        estatisticas.items -= 1
+        estatisticas.bytes -= entrada['tamanho']
+        if motivo:
+            setattr(estatisticas, motivo, getattr(estatisticas, motivo) + 1)
+
+        for tag in entrada['tags']:
+            chaves = self._tags.get(tag)
+            if chaves is not None:
+                chaves.discard(key)
+                if not chaves:
+                    del self._tags[tag]
+
+    def _aplicar_limites(self):
+        """Descarta os itens menos usados até caber nos limites"""
+        while self._cache and (len(self._cache) > self.max_itens or self._bytes > self.max_bytes):
+            key = next(iter(self._cache))
+            self._remover(key, 'evictions')
+            self._despejos += 1
+
+    def _iniciar_limpeza(self):
+        if self._thread_limpeza is not None or self._parar_limpeza.is_set():
+            return
+        with self._lock:
+            if self._thread_limpeza is None:
+                self._thread_limpeza = threading.Thread(
+                    target=self._loop_limpeza, name='cache-limpeza', daemon=True
+                )
+                self._thread_limpeza.start()
+
+    def _loop_limpeza(self):
+        while not self._parar_limpeza.wait(self.intervalo_limpeza):
+            try:
+                self.limpar_expirados()
+                self._relatorio_periodico()
+            except Exception as e:
+                print(f"⚠️ Erro na limpeza do cache: {e}")
+
+    def _relatorio_periodico(self):
+        """Imprime relatorio_stats() a cada INTERVALO_RELATORIO s, se houve atividade"""
+        if self.INTERVALO_RELATORIO <= 0:
+            return
+        quando, assinatura = self._ultimo_relatorio
+        if time.time() - quando < self.INTERVALO_RELATORIO:
+            return
+
+        stats = self.get_stats()
+        nova_assinatura = (stats['hits'], stats['misses'], stats['total_items'])
+        if nova_assinatura != assinatura:
+            print(self.relatorio_stats())
+        self._ultimo_relatorio = (time.time(), nova_assinatura)
+
 # Instância global do cache
-cache_manager = CacheManager.get_instance()
\ No newline at end of file
+cache_manager = CacheManager.get_instance()
+
+
+def _congelar(valor):
+    """Versão comparável/estável de um argumento para compor a chave (dict, list, set)"""
+    if isinstance(valor, dict):
+        return tuple(sorted((repr(k), _congelar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    if isinstance(valor, (set, frozenset)):
+        return tuple(sorted(repr(_congelar(v)) for v in valor))
+    return valor
+
+
+def cached(tags=(), ttl=300, ttl_maximo=None, nome=None, persistente=False):
+    """
+    Decorator que memoriza o resultado da função no cache global
+    A chave é montada a partir do nome da função e dos argumentos (já com os
+    valores padrão aplicados): f(1) e f(x=1) usam a mesma entrada.
+    tags: entidades das quais o resultado depende; as escritas chamam
+    cache_manager.invalidar_tag(...) com a entidade alterada.
+    persistente: guarda também no cache em disco (listas de referência).
+    A função deve lançar exceção em caso de erro (resultados de erro não
+    podem ir para o cache). Uso em serviços:
+
+        @staticmethod
+        @cached(tags=('filial',), ttl=CacheManager.TTL_FILIAIS)
+        def _carregar_filiais(): ...
+    """
+    def decorador(funcao):
+        assinatura = inspect.signature(funcao)
+        prefixo = nome or f"{funcao.__module__}.{funcao.__qualname__}"
+
+        @functools.wraps(funcao)
+        def wrapper(*args, **kwargs):
+            argumentos = assinatura.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            chave = prefixo + repr(tuple(_congelar(v) for v in argumentos.arguments.values()))
+            return cache_manager.get_or_load(
+                chave, lambda: funcao(*args, **kwargs), ttl,
+                ttl_maximo=ttl_maximo, tags=tags, persistente=persistente
+            )
+
+        wrapper.tags = tuple(tags)
+        return wrapper
+    return decorador
@@ -0,0 +1,112 @@
+# 📄 utils/disk_cache.py
+"""
+CACHE EM DISCO (SEGUNDO NÍVEL)
+Guarda em um arquivo SQLite as listas de referência do CacheManager para que,
+ao reabrir o sistema, a interface seja preenchida sem esperar pelo banco.
+Cada entrada leva o marcador de versão do banco usado ao gravá-la: o
+CacheManager só a considera atual se o marcador ainda for o mesmo.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# Mudar quando o formato das entradas mudar: entradas antigas são ignoradas
+FORMATO = 1
+
+EntradaDisco = namedtuple('EntradaDisco', ['valor', 'marcador', 'gravado_em'])
+
+
+class DiskCache:
+    """
+    Entradas (chave -> valor serializado com pickle) em um SQLite local
+    Os erros de disco nunca sobem: o cache em disco é só uma otimização.
+    """
+
+    def __init__(self, diretorio, versao=''):
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho = os.path.join(diretorio, 'cache.sqlite3')
+        self.versao = f"{FORMATO}:{versao}"
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.caminho, timeout=5, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ENTRADAS (
+                CHAVE TEXT PRIMARY KEY,
+                VERSAO TEXT NOT NULL,
+                MARCADOR TEXT NOT NULL,
+                TAGS TEXT NOT NULL,      -- ',colaborador,filial,'
+                GRAVADO_EM REAL NOT NULL,
+                DADOS BLOB NOT NULL
+            )
+        """)
+
+    def ler(self, chave):
+        """EntradaDisco da chave ou None (ausente, de outra versão ou ilegível)"""
+        try:
+            with self._lock:
+                linha = self._conn.execute(
+                    "SELECT VERSAO, MARCADOR, GRAVADO_EM, DADOS FROM ENTRADAS WHERE CHAVE = ?",
+                    (chave,)
+                ).fetchone()
+            if linha is None:
+                return None
+
+            versao, marcador, gravado_em, dados = linha
+            if versao != self.versao:
+                self.remover(chave)
+                return None
+            return EntradaDisco(pickle.loads(dados), marcador, gravado_em)
+
+        except Exception as e:
+            # Ex.: classe do modelo mudou desde a gravação
+            print(f"⚠️ Entrada do cache em disco descartada ({chave}): {e}")
+            self.remover(chave)
+            return None
+
+    def gravar(self, chave, valor, marcador, tags=()):
+        try:
+            dados = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ENTRADAS (CHAVE, VERSAO, MARCADOR, TAGS, GRAVADO_EM, DADOS) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (chave, self.versao, marcador, ',' + ','.join(sorted(tags)) + ',',
+                     time.time(), sqlite3.Binary(dados))
+                )
+        except Exception as e:
+            print(f"⚠️ Não foi possível gravar no cache em disco ({chave}): {e}")
+
+    def remover(self, chave):
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM ENTRADAS WHERE CHAVE = ?", (chave,))
+        except Exception as e:
+            print(f"⚠️ Erro ao remover do cache em disco ({chave}): {e}")
+
+    def remover_tags(self, tags):
+        """Remove as entradas marcadas com alguma das tags"""
+        try:
+            with self._lock:
+                for tag in tags:
+                    self._conn.execute("DELETE FROM ENTRADAS WHERE TAGS LIKE ?", (f'%,{tag},%',))
+        except Exception as e:
+            print(f"⚠️ Erro ao invalidar o cache em disco: {e}")
+
+    def limpar(self):
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM ENTRADAS")
+        except Exception as e:
+            print(f"⚠️ Erro ao limpar o cache em disco: {e}")
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
@@ -4,7 +4,11 @@ SISTEMA DE PAGINAÇÃO PARA LISTAS GRANDES
 Melhora performance em listas com muitos registros
 """
 
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Optional
+from datetime import date, datetime
+from decimal import Decimal
+import base64
+import json
 import math
 
 class Paginator:
@@ -69,17 +73,40 @@ class DatabasePaginator:
     """
     
     @staticmethod
-    def paginate_query(query: str, page: int = 1, per_page: int = 10, params: tuple = None) -> Tuple[List[Any], dict]:
+    def _contar(cur, query: str, params: tuple, count_mode: str) -> Optional[int]:
+        """
+        Conta os registros da query conforme o modo:
+        - 'exact': SELECT COUNT(*) (percorre todo o resultado)
+        - 'estimated': estimativa do planejador via EXPLAIN (custo constante)
+        - 'none': não conta
+        """
+        if count_mode == 'none':
+            return None
+        
+        if count_mode == 'estimated':
+            cur.execute(f"EXPLAIN (FORMAT JSON) {query}", params or ())
+            plano = cur.fetchone()[0]
+            if isinstance(plano, str):
+                plano = json.loads(plano)
+            return int(plano[0]['Plan']['Plan Rows'])
+        
+        if count_mode == 'exact':
+            cur.execute(f"SELECT COUNT(*) FROM ({query}) as subquery", params or ())
+            return cur.fetchone()[0]
+        
+        raise ValueError(f"count_mode inválido: {count_mode}")
+    
+    @staticmethod
+    def paginate_query(query: str, page: int = 1, per_page: int = 10, params: tuple = None,
+                       count_mode: str = 'exact') -> Tuple[List[Any], dict]:
         """
         Executa query com LIMIT e OFFSET para paginação eficiente
+        count_mode='estimated' evita o COUNT(*) completo a cada página
         """
         from database.database import DatabaseConnection
         
         offset = (page - 1) * per_page
         
-        # Query para contar total de registros (sem LIMIT)
-        count_query = f"SELECT COUNT(*) FROM ({query}) as subquery"
-        
         # Query principal com paginação
         paginated_query = f"{query} LIMIT {per_page} OFFSET {offset}"
         
@@ -91,9 +118,8 @@ class DatabasePaginator:
                 cur = conn.cursor()
                 
                 # Contar total de registros
-                cur.execute(count_query, params or ())
-                total_items = cur.fetchone()[0]
-                total_pages = math.ceil(total_items / per_page)
+                total_items = DatabasePaginator._contar(cur, query, params, count_mode)
+                total_pages = math.ceil(total_items / per_page) if total_items is not None else None
                 
                 # Buscar dados paginados
                 cur.execute(paginated_query, params or ())
@@ -103,15 +129,178 @@ class DatabasePaginator:
                     'current_page': page,
                     'total_pages': total_pages,
                     'total_items': total_items,
+                    'total_estimated': count_mode == 'estimated',
                     'items_per_page': per_page,
                     'start_index': offset + 1,
-                    'end_index': min(offset + per_page, total_items),
+                    'end_index': offset + len(page_items),
                     'has_previous': page > 1,
-                    'has_next': page < total_pages
+                    'has_next': (page < total_pages) if total_pages is not None else len(page_items) == per_page
                 }
                 
                 return page_items, pagination_info
                 
         except Exception as e:
             print(f"❌ Erro na paginação de query: {e}")
-            return [], {}
\ No newline at end of file
+            return [], {}
+    
+    # ========== PAGINAÇÃO POR CHAVE (KEYSET / SEEK) ==========
+    
+    @staticmethod
+    def _codificar_valor(valor):
+        if isinstance(valor, datetime):
+            return {'t': 'datetime', 'v': valor.isoformat()}
+        if isinstance(valor, date):
+            return {'t': 'date', 'v': valor.isoformat()}
+        if isinstance(valor, Decimal):
+            return {'t': 'decimal', 'v': str(valor)}
+        return valor
+    
+    @staticmethod
+    def _decodificar_valor(valor):
+        if isinstance(valor, dict):
+            if valor['t'] == 'datetime':
+                return datetime.fromisoformat(valor['v'])
+            if valor['t'] == 'date':
+                return date.fromisoformat(valor['v'])
+            if valor['t'] == 'decimal':
+                return Decimal(valor['v'])
+        return valor
+    
+    @staticmethod
+    def encode_cursor(direcao: str, valores: tuple) -> str:
+        """
+        Gera o token opaco de cursor a partir dos valores da chave de ordenação
+        """
+        payload = {'d': direcao, 'k': [DatabasePaginator._codificar_valor(v) for v in valores]}
+        texto = json.dumps(payload, separators=(',', ':'))
+        return base64.urlsafe_b64encode(texto.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, list]:
+        """
+        Lê um token de cursor: retorna (direção, valores da chave)
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            valores = [DatabasePaginator._decodificar_valor(v) for v in payload['k']]
+            if payload['d'] not in ('next', 'prev'):
+                raise ValueError(payload['d'])
+            return payload['d'], valores
+        except Exception as e:
+            raise ValueError(f"Cursor de paginação inválido: {e}")
+    
+    @staticmethod
+    def _condicao_seek(order_by: List[Tuple[str, str]], valores: list) -> Tuple[str, list]:
+        """
+        Monta o WHERE que posiciona depois da chave informada.
+        Direções iguais usam comparação de linha (aproveita índice composto);
+        direções mistas são expandidas em (a > x) OR (a = x AND b < y) ...
+        """
+        direcoes = {direcao for _, direcao in order_by}
+        colunas = [coluna for coluna, _ in order_by]
+        
+        if len(direcoes) == 1:
+            operador = '>' if direcoes.pop() == 'ASC' else '<'
+            marcadores = ', '.join(['%s'] * len(colunas))
+            return f"({', '.join(colunas)}) {operador} ({marcadores})", list(valores)
+        
+        condicoes = []
+        params = []
+        for i, (coluna, direcao) in enumerate(order_by):
+            partes = [f"{anterior} = %s" for anterior in colunas[:i]]
+            partes.append(f"{coluna} {'>' if direcao == 'ASC' else '<'} %s")
+            condicoes.append('(' + ' AND '.join(partes) + ')')
+            params.extend(valores[:i])
+            params.append(valores[i])
+        return '(' + ' OR '.join(condicoes) + ')', params
+    
+    @staticmethod
+    def paginate_keyset(query: str, order_by: List[Tuple[str, str]], per_page: int = 10,
+                        cursor: str = None, params: tuple = None,
+                        count_mode: str = 'none') -> Tuple[List[Any], dict]:
+        """
+        Paginação por chave (seek): custo constante por página, em qualquer profundidade
+        
+        query: SELECT sem ORDER BY/LIMIT que devolva as colunas de order_by
+        order_by: [(coluna, 'ASC'|'DESC'), ...] - a última coluna deve ser única
+                  (desempate), ex.: [('DT_ABERTURA', 'DESC'), ('N_SOLICITACAO', 'DESC')]
+                  Comparar com NULL não posiciona nada: um cursor com valor
+                  NULL gera ValueError (quem chama volta para OFFSET)
+        cursor: token de pagination_info['next_cursor'] ou ['previous_cursor']
+                (None = primeira página)
+        count_mode: 'none' (padrão), 'estimated' ou 'exact'
+        """
+        from database.database import DatabaseConnection
+        
+        order_by = [(coluna, direcao.upper()) for coluna, direcao in order_by]
+        direcao, valores = ('next', None)
+        if cursor:
+            direcao, valores = DatabasePaginator.decode_cursor(cursor)
+            if len(valores) != len(order_by):
+                raise ValueError("Cursor de paginação não corresponde à ordenação")
+            if any(valor is None for valor in valores):
+                raise ValueError("Cursor de paginação com valor NULL")
+        
+        # Página anterior: percorre no sentido inverso e reverte o resultado
+        ordem_consulta = order_by
+        if direcao == 'prev':
+            ordem_consulta = [(coluna, 'ASC' if d == 'DESC' else 'DESC') for coluna, d in order_by]
+        
+        where = ''
+        seek_params = []
+        if valores is not None:
+            condicao, seek_params = DatabasePaginator._condicao_seek(ordem_consulta, valores)
+            where = f"WHERE {condicao}"
+        
+        order_sql = ', '.join(f"{coluna} {d}" for coluna, d in ordem_consulta)
+        paginated_query = (
+            f"SELECT * FROM ({query}) AS subquery {where} "
+            f"ORDER BY {order_sql} LIMIT {per_page + 1}"
+        )
+        
+        try:
+            with DatabaseConnection() as conn:
+                if conn is None:
+                    return [], {}
+                
+                cur = conn.cursor()
+                
+                total_items = DatabasePaginator._contar(cur, query, params, count_mode)
+                
+                cur.execute(paginated_query, tuple(params or ()) + tuple(seek_params))
+                nomes = [desc[0].lower() for desc in cur.description]
+                indices_chave = [nomes.index(coluna.split('.')[-1].lower()) for coluna, _ in order_by]
+                
+                page_items = cur.fetchall()
+                tem_mais = len(page_items) > per_page
+                page_items = page_items[:per_page]
+                
+                if direcao == 'prev':
+                    page_items.reverse()
+                    has_previous, has_next = tem_mais, True
+                else:
+                    has_previous, has_next = valores is not None, tem_mais
+                
+                def chave(row):
+                    return tuple(row[i] for i in indices_chave)
+                
+                pagination_info = {
+                    'items_per_page': per_page,
+                    'total_items': total_items,
+                    'total_pages': math.ceil(total_items / per_page) if total_items is not None else None,
+                    'total_estimated': count_mode == 'estimated',
+                    'has_previous': has_previous and bool(page_items),
+                    'has_next': has_next and bool(page_items),
+                    'previous_cursor': (DatabasePaginator.encode_cursor('prev', chave(page_items[0]))
+                                        if has_previous and page_items else None),
+                    'next_cursor': (DatabasePaginator.encode_cursor('next', chave(page_items[-1]))
+                                    if has_next and page_items else None)
+                }
+                
+                return page_items, pagination_info
+                
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"❌ Erro na paginação por chave: {e}")
+            return [], {}
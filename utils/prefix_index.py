@@ -0,0 +1,59 @@
+# 📄 utils/prefix_index.py
+"""
+ÍNDICE DE PREFIXOS EM MEMÓRIA
+Busca rápida por início de palavra (sem acento e sem diferenciar maiúsculas),
+usada quando o banco não tem a extensão pg_trgm
+"""
+
+import bisect
+import unicodedata
+
+
+def normalizar(texto):
+    """Minúsculas, sem acentos e com espaços simples: 'José  Álvares' -> 'jose alvares'"""
+    texto = unicodedata.normalize('NFKD', str(texto or ''))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.casefold().split())
+
+
+class PrefixIndex:
+    """
+    Indexa cada valor pelo início de cada uma de suas palavras:
+    'Maria Souza' é encontrada por 'mar', 'sou' e 'maria s'.
+    """
+
+    def __init__(self, valores=(), chave=str):
+        self._valores = list(valores)
+        self._textos = [normalizar(chave(valor)) for valor in self._valores]
+
+        # (sufixo a partir do início de uma palavra, posição do valor) em ordem
+        entradas = []
+        for posicao, texto in enumerate(self._textos):
+            inicio = 0
+            for palavra in texto.split(' '):
+                entradas.append((texto[inicio:], posicao))
+                inicio += len(palavra) + 1
+        entradas.sort()
+        self._entradas = entradas
+        self._ordem_alfabetica = sorted(range(len(self._valores)), key=self._textos.__getitem__)
+
+    def __len__(self):
+        return len(self._valores)
+
+    def buscar(self, termo, limite=20):
+        """
+        Valores com alguma palavra começando por `termo`
+        Os que começam pelo termo vêm primeiro; depois, ordem alfabética
+        """
+        termo = normalizar(termo)
+        if not termo:
+            return [self._valores[p] for p in self._ordem_alfabetica[:limite]]
+
+        posicoes = set()
+        i = bisect.bisect_left(self._entradas, (termo,))
+        while i < len(self._entradas) and self._entradas[i][0].startswith(termo):
+            posicoes.add(self._entradas[i][1])
+            i += 1
+
+        ordenadas = sorted(posicoes, key=lambda p: (not self._textos[p].startswith(termo), self._textos[p]))
+        return [self._valores[p] for p in ordenadas[:limite]]